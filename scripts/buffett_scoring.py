@@ -0,0 +1,702 @@
+"""
+버핏 평가 공용 점수 계산 모듈
+
+설계 의도:
+- yf_evaluate.py / fmp_evaluate.py / yf_buffett_logic.py가 각자 구현하던
+  점수 규칙(ROE, ROIC, Net Margin, 추세, 재무 건전성, 현금창출력, 적정가)을 한 곳에 모음
+- 입력은 소스와 무관한 정규화 레코드(MetricSeries, 연도별 지표 배열)
+- 소스별 차이는 각 스크립트의 어댑터(extract_yearly_metrics)와 ScoringPolicy로만 표현
+  - yfinance Storage (yf_evaluate): 최소 2년, 양수 EPS만으로 CAGR 계산
+  - FMP (fmp_evaluate): 최소 3년, 첫/마지막 연도 EPS로 CAGR 계산
+  - yfinance 직접 조회 (yf_buffett_logic): 최소 3년, 음수 최신 EPS도 그대로 적정가 계산
+- 캐싱/벡터화 같은 최적화는 이 모듈에만 적용하면 세 경로에 모두 반영됨
+
+사용법:
+    from buffett_scoring import compute_year_metrics, MetricSeries, score_series, YF_POLICY
+
+    series = MetricSeries.from_rows([compute_year_metrics(...), ...])
+    score_data = score_series(series, YF_POLICY)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# 소스별 정책
+# ============================================================================
+
+@dataclass(frozen=True)
+class ScoringPolicy:
+    """
+    소스별로 다른 평가 규칙
+
+    Attributes:
+        min_years: 평가에 필요한 최소 유효 연도 수
+        positive_eps_only: True면 양수 EPS만 골라 CAGR 계산 (연수 = 양수 EPS 개수 - 1)
+        guard_future_eps: True면 최신 EPS가 0 이하일 때 미래 EPS를 0으로 처리
+    """
+    min_years: int
+    positive_eps_only: bool
+    guard_future_eps: bool
+
+
+YF_POLICY = ScoringPolicy(min_years=2, positive_eps_only=True, guard_future_eps=True)
+FMP_POLICY = ScoringPolicy(min_years=3, positive_eps_only=False, guard_future_eps=True)
+YF_LIVE_POLICY = ScoringPolicy(min_years=3, positive_eps_only=False, guard_future_eps=False)
+
+
+# ============================================================================
+# 점수/적정가 기준값
+# ============================================================================
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """
+    점수/적정가 기준값 (기본값 = 운영 기준, 기준값 what-if/스윕용)
+
+    Attributes:
+        pass_score: 우량주(PASS) 기준 총점
+        roe_high / roe_low: ROE 점수 기준 (%)
+        roic_high / roic_low: ROIC 점수 기준 (%)
+        per_growth_high / per_growth_mid: 적정 PER 구간을 나누는 EPS CAGR 기준 (%)
+        per_high / per_mid / per_low / per_negative: EPS CAGR 고성장/중성장/0 이상/음수 구간의 적정 PER
+        growth_haircut: 과거 성장률 반영 비율
+        safety_factor: 안전마진 적용 후 비율 (0.8 = 안전마진 20%)
+    """
+    pass_score: float = 85.0
+    roe_high: float = 15.0
+    roe_low: float = 12.0
+    roic_high: float = 12.0
+    roic_low: float = 9.0
+    per_growth_high: float = 15.0
+    per_growth_mid: float = 8.0
+    per_high: float = 18.0
+    per_mid: float = 12.0
+    per_low: float = 10.0
+    per_negative: float = 8.0
+    growth_haircut: float = 0.7
+    safety_factor: float = 0.8
+
+
+DEFAULT_SCORING = ScoringConfig()
+
+
+# ============================================================================
+# 지표 계산 함수
+# ============================================================================
+
+def calculate_roe(net_income: float, total_equity: float) -> float:
+    """ROE (자기자본이익률) 계산"""
+    if total_equity == 0 or pd.isna(total_equity):
+        return 0.0
+    return (net_income / total_equity) * 100
+
+
+def calculate_roic(ebit: float, tax_rate: float, total_equity: float, total_liabilities: float) -> float:
+    """ROIC (투하자본이익률) 계산"""
+    if pd.isna(ebit) or pd.isna(tax_rate):
+        return 0.0
+
+    nopat = ebit * (1 - tax_rate / 100)
+    invested_capital = total_equity + total_liabilities
+
+    if invested_capital == 0:
+        return 0.0
+
+    return (nopat / invested_capital) * 100
+
+
+def calculate_net_margin(net_income: float, revenue: float) -> float:
+    """순이익률 계산"""
+    if revenue == 0 or pd.isna(revenue):
+        return 0.0
+    return (net_income / revenue) * 100
+
+
+def calculate_fcf_margin(free_cash_flow: float, revenue: float) -> float:
+    """FCF 마진 계산"""
+    if revenue == 0 or pd.isna(revenue):
+        return 0.0
+    return (free_cash_flow / revenue) * 100
+
+
+def calculate_cagr(start_value: float, end_value: float, years: int) -> float:
+    """연평균 성장률 계산 (시작값 0 이하, 비율 0 이하, 결측이면 0)"""
+    if start_value <= 0 or pd.isna(start_value) or pd.isna(end_value) or years <= 0:
+        return 0.0
+
+    ratio = end_value / start_value
+    if ratio <= 0:
+        return 0.0
+
+    cagr = (math.pow(ratio, 1.0 / years) - 1) * 100
+    return max(cagr, 0.0)
+
+
+# fair_per_tier 구간 번호
+PER_TIER_HIGH, PER_TIER_MID, PER_TIER_LOW, PER_TIER_NEGATIVE = range(4)
+
+
+def fair_per_tier(eps_cagr: float, config: ScoringConfig = DEFAULT_SCORING) -> Tuple[int, float]:
+    """
+    EPS CAGR 구간과 적정 PER
+
+    Returns:
+        (구간 번호 PER_TIER_*, 적정 PER) - 고성장/중성장/0 이상/음수 순
+    """
+    if eps_cagr >= config.per_growth_high:
+        return PER_TIER_HIGH, config.per_high
+    if eps_cagr >= config.per_growth_mid:
+        return PER_TIER_MID, config.per_mid
+    if eps_cagr >= 0.0:
+        return PER_TIER_LOW, config.per_low
+    return PER_TIER_NEGATIVE, config.per_negative
+
+
+def compute_year_metrics(year, revenue: float, net_income: float, ebit: float,
+                         pretax_income: float, tax_provision: float,
+                         total_equity: float, total_liabilities: float,
+                         free_cash_flow: float, eps: float, interest_expense: float) -> Tuple:
+    """
+    재무제표 원본 값 → 1개 연도 평가 지표 (MetricSeries.FIELDS 순서의 튜플)
+    """
+    # 세율
+    tax_rate = (tax_provision / pretax_income * 100) if pretax_income != 0 else 0
+
+    roe = calculate_roe(net_income, total_equity)
+    roic = calculate_roic(ebit, tax_rate, total_equity, total_liabilities)
+    net_margin = calculate_net_margin(net_income, revenue)
+    fcf_margin = calculate_fcf_margin(free_cash_flow, revenue)
+    debt_ratio = (total_liabilities / total_equity * 100) if total_equity != 0 else 0
+
+    # 이자보상배율: 이자비용이 0이면 무차입(무한대)
+    if interest_expense == 0:
+        interest_coverage = float("inf")
+    else:
+        interest_coverage = ebit / abs(interest_expense)
+
+    return (year, revenue, net_income, eps, roe, roic, net_margin,
+            fcf_margin, debt_ratio, interest_coverage, interest_expense)
+
+
+# ============================================================================
+# 정규화 입력 레코드
+# ============================================================================
+
+@dataclass(frozen=True)
+class MetricSeries:
+    """
+    한 종목의 연도별 평가 지표 (오래된 연도부터, 지표별 튜플)
+
+    dict 목록 대신 지표별 배열로 보관하여 점수 계산 시 열 단위로 바로 읽음
+    (__slots__는 직접 선언 - dataclass(slots=True)는 Python 3.10+)
+    """
+    __slots__ = ("year", "revenue", "net_income", "eps", "roe", "roic", "net_margin",
+                 "fcf_margin", "debt_ratio", "interest_coverage", "interest_expense")
+    FIELDS = __slots__
+
+    year: tuple
+    revenue: tuple
+    net_income: tuple
+    eps: tuple
+    roe: tuple
+    roic: tuple
+    net_margin: tuple
+    fcf_margin: tuple
+    debt_ratio: tuple
+    interest_coverage: tuple
+    interest_expense: tuple
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple]) -> "MetricSeries":
+        """compute_year_metrics 튜플 목록(연도순)으로 생성"""
+        columns = tuple(zip(*rows)) if rows else ((),) * len(cls.FIELDS)
+        return cls(*columns)
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def rows(self) -> List[Dict]:
+        """연도별 dict 목록으로 변환 (출력/디버깅용)"""
+        return [dict(zip(self.FIELDS, values)) for values in zip(*(getattr(self, f) for f in self.FIELDS))]
+
+
+@dataclass(frozen=True)
+class SeriesAggregates:
+    """
+    점수 계산에 쓰는 종목별 집계값 (기준 이상 연도 수, 평균, 순이익률 표준편차)
+
+    roe_15_plus 등 이름은 기본 기준값 기준이며, 실제 기준은 ScoringConfig를 따릅니다.
+
+    지표마다 generator로 다시 훑지 않고 from_series에서 한 번에 계산합니다.
+    합계는 sum()과 같은 순서로 더해 벡터화 경로(score_metrics_frame)와 결과가 같습니다.
+    """
+    __slots__ = ("years", "roe_15_plus", "roe_12_plus", "has_loss", "roic_12_plus", "roic_9_plus",
+                 "avg_roe", "avg_roic", "avg_net_margin", "net_margin_std", "avg_fcf_margin")
+
+    years: int
+    roe_15_plus: int
+    roe_12_plus: int
+    has_loss: bool
+    roic_12_plus: int
+    roic_9_plus: int
+    avg_roe: float
+    avg_roic: float
+    avg_net_margin: float
+    net_margin_std: float
+    avg_fcf_margin: float
+
+    @classmethod
+    def from_series(cls, series: MetricSeries,
+                    config: ScoringConfig = DEFAULT_SCORING) -> "SeriesAggregates":
+        """연도별 지표를 한 번 순회하며 집계 (빈 시리즈는 허용하지 않음)"""
+        years = len(series)
+        roe_15_plus = roe_12_plus = roic_12_plus = roic_9_plus = 0
+        has_loss = False
+        roe_sum = roic_sum = margin_sum = fcf_sum = 0
+
+        for roe, roic, margin, fcf in zip(series.roe, series.roic, series.net_margin, series.fcf_margin):
+            if roe >= config.roe_high:
+                roe_15_plus += 1
+            if roe >= config.roe_low:
+                roe_12_plus += 1
+            if roe < 0:
+                has_loss = True
+            if roic >= config.roic_high:
+                roic_12_plus += 1
+            if roic >= config.roic_low:
+                roic_9_plus += 1
+            roe_sum += roe
+            roic_sum += roic
+            margin_sum += margin
+            fcf_sum += fcf
+
+        avg_margin = margin_sum / years
+        # 분산은 평균 확정 후 편차 제곱합 (단일 패스 공식은 부동소수점 결과가 달라짐)
+        variance = sum((m - avg_margin) ** 2 for m in series.net_margin) / years
+
+        return cls(
+            years=years,
+            roe_15_plus=roe_15_plus,
+            roe_12_plus=roe_12_plus,
+            has_loss=has_loss,
+            roic_12_plus=roic_12_plus,
+            roic_9_plus=roic_9_plus,
+            avg_roe=roe_sum / years,
+            avg_roic=roic_sum / years,
+            avg_net_margin=avg_margin,
+            net_margin_std=math.sqrt(variance),
+            avg_fcf_margin=fcf_sum / years,
+        )
+
+
+# ============================================================================
+# 점수 계산 (종목 단위)
+# ============================================================================
+
+def score_series(series: MetricSeries, policy: ScoringPolicy,
+                 config: ScoringConfig = DEFAULT_SCORING) -> Optional[Dict]:
+    """
+    연도별 지표로 버핏 점수 계산
+
+    Returns:
+        점수/적정가/평균 지표 dict (유효 연도가 policy.min_years 미만이면 None)
+    """
+    years_available = len(series)
+    if years_available < policy.min_years:
+        return None
+
+    agg = SeriesAggregates.from_series(series, config)
+    roe = series.roe
+
+    # [1] ROE 점수 (25점)
+    roe_score = 0
+    if agg.has_loss:
+        roe_score = 0
+    elif agg.roe_15_plus == years_available:
+        roe_score = 25
+    elif agg.roe_15_plus >= years_available * 0.8:
+        roe_score = 20
+    elif agg.roe_12_plus == years_available:
+        roe_score = 15
+    elif agg.roe_12_plus >= years_available * 0.8:
+        roe_score = 10
+
+    # [2] ROIC 점수 (20점)
+    roic_score = 0
+    if agg.roic_12_plus == years_available:
+        roic_score = 20
+    elif agg.roic_12_plus >= years_available * 0.8:
+        roic_score = 15
+    elif agg.roic_9_plus == years_available:
+        roic_score = 10
+    elif agg.roic_9_plus >= years_available * 0.8:
+        roic_score = 5
+
+    # [3] Net Margin 점수 (15점)
+    avg_margin = agg.avg_net_margin
+    std_dev = agg.net_margin_std
+
+    avg_score = 0
+    if avg_margin >= 20.0:
+        avg_score = 10
+    elif avg_margin >= 15.0:
+        avg_score = 7
+    elif avg_margin >= 10.0:
+        avg_score = 5
+
+    stability_score = 0
+    if std_dev <= 3.0:
+        stability_score = 5
+    elif std_dev <= 5.0:
+        stability_score = 3
+    elif std_dev <= 8.0:
+        stability_score = 1
+
+    margin_score = avg_score + stability_score
+
+    # [4] 추세 점수 (15점)
+    trend_score = 0
+    if years_available >= 4:
+        recent_years = min(3, years_available - 1)
+        past_years = years_available - recent_years
+
+        recent_roe = sum(roe[-recent_years:]) / recent_years
+        past_roe = sum(roe[:past_years]) / past_years
+
+        improvement = ((recent_roe - past_roe) / past_roe * 100) if past_roe != 0 else 0
+
+        if improvement >= 20.0:
+            trend_score = 15
+        elif improvement >= 10.0:
+            trend_score = 12
+        elif improvement >= 5.0:
+            trend_score = 9
+        elif improvement >= 0.0:
+            trend_score = 6
+        elif improvement >= -5.0:
+            trend_score = 3
+
+    # [5] 재무 건전성 점수 (15점) - 최신 연도 기준
+    latest_debt_ratio = series.debt_ratio[-1]
+    latest_coverage = series.interest_coverage[-1]
+
+    debt_score = 0
+    if latest_debt_ratio <= 50.0:
+        debt_score = 10
+    elif latest_debt_ratio <= 80.0:
+        debt_score = 7
+    elif latest_debt_ratio <= 120.0:
+        debt_score = 4
+    elif latest_debt_ratio <= 150.0:
+        debt_score = 2
+
+    coverage_score = 0
+    if series.interest_expense[-1] == 0:
+        coverage_score = 5
+    elif latest_coverage >= 10.0:
+        coverage_score = 5
+    elif latest_coverage >= 5.0:
+        coverage_score = 3
+    elif latest_coverage >= 3.0:
+        coverage_score = 1
+
+    health_score = debt_score + coverage_score
+
+    # [6] 현금창출력 점수 (10점)
+    avg_fcf_margin = agg.avg_fcf_margin
+
+    cash_score = 0
+    if avg_fcf_margin >= 15.0:
+        cash_score = 10
+    elif avg_fcf_margin >= 10.0:
+        cash_score = 7
+    elif avg_fcf_margin >= 5.0:
+        cash_score = 4
+    elif avg_fcf_margin >= 0.0:
+        cash_score = 2
+
+    total_score = roe_score + roic_score + margin_score + trend_score + health_score + cash_score
+
+    # 적정가 계산
+    if policy.positive_eps_only:
+        eps_list = [e for e in series.eps if e and e > 0]
+        if len(eps_list) >= 2:
+            latest_eps = eps_list[-1]
+            eps_cagr = calculate_cagr(eps_list[0], latest_eps, len(eps_list) - 1)
+        else:
+            eps_cagr = 0
+            latest_eps = eps_list[-1] if eps_list else 0
+    else:
+        latest_eps = series.eps[-1]
+        eps_cagr = calculate_cagr(series.eps[0], latest_eps, years_available - 1)
+
+    conservative_growth = eps_cagr * config.growth_haircut
+    if policy.guard_future_eps and not latest_eps > 0:
+        future_eps = 0
+    else:
+        future_eps = latest_eps * math.pow(1 + conservative_growth / 100, 5)
+
+    _, fair_per = fair_per_tier(eps_cagr, config)
+
+    theoretical_value = future_eps * fair_per
+    intrinsic_value = theoretical_value * config.safety_factor
+
+    # 평균 지표
+    avg_roe = agg.avg_roe
+    avg_roic = agg.avg_roic
+
+    return {
+        "total_score": total_score,
+        "roe_score": roe_score,
+        "roic_score": roic_score,
+        "margin_score": margin_score,
+        "trend_score": trend_score,
+        "health_score": health_score,
+        "cash_score": cash_score,
+        "intrinsic_value": intrinsic_value,
+        "future_eps": future_eps,
+        "fair_per": fair_per,
+        "eps_cagr": eps_cagr,
+        "avg_roe": avg_roe,
+        "avg_roic": avg_roic,
+        "avg_net_margin": avg_margin,
+        "avg_fcf_margin": avg_fcf_margin,
+        "debt_ratio": latest_debt_ratio,
+        "years_data": years_available,
+    }
+
+
+# ============================================================================
+# 점수 계산 (전체 종목 벡터 연산)
+# ============================================================================
+
+# 연도별 지표 컬럼 (MetricSeries.FIELDS에서 year 제외)
+METRIC_COLUMNS = list(MetricSeries.FIELDS[1:])
+
+
+def build_metrics_frame(series_by_ticker: Dict[str, MetricSeries]) -> pd.DataFrame:
+    """
+    종목별 MetricSeries를 long-format DataFrame으로 변환
+
+    Returns:
+        컬럼: ticker, pos(종목 내 연도 순번, 0 = 가장 오래된 연도), year, 지표들
+    """
+    columns: Dict[str, list] = {name: [] for name in ("ticker", "pos") + MetricSeries.FIELDS}
+    for ticker, series in series_by_ticker.items():
+        size = len(series)
+        columns["ticker"].extend([ticker] * size)
+        columns["pos"].extend(range(size))
+        for field in MetricSeries.FIELDS:
+            columns[field].extend(getattr(series, field))
+
+    return pd.DataFrame(columns)
+
+
+def _to_matrix(metrics: pd.DataFrame, column: str, tickers: pd.Index, width: int) -> np.ndarray:
+    """지표 1개를 (종목 × 연도 순번) 행렬로 변환 (빈 칸은 NaN)"""
+    wide = metrics.pivot(index="ticker", columns="pos", values=column)
+    return wide.reindex(index=tickers, columns=range(width)).to_numpy(dtype=float)
+
+
+def _ordered_sum(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """mask 위치만 연도 순서대로 누적 (종목별 Python sum과 같은 덧셈 순서)"""
+    acc = np.zeros(values.shape[0])
+    for pos in range(values.shape[1]):
+        acc = np.where(mask[:, pos], acc + values[:, pos], acc)
+    return acc
+
+
+def _take(values: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """종목별로 idx 위치 값 선택"""
+    return np.take_along_axis(values, idx[:, None], axis=1)[:, 0]
+
+
+@dataclass(frozen=True)
+class MetricMatrices:
+    """
+    전체 종목 지표 행렬 (종목 × 연도 순번, 오래된 연도부터)
+
+    한 번 만들어 두면 기준값(ScoringConfig)만 바꿔 score_metric_matrices를 반복 호출할 수 있음
+    """
+    tickers: pd.Index
+    n_years: np.ndarray
+    values: Dict[str, np.ndarray]
+
+
+def build_metric_matrices(metrics: pd.DataFrame, tickers: Sequence[str]) -> MetricMatrices:
+    """
+    build_metrics_frame 결과 → 지표별 (종목 × 연도 순번) 행렬
+
+    Args:
+        metrics: build_metrics_frame 결과
+        tickers: 계산할 종목 순서 (metrics에 있는 종목만)
+    """
+    tickers = pd.Index(tickers)
+    n = metrics.groupby("ticker")["pos"].size().reindex(tickers).fillna(0).to_numpy(dtype=int)
+    width = max(int(n.max()) if len(n) else 0, 1)
+    values = {col: _to_matrix(metrics, col, tickers, width) for col in METRIC_COLUMNS}
+    return MetricMatrices(tickers=tickers, n_years=n, values=values)
+
+
+def score_metrics_frame(metrics: pd.DataFrame, tickers: Sequence[str], policy: ScoringPolicy,
+                        config: ScoringConfig = DEFAULT_SCORING) -> Dict[str, np.ndarray]:
+    """
+    전체 종목 점수 일괄 계산 (score_series와 같은 결과)
+
+    Args:
+        metrics: build_metrics_frame 결과
+        tickers: 계산할 종목 순서 (metrics에 있는 종목만)
+        policy: 소스별 정책
+        config: 기준값
+
+    Returns:
+        score_metric_matrices 참고
+    """
+    return score_metric_matrices(build_metric_matrices(metrics, tickers), policy, config)
+
+
+def score_metric_matrices(matrices: MetricMatrices, policy: ScoringPolicy,
+                          config: ScoringConfig = DEFAULT_SCORING) -> Dict[str, np.ndarray]:
+    """
+    지표 행렬로 전체 종목 점수 계산 (score_series와 같은 결과)
+
+    Returns:
+        score_series 결과 키별 배열 (matrices.tickers 순서). 유효 연도가 min_years 미만인
+        종목은 "scored" 배열이 False. 추가 키 "eps_cagr_computed"는
+        score_series에서 eps_cagr가 정수 0으로 남는 경우 False
+    """
+    n = matrices.n_years
+    m = matrices.values
+    width = m["roe"].shape[1]
+    pos = np.arange(width)[None, :]
+    valid = pos < n[:, None]
+    last_idx = np.maximum(n - 1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # [1] ROE 점수 (25점)
+        roe = m["roe"]
+        count_15_plus = ((roe >= config.roe_high) & valid).sum(axis=1)
+        count_12_plus = ((roe >= config.roe_low) & valid).sum(axis=1)
+        has_loss = ((roe < 0) & valid).any(axis=1)
+
+        roe_score = np.select(
+            [has_loss, count_15_plus == n, count_15_plus >= n * 0.8,
+             count_12_plus == n, count_12_plus >= n * 0.8],
+            [0, 25, 20, 15, 10], 0)
+
+        # [2] ROIC 점수 (20점)
+        roic = m["roic"]
+        count_12_plus_roic = ((roic >= config.roic_high) & valid).sum(axis=1)
+        count_9_plus_roic = ((roic >= config.roic_low) & valid).sum(axis=1)
+
+        roic_score = np.select(
+            [count_12_plus_roic == n, count_12_plus_roic >= n * 0.8,
+             count_9_plus_roic == n, count_9_plus_roic >= n * 0.8],
+            [20, 15, 10, 5], 0)
+
+        # [3] Net Margin 점수 (15점)
+        margins = m["net_margin"]
+        avg_margin = _ordered_sum(margins, valid) / n
+        variance = _ordered_sum((margins - avg_margin[:, None]) ** 2, valid) / n
+        std_dev = np.sqrt(variance)
+
+        avg_score = np.select([avg_margin >= 20.0, avg_margin >= 15.0, avg_margin >= 10.0], [10, 7, 5], 0)
+        stability_score = np.select([std_dev <= 3.0, std_dev <= 5.0, std_dev <= 8.0], [5, 3, 1], 0)
+        margin_score = avg_score + stability_score
+
+        # [4] 추세 점수 (15점) - 최근 3년 평균 ROE vs 이전 평균 ROE
+        recent_years = np.minimum(3, n - 1)
+        past_years = n - recent_years
+        recent_roe = _ordered_sum(roe, valid & (pos >= past_years[:, None])) / recent_years
+        past_roe = _ordered_sum(roe, valid & (pos < past_years[:, None])) / past_years
+        improvement = np.where(past_roe != 0, (recent_roe - past_roe) / past_roe * 100, 0)
+
+        trend_score = np.select(
+            [improvement >= 20.0, improvement >= 10.0, improvement >= 5.0,
+             improvement >= 0.0, improvement >= -5.0],
+            [15, 12, 9, 6, 3], 0)
+        trend_score = np.where(n >= 4, trend_score, 0)
+
+        # [5] 재무 건전성 점수 (15점) - 최신 연도 기준
+        latest_debt = _take(m["debt_ratio"], last_idx)
+        latest_coverage = _take(m["interest_coverage"], last_idx)
+        latest_interest = _take(m["interest_expense"], last_idx)
+
+        debt_score = np.select(
+            [latest_debt <= 50.0, latest_debt <= 80.0, latest_debt <= 120.0, latest_debt <= 150.0],
+            [10, 7, 4, 2], 0)
+        coverage_score = np.select(
+            [latest_interest == 0, latest_coverage >= 10.0, latest_coverage >= 5.0, latest_coverage >= 3.0],
+            [5, 5, 3, 1], 0)
+        health_score = debt_score + coverage_score
+
+        # [6] 현금창출력 점수 (10점)
+        avg_fcf_margin = _ordered_sum(m["fcf_margin"], valid) / n
+        cash_score = np.select(
+            [avg_fcf_margin >= 15.0, avg_fcf_margin >= 10.0, avg_fcf_margin >= 5.0, avg_fcf_margin >= 0.0],
+            [10, 7, 4, 2], 0)
+
+        total_score = roe_score + roic_score + margin_score + trend_score + health_score + cash_score
+
+        # 적정가 계산
+        eps = m["eps"]
+        if policy.positive_eps_only:
+            eps_mask = valid & (eps > 0)
+            eps_count = eps_mask.sum(axis=1)
+            first_idx = np.argmax(eps_mask, axis=1)
+            last_eps_idx = width - 1 - np.argmax(eps_mask[:, ::-1], axis=1)
+            oldest_eps = _take(eps, first_idx)
+            latest_eps = np.where(eps_count > 0, _take(eps, last_eps_idx), 0.0)
+            eps_cagr_computed = eps_count >= 2
+            cagr_years = eps_count - 1
+        else:
+            oldest_eps = eps[:, 0]
+            latest_eps = _take(eps, last_idx)
+            eps_cagr_computed = np.ones(len(n), dtype=bool)
+            cagr_years = n - 1
+
+        ratio = latest_eps / oldest_eps
+        growth = (np.power(ratio, 1.0 / cagr_years) - 1) * 100
+        cagr_defined = (eps_cagr_computed & (oldest_eps > 0) & ~np.isnan(latest_eps)
+                        & (cagr_years > 0) & (ratio > 0))
+        eps_cagr = np.where(cagr_defined, np.maximum(growth, 0.0), 0.0)
+
+        conservative_growth = eps_cagr * config.growth_haircut
+        future_eps = latest_eps * np.power(1 + conservative_growth / 100, 5)
+        if policy.guard_future_eps:
+            future_eps = np.where(latest_eps > 0, future_eps, 0.0)
+
+        fair_per = np.select(
+            [eps_cagr >= config.per_growth_high, eps_cagr >= config.per_growth_mid, eps_cagr >= 0.0],
+            [config.per_high, config.per_mid, config.per_low], config.per_negative)
+        intrinsic_value = future_eps * fair_per * config.safety_factor
+
+        avg_roe = _ordered_sum(roe, valid) / n
+        avg_roic = _ordered_sum(roic, valid) / n
+
+    return {
+        "scored": n >= policy.min_years,
+        "total_score": total_score,
+        "roe_score": roe_score,
+        "roic_score": roic_score,
+        "margin_score": margin_score,
+        "trend_score": trend_score,
+        "health_score": health_score,
+        "cash_score": cash_score,
+        "intrinsic_value": intrinsic_value,
+        "future_eps": future_eps,
+        "fair_per": fair_per,
+        "eps_cagr": eps_cagr,
+        "eps_cagr_computed": eps_cagr_computed,
+        "avg_roe": avg_roe,
+        "avg_roic": avg_roic,
+        "avg_net_margin": avg_margin,
+        "avg_fcf_margin": avg_fcf_margin,
+        "debt_ratio": latest_debt,
+        "years_data": n,
+    }
@@ -0,0 +1,188 @@
+"""
+Supabase DB 일괄 읽기/쓰기 유틸
+
+설계 의도:
+- 종목마다 1건씩 조회/insert 하던 DB 접근을 전체 조회 + 배치 단위 요청으로 묶음
+  (약 520건 → 수 건의 요청)
+- 일시적 오류(연결/타임아웃/5xx/429)는 멱등한 upsert만 재시도
+  (insert는 요청이 반영됐는지 알 수 없으므로 재시도하지 않음 → 중복 행 방지)
+- 제약 조건 위반 같은 4xx 오류는 재시도 없이 배치를 반으로 나눠 문제 행만 격리
+- yf_result.py / fmp_result.py가 함께 사용
+
+사용법:
+    from db_batch import fetch_all_rows, upsert_rows_batched
+
+    stocks = fetch_all_rows(supabase, "stocks", "ticker, stock_id")
+    saved, failed = upsert_rows_batched(supabase, "buffett_result", rows, on_conflict="run_id,stock_id")
+    saved, failed = upsert_rows_batched(supabase, "latest_price", rows, on_conflict="stock_id")
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from postgrest.exceptions import APIError
+from supabase import Client
+
+# 기본 배치 크기 (행 수)
+DEFAULT_BATCH_SIZE = 200
+
+# 전체 조회 시 페이지 크기 (PostgREST 기본 최대 행 수)
+FETCH_PAGE_SIZE = 1000
+
+# 배치 요청 재시도 횟수 / 대기 시간 (초, 시도마다 2배) - upsert의 일시적 오류에만 적용
+DEFAULT_BATCH_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 1.0
+
+# 일시적 오류로 보는 PostgreSQL SQLSTATE (클래스 접두사 또는 전체 코드)
+# 08: 연결 오류, 53: 리소스 부족, 40001/40P01: 직렬화 실패/교착, 57014/57P01: 타임아웃 취소/서버 종료
+TRANSIENT_SQLSTATE_PREFIXES = ("08", "53")
+TRANSIENT_SQLSTATES = {"40001", "40P01", "57014", "57P01"}
+
+# PostgREST가 DB에 연결하지 못했을 때의 오류 코드 (HTTP 503)
+TRANSIENT_POSTGREST_CODES = {"PGRST000", "PGRST001", "PGRST002"}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    재시도하면 성공할 수 있는 오류인지 판단
+
+    - 연결 실패/타임아웃 (httpx 전송 오류)
+    - HTTP 5xx, 429 (응답 본문이 JSON이 아니면 APIError.code에 상태 코드가 들어옴)
+    - DB 연결/리소스/교착 계열 SQLSTATE, PostgREST 연결 오류
+
+    제약 조건 위반, 잘못된 값 같은 4xx 오류는 다시 보내도 같은 결과이므로 False
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+
+    if not isinstance(error, APIError):
+        return False
+
+    code = error.code
+    if isinstance(code, int) or (isinstance(code, str) and code.isdigit() and len(code) == 3):
+        status = int(code)
+        return status >= 500 or status == 429
+
+    code = str(code or "")
+    return (code in TRANSIENT_SQLSTATES
+            or code in TRANSIENT_POSTGREST_CODES
+            or code.startswith(TRANSIENT_SQLSTATE_PREFIXES))
+
+
+def _execute_with_retry(request, retries: int) -> None:
+    """
+    요청 실행 (일시적 오류만 retries회 재시도, 그 외 오류나 마지막 실패는 그대로 발생)
+    """
+    for attempt in range(retries + 1):
+        try:
+            request().execute()
+            return
+        except Exception as e:
+            if attempt == retries or not is_transient_error(e):
+                raise
+            time.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def fetch_all_rows(supabase: Client, table: str, columns: str,
+                   page_size: int = FETCH_PAGE_SIZE) -> List[Dict]:
+    """
+    테이블 전체 행 조회 (range 페이지 단위로 끝까지)
+
+    Args:
+        supabase: Supabase 클라이언트
+        table: 테이블 이름
+        columns: 조회할 컬럼 (예: "ticker, stock_id")
+        page_size: 요청 1건당 행 수
+    """
+    rows: List[Dict] = []
+    start = 0
+
+    while True:
+        result = supabase.table(table).select(columns).range(start, start + page_size - 1).execute()
+        page = result.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def write_rows_batched(supabase: Client, table: str, rows: List[Dict],
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       retries: int = DEFAULT_BATCH_RETRIES,
+                       on_conflict: Optional[str] = None) -> Tuple[int, List[Dict]]:
+    """
+    여러 행을 배치 단위로 기록 (insert, on_conflict 지정 시 upsert)
+
+    - 일시적 오류: upsert만 retries회 재시도, 그래도 실패하면 배치 전체를 실패로 처리
+      (insert는 재시도하지 않음 - 요청이 반영됐을 수 있어 중복 행이 생길 수 있음)
+    - 그 외 오류(4xx 등): 재시도 없이 배치를 반으로 나눠 다시 보내
+      최종적으로 실패한 행만 걸러냄 (분할된 요청도 재시도하지 않음)
+
+    Args:
+        supabase: Supabase 클라이언트
+        table: 테이블 이름
+        rows: 기록할 행 목록
+        batch_size: 요청 1건당 최대 행 수
+        retries: 배치별 재시도 횟수 (upsert의 일시적 오류에만 적용)
+        on_conflict: upsert 충돌 기준 컬럼 (None이면 insert)
+
+    Returns:
+        (기록 성공 행 수, 실패한 행 목록)
+    """
+    def request_for(batch: List[Dict]):
+        if on_conflict:
+            return lambda: supabase.table(table).upsert(batch, on_conflict=on_conflict)
+        return lambda: supabase.table(table).insert(batch)
+
+    # upsert만 멱등이므로 재시도
+    batch_retries = retries if on_conflict else 0
+
+    def write(batch: List[Dict], retry_count: int) -> Tuple[int, List[Dict]]:
+        try:
+            _execute_with_retry(request_for(batch), retry_count)
+            return len(batch), []
+        except Exception as e:
+            if is_transient_error(e):
+                print(f"⚠️ {table} 배치 저장 실패 ({len(batch)}행, 일시적 오류): {e}")
+                return 0, batch
+            if len(batch) == 1:
+                print(f"⚠️ {table} 행 저장 실패: {e}")
+                return 0, batch
+
+        # 이분 분할로 실패 행 격리 (결정적 오류이므로 재시도하지 않음)
+        mid = len(batch) // 2
+        saved_left, failed_left = write(batch[:mid], 0)
+        saved_right, failed_right = write(batch[mid:], 0)
+        return saved_left + saved_right, failed_left + failed_right
+
+    saved = 0
+    failed: List[Dict] = []
+    step = max(1, batch_size)
+
+    for start in range(0, len(rows), step):
+        batch_saved, batch_failed = write(rows[start:start + step], batch_retries)
+        saved += batch_saved
+        failed.extend(batch_failed)
+
+    return saved, failed
+
+
+def insert_rows_batched(supabase: Client, table: str, rows: List[Dict],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[int, List[Dict]]:
+    """여러 행을 배치 insert (재시도 없음, write_rows_batched 참고)"""
+    return write_rows_batched(supabase, table, rows, batch_size)
+
+
+def upsert_rows_batched(supabase: Client, table: str, rows: List[Dict], on_conflict: str,
+                        batch_size: int = DEFAULT_BATCH_SIZE,
+                        retries: int = DEFAULT_BATCH_RETRIES) -> Tuple[int, List[Dict]]:
+    """
+    여러 행을 배치 upsert (write_rows_batched 참고)
+
+    같은 배치에 충돌 키가 중복되면 upsert 자체가 실패하므로,
+    키별로 마지막 행만 남깁니다. (복합 키는 "run_id,stock_id"처럼 쉼표로 구분)
+    """
+    key_columns = [column.strip() for column in on_conflict.split(",")]
+    unique_rows = list({tuple(row[c] for c in key_columns): row for row in rows}.values())
+    return write_rows_batched(supabase, table, unique_rows, batch_size, retries, on_conflict)
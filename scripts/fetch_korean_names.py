@@ -14,10 +14,11 @@ S&P500 + NASDAQ100 종목 한글명 자동 수집 스크립트
 import json
 import time
 import requests
-import pandas as pd
 from pathlib import Path
 from typing import Optional
 
+from ticker_universe import get_sp500_constituents, get_nasdaq100_constituents
+
 # ============================================================
 # 설정
 # ============================================================
@@ -91,72 +92,6 @@ KNOWN_KOREAN_NAMES = {
 }
 
 
-def get_sp500_tickers() -> list[str]:
-    """
-    S&P 500 티커 및 회사명 리스트 가져오기
-    
-    Returns:
-        list: [(ticker, company_name), ...]
-    """
-    try:
-        print("\n🔍 S&P 500 티커 리스트 가져오는 중...")
-        url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
-        df = pd.read_csv(url)
-        
-        # (ticker, company_name) 튜플 리스트
-        tickers = []
-        for _, row in df.iterrows():
-            ticker = str(row["Symbol"]).strip().replace(".", "-")
-            name = str(row["Name"]).strip() if "Name" in df.columns else ""
-            tickers.append((ticker, name))
-        
-        print(f"✅ S&P 500: {len(tickers)}개 종목")
-        return tickers
-    except Exception as e:
-        print(f"❌ S&P 500 가져오기 실패: {e}")
-        return []
-
-
-def get_nasdaq100_tickers() -> list[str]:
-    """
-    NASDAQ 100 티커 및 회사명 리스트 가져오기
-    
-    Returns:
-        list: [(ticker, company_name), ...]
-    """
-    try:
-        print("\n🔍 NASDAQ 100 티커 리스트 가져오는 중...")
-        url = "https://en.wikipedia.org/wiki/Nasdaq-100"
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        
-        tables = pd.read_html(requests.get(url, headers=headers).content)
-        
-        nasdaq100_df = None
-        for table in tables:
-            if "Ticker" in table.columns or "Symbol" in table.columns:
-                nasdaq100_df = table
-                break
-        
-        if nasdaq100_df is None:
-            print("❌ NASDAQ 100 테이블을 찾을 수 없습니다")
-            return []
-        
-        ticker_col = "Ticker" if "Ticker" in nasdaq100_df.columns else "Symbol"
-        name_col = "Company" if "Company" in nasdaq100_df.columns else None
-        
-        tickers = []
-        for _, row in nasdaq100_df.iterrows():
-            ticker = str(row[ticker_col]).strip()
-            name = str(row[name_col]).strip() if name_col else ""
-            tickers.append((ticker, name))
-        
-        print(f"✅ NASDAQ 100: {len(tickers)}개 종목")
-        return tickers
-    except Exception as e:
-        print(f"❌ NASDAQ 100 가져오기 실패: {e}")
-        return []
-
-
 def search_korean_wikipedia(company_name: str, ticker: str) -> Optional[str]:
     """
     Wikipedia 한국어판에서 회사 한글명 검색
@@ -242,9 +177,9 @@ def fetch_all_korean_names() -> dict[str, str]:
     print("🚀 미국 주식 한글명 수집 시작")
     print("=" * 80)
     
-    # 티커 수집
-    sp500 = get_sp500_tickers()
-    nasdaq100 = get_nasdaq100_tickers()
+    # 티커 수집 (ticker, company_name)
+    sp500 = get_sp500_constituents() or []
+    nasdaq100 = get_nasdaq100_constituents() or []
     
     # 중복 제거
     all_stocks = {}
@@ -5,7 +5,9 @@ FMP (Financial Modeling Prep) 데이터 수집 스크립트
 - 버핏원픽 서비스를 위한 재무 데이터 수집
 - FMP API를 통해 S&P 500, NASDAQ 100 종목의 재무제표와 현재가 수집
 - 원본 데이터를 Supabase Storage에 JSON 형태로 저장
-- 무료 요금제 제약 (250회/일, 5회/분) 준수
+- 무료 요금제 제약 (250회/일, 5회/분) 준수: 공용 레이트 리미터가 분당/일일 한도를 관리
+  (유료 요금제는 --per-minute / --per-day 또는 FMP_CALLS_PER_MINUTE / FMP_CALLS_PER_DAY)
+- --plan: 하루 한도로 끝나지 않는 수집을 여러 날에 나눠 실행 (quota_planner, 커서/사용량은 Storage에 저장)
 
 실행 모드:
 - --mode tickers    : 티커 목록 갱신 (월 1회)
@@ -16,21 +18,38 @@ FMP (Financial Modeling Prep) 데이터 수집 스크립트
 사용법:
     python fmp_data_collect.py --mode tickers
     python fmp_data_collect.py --mode financials
+    python fmp_data_collect.py --mode financials --resume
+    python fmp_data_collect.py --mode financials --bulk
+    python fmp_data_collect.py --mode financials --plan
     python fmp_data_collect.py --mode prices
     python fmp_data_collect.py --mode test
 """
 
+import io
 import os
+import sys
+import csv
 import json
+import math
 import time
+import random
 import argparse
+import threading
 import requests
-import pandas as pd
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
 from tqdm import tqdm
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from storage_gateway import upload_bytes, download_bytes, content_hash, list_folder
+from run_manifest import RunManifest, ManifestLoadError
+from quota_planner import QuotaPlan, QuotaPlanLoadError
+from ticker_universe import (
+    get_sp500_tickers, get_nasdaq100_tickers,
+    membership_diff, has_changes, print_membership_diff, latest_ticker_month,
+)
 
 # ============================================================================
 # 환경 설정
@@ -50,8 +69,132 @@ FMP_BASE_URL = "https://financialmodelingprep.com/stable"
 # Storage 버킷 이름
 BUCKET_NAME = "fmp-raw-data"
 
-# Rate Limit 설정 (무료 요금제: 5회/분)
-RATE_LIMIT_DELAY = 12  # 12초 간격 = 5회/분
+# Rate Limit 설정 (무료 요금제: 5회/분, 250회/일, 유료 요금제는 환경 변수/CLI로 변경)
+DEFAULT_CALLS_PER_MINUTE = int(os.getenv('FMP_CALLS_PER_MINUTE') or 5)
+DEFAULT_CALLS_PER_DAY = int(os.getenv('FMP_CALLS_PER_DAY') or 250)
+
+# 재무제표 실행 기록 파일명 (financials/{year}/ 아래, --resume / --retry-failed용)
+RUN_MANIFEST_FILE = "_run.json"
+
+# 일일 한도 분할 수집 계획 (버킷 루트, 오늘 사용한 호출 수 + 모드별 커서, --plan용)
+QUOTA_PLAN_FILE = "_quota_plan.json"
+
+# 수집 계획 사용량 중간 저장 주기 (API 호출 수, 강제 종료돼도 그때까지의 사용량은 남김)
+QUOTA_PLAN_SAVE_EVERY = 25
+
+# 429/5xx/네트워크 에러 재시도 (지수 백오프: 기본 대기 × 2^시도, 최대 대기 상한)
+FMP_MAX_RETRIES = 4
+FMP_BACKOFF_BASE = 15.0
+FMP_BACKOFF_MAX = 300.0
+
+# --plan 배치 크기 산정 시 재시도용으로 남겨둘 오늘 남은 호출 비율
+# (재시도도 일일 한도를 쓰므로, 남은 호출을 모두 종목에 배정하면 마지막 종목들이 한도 소진으로 잘림)
+PLAN_RETRY_HEADROOM = 0.1
+
+
+class DailyQuotaExceeded(Exception):
+    """일일 API 호출 한도 소진 (수집을 중단하고 다음 날 이어서 실행)"""
+
+
+class ApiRateLimiter:
+    """
+    분당/일일 호출 한도를 함께 지키는 스레드 안전 레이트 리미터
+
+    - 분당 한도: 최근 60초 호출 시각을 기록하는 슬라이딩 윈도우
+      (어느 60초 구간에서도 per_minute회를 넘지 않으면서, 여유가 있으면 바로 호출)
+    - 일일 한도: UTC 날짜별 호출 수, 소진되면 DailyQuotaExceeded
+    - pause(): 429 Retry-After/백오프 동안 모든 호출 스레드를 함께 대기시킴
+    - on_usage(): every회 호출마다 오늘 사용량을 콜백으로 알림 (수집 계획 중간 저장)
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, per_minute: int = DEFAULT_CALLS_PER_MINUTE,
+                 per_day: Optional[int] = DEFAULT_CALLS_PER_DAY):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self._calls = deque()
+        self._day = None
+        self._day_calls = 0
+        self._paused_until = 0.0
+        self._usage_callback: Optional[Callable[[str, int], None]] = None
+        self._usage_every = 0
+        self._lock = threading.Lock()
+
+    def on_usage(self, callback: Optional[Callable[[str, int], None]], every: int):
+        """every회 호출마다 callback(오늘 UTC 날짜, 오늘 호출 수) 실행 (호출 스레드에서)"""
+        with self._lock:
+            self._usage_callback = callback
+            self._usage_every = max(1, every)
+
+    def _roll_day(self):
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if today != self._day:
+            self._day = today
+            self._day_calls = 0
+
+    def usage(self) -> Tuple[str, int]:
+        """(오늘 UTC 날짜, 오늘 호출 수)"""
+        with self._lock:
+            self._roll_day()
+            return self._day, self._day_calls
+
+    def restore_usage(self, calls: int):
+        """이전 실행에서 오늘 이미 사용한 호출 수 반영 (수집 계획에서 복원)"""
+        with self._lock:
+            self._roll_day()
+            self._day_calls = max(self._day_calls, calls)
+
+    def remaining_today(self) -> Optional[int]:
+        """오늘 남은 호출 수 (일일 한도 없음 = None)"""
+        with self._lock:
+            self._roll_day()
+            return None if self.per_day is None else max(0, self.per_day - self._day_calls)
+
+    def acquire(self):
+        """호출 1회 허용될 때까지 대기 (일일 한도 소진 시 DailyQuotaExceeded)"""
+        while True:
+            with self._lock:
+                self._roll_day()
+                if self.per_day is not None and self._day_calls >= self.per_day:
+                    raise DailyQuotaExceeded(f"일일 호출 한도 {self.per_day}회 소진")
+
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.WINDOW_SECONDS:
+                    self._calls.popleft()
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif len(self._calls) < self.per_minute:
+                    self._calls.append(now)
+                    self._day_calls += 1
+                    callback = self._usage_callback
+                    if callback is None or self._day_calls % self._usage_every:
+                        return
+                    usage = (self._day, self._day_calls)
+                    break
+                else:
+                    wait = self.WINDOW_SECONDS - (now - self._calls[0])
+            time.sleep(wait)
+
+        # 사용량 알림은 lock 밖에서 (콜백이 Storage에 저장하는 동안 다른 스레드가 대기하지 않도록)
+        callback(*usage)
+
+    def pause(self, seconds: float):
+        """지금부터 seconds초 동안 모든 호출 대기"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+# 프로세스 공용 리미터 (configure_rate_limit로 요금제 한도 설정)
+_rate_limiter = ApiRateLimiter()
+
+
+def configure_rate_limit(per_minute: int, per_day: Optional[int]) -> ApiRateLimiter:
+    """공용 레이트 리미터 한도 설정 (per_day가 0 이하/None이면 일일 한도 없음)"""
+    global _rate_limiter
+    _rate_limiter = ApiRateLimiter(max(1, per_minute), per_day if per_day and per_day > 0 else None)
+    return _rate_limiter
 
 
 def validate_env():
@@ -82,19 +225,9 @@ def validate_env():
 
 
 # ============================================================================
-# Supabase Storage 클라이언트
+# Supabase Storage 저장/읽기
 # ============================================================================
 
-def get_supabase_client() -> Client:
-    """
-    Supabase 클라이언트 생성
-    
-    Returns:
-        Client: Supabase 클라이언트 인스턴스
-    """
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
-
 def save_to_storage(file_path: str, data: Any) -> bool:
     """
     Supabase Storage에 JSON 데이터 저장
@@ -109,18 +242,12 @@ def save_to_storage(file_path: str, data: Any) -> bool:
     보안: service_role 키를 사용하여 RLS 우회
     """
     try:
-        supabase = get_supabase_client()
-        
         # JSON 직렬화
         json_data = json.dumps(data, ensure_ascii=False, indent=2)
         json_bytes = json_data.encode('utf-8')
         
         # Storage에 업로드 (기존 파일 덮어쓰기)
-        result = supabase.storage.from_(BUCKET_NAME).upload(
-            path=file_path,
-            file=json_bytes,
-            file_options={"content-type": "application/json", "upsert": "true"}
-        )
+        upload_bytes(BUCKET_NAME, file_path, json_bytes, upsert=True)
         
         return True
         
@@ -141,10 +268,8 @@ def read_from_storage(file_path: str) -> Optional[Any]:
         파싱된 JSON 데이터 또는 None
     """
     try:
-        supabase = get_supabase_client()
-        
         # Storage에서 다운로드
-        response = supabase.storage.from_(BUCKET_NAME).download(file_path)
+        response = download_bytes(BUCKET_NAME, file_path)
         
         # JSON 파싱
         data = json.loads(response.decode('utf-8'))
@@ -156,166 +281,116 @@ def read_from_storage(file_path: str) -> Optional[Any]:
 
 
 # ============================================================================
-# Wikipedia 티커 파싱
+# FMP API 호출
 # ============================================================================
 
-def get_sp500_tickers() -> Optional[List[str]]:
-    """
-    S&P 500 티커 리스트를 가져옴 (GitHub 백업 소스 사용)
-    
-    Returns:
-        list: S&P 500 티커 리스트 또는 None
-    
-    데이터 소스: GitHub의 공개 S&P 500 데이터셋
-    """
-    try:
-        print("\n🔍 S&P 500 티커 리스트 가져오는 중...")
-        
-        # GitHub 공개 데이터셋 사용
-        url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
-        df = pd.read_csv(url)
-        tickers = df["Symbol"].tolist()
-        
-        # 클린업: 공백 제거, .을 -로 변환 (yfinance 호환용이지만 FMP도 동일)
-        tickers = [str(t).strip().replace(".", "-") for t in tickers if pd.notna(t)]
-        
-        print(f"✅ S&P 500: {len(tickers)}개 종목 발견!")
-        
-        return tickers
-        
-    except Exception as e:
-        print(f"❌ S&P 500 가져오기 실패: {str(e)}")
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초, 없거나 해석 불가면 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
         return None
-
-
-def get_nasdaq100_tickers() -> Optional[List[str]]:
-    """
-    Wikipedia에서 나스닥 100 티커 리스트를 가져옴
-    
-    Returns:
-        list: 나스닥 100 티커 리스트 또는 None
-    
-    주의: Wikipedia 구조 변경 시 파싱 실패 가능 → fallback 사용
-    """
     try:
-        print("\n🔍 나스닥 100 티커 리스트 가져오는 중...")
-        url = "https://en.wikipedia.org/wiki/Nasdaq-100"
-        
-        # User-Agent 헤더 추가하여 403 우회
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        # Wikipedia 테이블 읽기
-        tables = pd.read_html(requests.get(url, headers=headers).content)
-        
-        # 나스닥 100 구성 종목 테이블 찾기
-        nasdaq100_df = None
-        for i, table in enumerate(tables):
-            if "Ticker" in table.columns or "Symbol" in table.columns:
-                nasdaq100_df = table
-                break
-        
-        if nasdaq100_df is None:
-            print("⚠️ 테이블을 찾을 수 없습니다. Fallback 사용...")
-            return get_nasdaq100_fallback()
-        
-        # 티커 컬럼명 찾기
-        ticker_column = "Ticker" if "Ticker" in nasdaq100_df.columns else "Symbol"
-        
-        # 티커 리스트 추출
-        tickers = nasdaq100_df[ticker_column].tolist()
-        
-        # 클린업
-        tickers = [str(t).strip() for t in tickers if pd.notna(t)]
-        
-        print(f"✅ 나스닥 100: {len(tickers)}개 종목 발견!")
-        
-        return tickers
-        
-    except Exception as e:
-        print(f"⚠️ Wikipedia 파싱 실패: {str(e)}")
-        print("   Fallback 리스트를 사용합니다...")
-        return get_nasdaq100_fallback()
-
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
-def get_nasdaq100_fallback() -> List[str]:
-    """
-    나스닥 100 기본 리스트 (백업용)
-    
-    Wikipedia 파싱 실패 시 사용하는 하드코딩된 리스트입니다.
-    주기적으로 업데이트가 필요합니다.
-    """
-    return [
-        # 메가캡 테크
-        "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA",
-        # 대형 테크
-        "AVGO", "COST", "NFLX", "ADBE", "CSCO", "PEP", "AMD", "TMUS",
-        "INTC", "CMCSA", "INTU", "TXN", "QCOM", "AMGN", "ISRG", "HON",
-        "AMAT", "BKNG", "VRTX", "SBUX", "MDLZ", "GILD", "ADP", "ADI",
-        "REGN", "LRCX", "PANW", "MU", "SNPS", "KLAC", "CDNS", "MELI",
-        "PYPL", "ASML", "ABNB", "ORLY", "CRWD", "CTAS", "MAR", "MNST",
-        "MRVL", "NXPI", "WDAY", "PCAR", "FTNT", "CPRT", "ROST", "CHTR",
-        "DXCM", "ODFL", "KDP", "AEP", "PAYX", "KHC", "FAST", "EXC",
-        "IDXX", "VRSK", "BKR", "CTSH", "GEHC", "CSGP", "EA", "XEL",
-        "CCEP", "DDOG", "ANSS", "TEAM", "FANG", "ON", "CDW", "GFS",
-        "ZS", "ILMN", "TTD", "WBD", "BIIB", "MRNA", "DLTR", "WBA",
-        "SIRI", "LCID", "ARM", "SMCI", "CEG",
-    ]
 
+def backoff_seconds(attempt: int) -> float:
+    """attempt번째 재시도 대기 시간 (지수 백오프 + 지터, 상한 FMP_BACKOFF_MAX)"""
+    return min(FMP_BACKOFF_MAX, FMP_BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.8, 1.2)
 
-# ============================================================================
-# FMP API 호출
-# ============================================================================
 
-def call_fmp_api(endpoint: str, params: Dict[str, str] = None) -> Optional[Any]:
+def request_fmp(endpoint: str, params: Dict[str, str] = None,
+                stream: bool = False) -> Optional[requests.Response]:
     """
-    FMP API 호출
+    FMP API 요청 (성공한 응답 객체 반환)
     
     Args:
         endpoint: API 엔드포인트 (예: "income-statement")
         params: 추가 쿼리 파라미터
+        stream: True면 본문을 내려받지 않은 응답 반환 (대용량 bulk CSV용, 호출자가 close)
     
     Returns:
-        API 응답 데이터 또는 None
+        HTTP 200 응답 또는 None
+    
+    Raises:
+        DailyQuotaExceeded: 일일 호출 한도 소진
     
     에러 처리:
-    - 네트워크 에러: 재시도 없이 None 반환
-    - HTTP 에러: 상태 코드별 메시지 출력
-    - Rate Limit: 429 에러 시 대기 후 재시도
+    - 모든 호출은 공용 레이트 리미터에서 허용받은 뒤 실행 (고정 대기 없음)
+    - Rate Limit(429): Retry-After(없으면 지수 백오프)만큼 모든 스레드 대기 후 재시도
+    - 5xx/타임아웃/네트워크 에러: 지수 백오프 후 재시도 (최대 FMP_MAX_RETRIES회)
+    - 그 외 HTTP 에러: 상태 코드별 메시지 출력 후 None
     """
-    try:
-        url = f"{FMP_BASE_URL}/{endpoint}"
+    url = f"{FMP_BASE_URL}/{endpoint}"
+    
+    # 기본 파라미터에 API 키 추가
+    request_params = {"apikey": FMP_API_KEY}
+    if params:
+        request_params.update(params)
+    
+    for attempt in range(FMP_MAX_RETRIES + 1):
+        last_attempt = attempt == FMP_MAX_RETRIES
+        _rate_limiter.acquire()
         
-        # 기본 파라미터에 API 키 추가
-        request_params = {"apikey": FMP_API_KEY}
-        if params:
-            request_params.update(params)
+        try:
+            response = requests.get(url, params=request_params, timeout=30, stream=stream)
+        except requests.exceptions.RequestException as e:
+            if last_attempt:
+                print(f"   ❌ 네트워크 에러: {str(e)}")
+                return None
+            time.sleep(backoff_seconds(attempt))
+            continue
         
-        response = requests.get(url, params=request_params, timeout=30)
+        if response.status_code == 200:
+            return response
+        response.close()
         
         # HTTP 에러 처리
         if response.status_code == 429:
-            print("   ⏳ Rate Limit 도달. 60초 대기 중...")
-            time.sleep(60)
-            return call_fmp_api(endpoint, params)  # 재시도
+            wait = retry_after_seconds(response)
+            wait = backoff_seconds(attempt) if wait is None else wait
+            if last_attempt:
+                print(f"   ❌ Rate Limit 재시도 초과: {endpoint}")
+                return None
+            print(f"   ⏳ Rate Limit 도달. {wait:.0f}초 대기 중...")
+            _rate_limiter.pause(wait)
+            continue
         
-        if response.status_code == 403:
-            print(f"   ❌ 403 Forbidden: 엔드포인트 접근 불가 ({endpoint})")
-            return None
+        if response.status_code >= 500 and not last_attempt:
+            time.sleep(backoff_seconds(attempt))
+            continue
         
-        if response.status_code != 200:
-            print(f"   ❌ HTTP {response.status_code}: {endpoint}")
+        if response.status_code in (402, 403):
+            print(f"   ❌ {response.status_code}: 현재 요금제로 접근 불가 ({endpoint})")
             return None
         
-        return response.json()
-        
-    except requests.exceptions.Timeout:
-        print(f"   ⚠️ 타임아웃: {endpoint}")
+        print(f"   ❌ HTTP {response.status_code}: {endpoint}")
         return None
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ 네트워크 에러: {str(e)}")
+    
+    return None
+
+
+def call_fmp_api(endpoint: str, params: Dict[str, str] = None) -> Optional[Any]:
+    """
+    FMP API 호출 (JSON 응답, 재시도/레이트 리밋은 request_fmp 참고)
+    
+    Returns:
+        API 응답 데이터 또는 None
+    
+    Raises:
+        DailyQuotaExceeded: 일일 호출 한도 소진
+    """
+    response = request_fmp(endpoint, params)
+    if response is None:
         return None
+    
+    try:
+        return response.json()
     except json.JSONDecodeError:
         print(f"   ❌ JSON 파싱 실패: {endpoint}")
         return None
@@ -341,21 +416,171 @@ def fetch_profile(ticker: str) -> Optional[List[Dict]]:
     return call_fmp_api("profile", {"symbol": ticker})
 
 
+# 재무제표 저장 파일명(확장자 제외) → 조회 함수
+FINANCIAL_STATEMENTS = [
+    ("income-statement", fetch_income_statement),
+    ("balance-sheet", fetch_balance_sheet),
+    ("cash-flow", fetch_cash_flow),
+]
+
+
+# ============================================================================
+# FMP Bulk API (요금제가 허용할 때, 실패 시 종목별 호출로 대체)
+# ============================================================================
+
+# 재무제표 저장 파일명 → 연도별 전 종목 bulk CSV 엔드포인트
+BULK_STATEMENT_ENDPOINTS = {
+    "income-statement": "income-statement-bulk",
+    "balance-sheet": "balance-sheet-statement-bulk",
+    "cash-flow": "cash-flow-statement-bulk",
+}
+
+# 종목별 재무제표 API와 같은 보관 연수 (최신 fiscalYear부터)
+STATEMENT_YEARS = 5
+
+# bulk 프로필(현재가 포함) CSV 최대 part 수 (part마다 일부 종목)
+PROFILE_BULK_MAX_PARTS = 20
+
+# bulk CSV에서 숫자로 바꾸지 않는 필드 (종목별 JSON 응답에서 문자열인 필드)
+CSV_STRING_FIELDS = {
+    "symbol", "date", "reportedCurrency", "cik", "filingDate", "acceptedDate",
+    "fiscalYear", "period", "link", "finalLink", "companyName", "currency",
+    "isin", "cusip", "exchange", "exchangeFullName", "industry", "sector",
+    "website", "description", "ceo", "country", "phone", "address", "city",
+    "state", "zip", "image", "ipoDate", "range", "fullTimeEmployees",
+}
+
+
+def parse_csv_value(field: str, value: str) -> Any:
+    """bulk CSV 문자열 값 → 종목별 JSON 응답과 같은 타입 (빈 값은 None)"""
+    if value == "":
+        return None
+    if field in CSV_STRING_FIELDS:
+        return value
+    if value in ("true", "false"):
+        return value == "true"
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """bulk CSV 행 → 종목별 JSON 응답 형식 dict"""
+    return {k: parse_csv_value(k, v) for k, v in row.items() if k}
+
+
+def stream_bulk_csv(endpoint: str, params: Dict[str, str]) -> Optional[Iterator[Dict[str, str]]]:
+    """
+    bulk CSV를 내려받으면서 한 행씩 읽기 (전체를 메모리에 올리지 않음)
+    
+    Returns:
+        원본 문자열 행 iterator, 요청 실패(요금제 미지원 등)면 None
+    """
+    response = request_fmp(endpoint, params, stream=True)
+    if response is None:
+        return None
+    
+    def rows():
+        try:
+            response.raw.decode_content = True
+            yield from csv.DictReader(io.TextIOWrapper(response.raw, encoding="utf-8", newline=""))
+        finally:
+            response.close()
+    
+    return rows()
+
+
+def fetch_statement_bulk(statement: str, tickers: List[str],
+                         years: List[str]) -> Optional[Dict[str, List[Dict]]]:
+    """
+    재무제표 1종을 연도별 bulk CSV로 조회하여 종목별 목록으로 재구성
+    
+    Returns:
+        {ticker: 최신 fiscalYear부터 STATEMENT_YEARS개 행} (bulk 응답에 없는 종목 제외),
+        연도 중 하나라도 실패하면 None (종목별 호출로 대체)
+    """
+    wanted = set(tickers)
+    by_ticker: Dict[str, List[Dict]] = {}
+    
+    for year in years:
+        rows = stream_bulk_csv(BULK_STATEMENT_ENDPOINTS[statement], {"year": year, "period": "annual"})
+        if rows is None:
+            return None
+        try:
+            for row in rows:
+                if row.get("symbol") in wanted:
+                    by_ticker.setdefault(row["symbol"], []).append(parse_csv_row(row))
+        except (requests.exceptions.RequestException, csv.Error, UnicodeDecodeError) as e:
+            print(f"   ❌ bulk CSV 읽기 실패 ({statement}, {year}): {e}")
+            return None
+    
+    for ticker, rows in by_ticker.items():
+        rows.sort(key=lambda r: str(r.get("date") or r.get("fiscalYear") or ""), reverse=True)
+        del rows[STATEMENT_YEARS:]
+    return by_ticker
+
+
+def fetch_profiles_bulk(tickers: List[str]) -> Dict[str, Dict]:
+    """
+    bulk 프로필 CSV(part 단위)에서 종목별 프로필 수집 (모든 종목을 찾거나 빈 part면 중단)
+    
+    Returns:
+        {ticker: profile} - 찾지 못한 종목/요청 실패 시 해당 종목 제외 (종목별 호출로 대체)
+    """
+    wanted = set(tickers)
+    profiles: Dict[str, Dict] = {}
+    
+    for part in range(PROFILE_BULK_MAX_PARTS):
+        rows = stream_bulk_csv("profile-bulk", {"part": str(part)})
+        if rows is None:
+            break
+        
+        row_count = 0
+        try:
+            for row in rows:
+                row_count += 1
+                if row.get("symbol") in wanted:
+                    profiles[row["symbol"]] = parse_csv_row(row)
+        except (requests.exceptions.RequestException, csv.Error, UnicodeDecodeError) as e:
+            print(f"   ❌ bulk 프로필 읽기 실패 (part {part}): {e}")
+            break
+        
+        # 빈 part = 마지막 part 이후
+        if row_count == 0 or len(profiles) == len(wanted):
+            break
+    
+    return profiles
+
+
 # ============================================================================
 # 데이터 수집 함수
 # ============================================================================
 
+def latest_stored_ticker_month() -> Optional[str]:
+    """Storage tickers/ 아래 가장 최근 월 (구성 종목이 바뀐 달에만 폴더가 생김)"""
+    try:
+        return latest_ticker_month(list_folder(BUCKET_NAME, "tickers"))
+    except Exception as e:
+        print(f"⚠️ 티커 목록 폴더 조회 실패: {e}")
+        return None
+
+
 def collect_tickers() -> bool:
     """
     티커 목록 수집 및 Storage 저장
     
-    S&P 500과 NASDAQ 100 티커 목록을 Wikipedia/GitHub에서 가져와
-    Supabase Storage에 저장합니다.
+    S&P 500과 NASDAQ 100 티커 목록을 Wikipedia/GitHub에서 가져와 (ticker_universe, 조건부 요청 캐시)
+    가장 최근 저장된 목록과 구성 종목이 다를 때만 Supabase Storage에 저장합니다.
     
-    저장 경로: tickers/{year-month}/sp500.json, nasdaq100.json
+    저장 경로: tickers/{year-month}/sp500.json, nasdaq100.json, all.json
     
     Returns:
-        bool: 수집 성공 여부
+        bool: 수집 성공 여부 (변경 없어 저장을 생략한 경우 포함)
     """
     print("\n" + "=" * 60)
     print("📋 티커 목록 수집 시작")
@@ -364,58 +589,207 @@ def collect_tickers() -> bool:
     today = datetime.now()
     year_month = today.strftime("%Y-%m")
     
-    success = True
+    lists = {"sp500": get_sp500_tickers(), "nasdaq100": get_nasdaq100_tickers()}
+    if not all(lists.values()):
+        print("❌ 티커 목록을 가져오지 못해 저장하지 않습니다")
+        return False
     
-    # S&P 500
-    sp500 = get_sp500_tickers()
-    if sp500:
-        file_path = f"tickers/{year_month}/sp500.json"
-        data = {
-            "updated_at": today.isoformat(),
-            "count": len(sp500),
-            "tickers": sp500
-        }
-        if save_to_storage(file_path, data):
-            print(f"   ✅ 저장 완료: {file_path}")
-        else:
-            success = False
-    else:
-        success = False
+    # 가장 최근 저장된 목록과 구성 종목 비교
+    latest_month = latest_stored_ticker_month()
+    changed = latest_month is None
+    if latest_month:
+        print(f"\n🔎 구성 종목 변경분 (기준: tickers/{latest_month})")
+        for name, tickers in lists.items():
+            previous = read_from_storage(f"tickers/{latest_month}/{name}.json") or {}
+            diff = membership_diff(previous.get("tickers"), tickers)
+            print_membership_diff(name, diff)
+            changed = changed or has_changes(diff)
     
-    # NASDAQ 100
-    nasdaq100 = get_nasdaq100_tickers()
-    if nasdaq100:
-        file_path = f"tickers/{year_month}/nasdaq100.json"
+    if not changed:
+        print(f"\n✅ 구성 종목 변경 없음 - 저장 생략 (최신 목록: tickers/{latest_month})")
+        return True
+    
+    success = True
+    for name, tickers in lists.items():
+        file_path = f"tickers/{year_month}/{name}.json"
         data = {
             "updated_at": today.isoformat(),
-            "count": len(nasdaq100),
-            "tickers": nasdaq100
+            "count": len(tickers),
+            "tickers": tickers
         }
         if save_to_storage(file_path, data):
             print(f"   ✅ 저장 완료: {file_path}")
         else:
             success = False
-    else:
-        success = False
     
     # 통합 목록 (중복 제거)
-    if sp500 and nasdaq100:
-        all_tickers = sorted(list(set(sp500 + nasdaq100)))
-        file_path = f"tickers/{year_month}/all.json"
-        data = {
-            "updated_at": today.isoformat(),
-            "count": len(all_tickers),
-            "sp500_count": len(sp500),
-            "nasdaq100_count": len(nasdaq100),
-            "tickers": all_tickers
-        }
-        if save_to_storage(file_path, data):
-            print(f"   ✅ 저장 완료: {file_path} (통합 {len(all_tickers)}개)")
+    sp500, nasdaq100 = lists["sp500"], lists["nasdaq100"]
+    all_tickers = sorted(list(set(sp500 + nasdaq100)))
+    file_path = f"tickers/{year_month}/all.json"
+    data = {
+        "updated_at": today.isoformat(),
+        "count": len(all_tickers),
+        "sp500_count": len(sp500),
+        "nasdaq100_count": len(nasdaq100),
+        "tickers": all_tickers
+    }
+    if save_to_storage(file_path, data):
+        print(f"   ✅ 저장 완료: {file_path} (통합 {len(all_tickers)}개)")
+    else:
+        success = False
     
     return success
 
 
-def collect_financials(tickers: List[str], year: str = None) -> Dict[str, int]:
+def print_call_estimate(calls: int):
+    """API 호출 수 기준 예상 소요 시간/일일 한도 초과 여부 출력"""
+    limiter = _rate_limiter
+    remaining = limiter.remaining_today()
+    print(f"⏱️ 예상 소요 시간: 약 {calls / limiter.per_minute:.0f}분 "
+          f"(API {calls}회, 분당 {limiter.per_minute}회)")
+    if remaining is not None and calls > remaining:
+        print(f"⚠️ 오늘 남은 호출 {remaining}회로는 부족합니다. 한도 소진 시 중단되며 남은 종목을 출력합니다.")
+
+
+def run_with_quota(tickers: List[str], collect_one, desc: str, workers: int = 1) -> Dict[str, Any]:
+    """
+    종목별 수집 함수를 병렬 실행 (모든 스레드가 공용 레이트 리미터를 공유)
+
+    일일 한도가 소진되면 새 종목은 시작하지 않고 remaining_tickers에 남깁니다.
+
+    Args:
+        collect_one: ticker → 성공 여부
+    
+    Returns:
+        dict: {"success", "failed", "failed_tickers", "remaining_tickers"}
+    """
+    results = {"success": 0, "failed": 0, "failed_tickers": [], "remaining_tickers": []}
+    stop = threading.Event()
+    
+    def run(ticker: str):
+        if stop.is_set():
+            return ticker, None
+        try:
+            return ticker, collect_one(ticker)
+        except DailyQuotaExceeded as e:
+            if not stop.is_set():
+                stop.set()
+                tqdm.write(f"\n⛔ {e} - 수집 중단 (남은 종목은 다음 실행에서)")
+            return ticker, None
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for ticker, ok in tqdm(executor.map(run, tickers), total=len(tickers), desc=desc, ncols=80):
+            if ok is None:
+                results["remaining_tickers"].append(ticker)
+            elif ok:
+                results["success"] += 1
+            else:
+                results["failed"] += 1
+                results["failed_tickers"].append(ticker)
+    
+    return results
+
+
+def print_collect_results(results: Dict[str, Any]):
+    """수집 결과 요약 출력"""
+    print("\n" + "-" * 60)
+    print(f"✅ 성공: {results['success']}개")
+    print(f"❌ 실패: {results['failed']}개")
+    if results["failed_tickers"]:
+        print(f"   실패 종목: {', '.join(results['failed_tickers'][:20])}")
+        if len(results["failed_tickers"]) > 20:
+            print(f"   ... 외 {len(results['failed_tickers']) - 20}개")
+    if results["remaining_tickers"]:
+        print(f"⏸️ 한도 소진으로 미수집: {len(results['remaining_tickers'])}개 "
+              f"({results['remaining_tickers'][0]}부터)")
+
+
+def collect_ticker_financials(ticker: str, year: str, manifest: RunManifest) -> bool:
+    """
+    한 종목의 재무제표 3종 수집 및 저장 (실행 기록상 완료된 재무제표는 건너뜀)
+    
+    Raises:
+        DailyQuotaExceeded: 일일 호출 한도 소진 (그때까지 받은 재무제표는 기록됨)
+    """
+    ticker_success = True
+    
+    for statement, fetch in FINANCIAL_STATEMENTS:
+        if manifest.is_done(ticker, statement):
+            continue
+        
+        data = fetch(ticker)
+        ok = bool(data) and save_to_storage(f"financials/{year}/{ticker}/{statement}.json", data)
+        manifest.mark(ticker, statement, ok, content_hash(data) if ok else None)
+        ticker_success = ticker_success and ok
+    
+    return ticker_success
+
+
+def save_in_parallel(items: Dict[str, Any], save_one, desc: str, workers: int = 1) -> List[str]:
+    """
+    bulk 응답에서 나눈 종목별 데이터를 병렬 저장 (API 호출 없음)
+    
+    Args:
+        save_one: (ticker, data) → 성공 여부
+    
+    Returns:
+        저장에 성공한 티커 목록
+    """
+    if not items:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda item: (item[0], save_one(*item)), items.items())
+        return [ticker for ticker, ok in tqdm(results, total=len(items), desc=desc, ncols=80) if ok]
+
+
+def collect_financials_bulk(tickers: List[str], year: str, manifest: RunManifest,
+                            workers: int = 1) -> int:
+    """
+    재무제표를 연도별 bulk CSV로 수집 (재무제표 1종당 STATEMENT_YEARS + 1회 호출)
+    
+    저장한 재무제표는 실행 기록에 완료로 남기므로, bulk에 없는 종목이나
+    요금제 미지원으로 실패한 재무제표는 이후 종목별 수집이 이어서 받습니다.
+    
+    Returns:
+        bulk로 저장한 재무제표 파일 수
+    """
+    fiscal_years = [str(int(year) - i) for i in range(STATEMENT_YEARS + 1)]
+    saved = 0
+    
+    def save_one(ticker: str, statement: str, rows: List[Dict]) -> bool:
+        ok = save_to_storage(f"financials/{year}/{ticker}/{statement}.json", rows)
+        if ok:
+            manifest.mark(ticker, statement, True, content_hash(rows))
+        return ok
+    
+    for statement, _ in FINANCIAL_STATEMENTS:
+        pending = [t for t in tickers if not manifest.is_done(t, statement)]
+        if not pending:
+            continue
+        
+        print(f"📦 {statement} bulk 조회 ({fiscal_years[-1]}~{fiscal_years[0]}, API {len(fiscal_years)}회)")
+        try:
+            by_ticker = fetch_statement_bulk(statement, pending, fiscal_years)
+        except DailyQuotaExceeded as e:
+            print(f"⛔ {e} - bulk 수집 중단")
+            break
+        
+        if by_ticker is None:
+            print(f"   ⚠️ {statement} bulk 사용 불가 → 종목별 호출로 수집")
+            continue
+        
+        stored = save_in_parallel(by_ticker, lambda t, rows: save_one(t, statement, rows),
+                                  f"{statement} 저장", workers)
+        saved += len(stored)
+        print(f"   ✅ {len(stored)}/{len(pending)}개 종목 저장")
+    
+    return saved
+
+
+def collect_financials(tickers: List[str], year: str = None, workers: int = 1,
+                       resume: bool = False, retry_failed: bool = False,
+                       bulk: bool = False) -> Dict[str, Any]:
     """
     재무제표 수집 (손익계산서, 재무상태표, 현금흐름표)
     
@@ -423,73 +797,97 @@ def collect_financials(tickers: List[str], year: str = None) -> Dict[str, int]:
     Supabase Storage에 저장합니다.
     
     저장 경로: financials/{year}/{ticker}/income-statement.json 등
+    실행 기록: financials/{year}/_run.json (재무제표별 완료/실패, 시도 횟수, 내용 해시)
     
     Args:
         tickers: 수집할 티커 목록
         year: 저장할 연도 (기본값: 현재 연도)
+        workers: 동시 수집 스레드 수 (호출 한도는 공용 리미터가 관리)
+        resume: 실행 기록상 완료된 재무제표는 건너뜀
+        retry_failed: 실행 기록상 실패한 종목만 수집
+        bulk: 연도별 bulk CSV로 먼저 수집 (bulk에 없는 종목/재무제표만 종목별 호출)
     
     Returns:
-        dict: 성공/실패 카운트 {"success": n, "failed": n}
+        dict: 성공/실패 카운트 {"success": n, "failed": n, ...}
     
-    Rate Limit: 종목당 3 API 호출, 호출 간 12초 대기
+    Rate Limit: 종목당 3 API 호출 (bulk: 재무제표당 STATEMENT_YEARS + 1회),
+                공용 레이트 리미터(분당/일일 한도)로 호출 간격 조절
     """
     if year is None:
         year = datetime.now().strftime("%Y")
     
+    manifest = RunManifest(BUCKET_NAME, f"financials/{year}/{RUN_MANIFEST_FILE}",
+                           [statement for statement, _ in FINANCIAL_STATEMENTS])
+    if resume or retry_failed:
+        try:
+            manifest.load()
+        except ManifestLoadError as e:
+            # 빈 기록으로 진행하면 완료 종목을 다시 받고 기존 기록을 덮어씀
+            print(f"\n❌ {e}")
+            print("   실행 기록을 덮어쓰지 않도록 중단합니다. 원인을 해결한 뒤 다시 실행해주세요.")
+            sys.exit(1)
+    targets = manifest.select(tickers, resume=resume, retry_failed=retry_failed)
+    
     print("\n" + "=" * 60)
-    print(f"📊 재무제표 수집 시작 ({len(tickers)}개 종목)")
+    print(f"📊 재무제표 수집 시작 ({len(targets)}개 종목)")
     print("=" * 60)
     print(f"📅 저장 연도: {year}")
-    print(f"⏱️ 예상 소요 시간: 약 {len(tickers) * 3 * RATE_LIMIT_DELAY // 60}분")
-    print("-" * 60)
+    if resume or retry_failed:
+        print(f"🔁 {'실패 종목 재시도' if retry_failed else '이어서 수집'}: "
+              f"전체 {len(tickers)}개 중 {len(targets)}개")
     
-    results = {"success": 0, "failed": 0, "failed_tickers": []}
-    
-    for ticker in tqdm(tickers, desc="재무제표 수집", ncols=80):
-        ticker_success = True
-        
-        # 1. 손익계산서
-        income = fetch_income_statement(ticker)
-        if income:
-            save_to_storage(f"financials/{year}/{ticker}/income-statement.json", income)
-        else:
-            ticker_success = False
-        time.sleep(RATE_LIMIT_DELAY)
-        
-        # 2. 재무상태표
-        balance = fetch_balance_sheet(ticker)
-        if balance:
-            save_to_storage(f"financials/{year}/{ticker}/balance-sheet.json", balance)
-        else:
-            ticker_success = False
-        time.sleep(RATE_LIMIT_DELAY)
+    try:
+        if bulk:
+            print_call_estimate(len(FINANCIAL_STATEMENTS) * (STATEMENT_YEARS + 1))
+            print("-" * 60)
+            collect_financials_bulk(targets, year, manifest, workers)
+            print("-" * 60)
         
-        # 3. 현금흐름표
-        cashflow = fetch_cash_flow(ticker)
-        if cashflow:
-            save_to_storage(f"financials/{year}/{ticker}/cash-flow.json", cashflow)
-        else:
-            ticker_success = False
-        time.sleep(RATE_LIMIT_DELAY)
+        remaining_calls = sum(1 for t in targets for statement, _ in FINANCIAL_STATEMENTS
+                              if not manifest.is_done(t, statement))
+        if bulk:
+            print(f"🔂 종목별 호출로 수집할 재무제표: {remaining_calls}개")
+        print_call_estimate(remaining_calls)
+        print("-" * 60)
         
-        if ticker_success:
-            results["success"] += 1
-        else:
-            results["failed"] += 1
-            results["failed_tickers"].append(ticker)
+        results = run_with_quota(targets, lambda t: collect_ticker_financials(t, year, manifest),
+                                 "재무제표 수집", workers)
+    finally:
+        manifest.save()
     
-    print("\n" + "-" * 60)
-    print(f"✅ 성공: {results['success']}개")
-    print(f"❌ 실패: {results['failed']}개")
-    if results["failed_tickers"]:
-        print(f"   실패 종목: {', '.join(results['failed_tickers'][:20])}")
-        if len(results["failed_tickers"]) > 20:
-            print(f"   ... 외 {len(results['failed_tickers']) - 20}개")
+    print_collect_results(results)
+    manifest.print_summary()
     
     return results
 
 
-def collect_prices(tickers: List[str]) -> Dict[str, int]:
+def collect_ticker_price(ticker: str, today: str) -> bool:
+    """
+    한 종목의 현재가/기업 정보 수집 및 저장
+    
+    Raises:
+        DailyQuotaExceeded: 일일 호출 한도 소진
+    """
+    profile = fetch_profile(ticker)
+    
+    if not profile or len(profile) == 0:
+        return False
+    
+    # profile API는 배열로 반환되므로 첫 번째 요소 사용
+    return save_price_profile(ticker, today, profile[0] if isinstance(profile, list) else profile)
+
+
+def save_price_profile(ticker: str, today: str, profile: Dict) -> bool:
+    """현재가/기업 정보 저장 (종목별 호출과 bulk 프로필 공용 형식)"""
+    data = {
+        "fetched_at": datetime.now().isoformat(),
+        "ticker": ticker,
+        "profile": profile
+    }
+    return save_to_storage(f"prices/{today}/{ticker}.json", data)
+
+
+def collect_prices(tickers: List[str], workers: int = 1, bulk: bool = False) -> Dict[str, Any]:
     """
     현재가 수집 (일간)
     
@@ -500,11 +898,14 @@ def collect_prices(tickers: List[str]) -> Dict[str, int]:
     
     Args:
         tickers: 수집할 티커 목록
+        workers: 동시 수집 스레드 수 (호출 한도는 공용 리미터가 관리)
+        bulk: bulk 프로필 CSV로 먼저 수집 (bulk에 없는 종목만 종목별 호출)
     
     Returns:
         dict: 성공/실패 카운트
     
-    Rate Limit: 종목당 1 API 호출, 호출 간 12초 대기
+    Rate Limit: 종목당 1 API 호출 (bulk: part당 1회, 최대 PROFILE_BULK_MAX_PARTS회),
+                공용 레이트 리미터(분당/일일 한도)로 호출 간격 조절
     """
     today = datetime.now().strftime("%Y-%m-%d")
     
@@ -512,37 +913,80 @@ def collect_prices(tickers: List[str]) -> Dict[str, int]:
     print(f"💰 현재가 수집 시작 ({len(tickers)}개 종목)")
     print("=" * 60)
     print(f"📅 수집 날짜: {today}")
-    print(f"⏱️ 예상 소요 시간: 약 {len(tickers) * RATE_LIMIT_DELAY // 60}분")
+    
+    bulk_saved: List[str] = []
+    if bulk:
+        print(f"📦 bulk 프로필 조회 (part당 API 1회, 최대 {PROFILE_BULK_MAX_PARTS}회)")
+        try:
+            profiles = fetch_profiles_bulk(tickers)
+        except DailyQuotaExceeded as e:
+            print(f"⛔ {e} - bulk 수집 중단")
+            profiles = {}
+        bulk_saved = save_in_parallel(profiles, lambda t, profile: save_price_profile(t, today, profile),
+                                      "현재가 저장", workers)
+        print(f"   ✅ bulk로 {len(bulk_saved)}/{len(tickers)}개 종목 저장")
+    
+    saved = set(bulk_saved)
+    pending = [t for t in tickers if t not in saved]
+    print_call_estimate(len(pending))
     print("-" * 60)
     
-    results = {"success": 0, "failed": 0, "failed_tickers": []}
+    results = run_with_quota(pending, lambda t: collect_ticker_price(t, today), "현재가 수집", workers)
+    results["success"] += len(bulk_saved)
+    print_collect_results(results)
     
-    for ticker in tqdm(tickers, desc="현재가 수집", ncols=80):
-        profile = fetch_profile(ticker)
-        
-        if profile and len(profile) > 0:
-            # profile API는 배열로 반환되므로 첫 번째 요소 사용
-            data = {
-                "fetched_at": datetime.now().isoformat(),
-                "ticker": ticker,
-                "profile": profile[0] if isinstance(profile, list) else profile
-            }
-            if save_to_storage(f"prices/{today}/{ticker}.json", data):
-                results["success"] += 1
-            else:
-                results["failed"] += 1
-                results["failed_tickers"].append(ticker)
-        else:
-            results["failed"] += 1
-            results["failed_tickers"].append(ticker)
-        
-        time.sleep(RATE_LIMIT_DELAY)
+    return results
+
+
+def collect_planned(mode: str, tickers: List[str], plan: QuotaPlan, workers: int = 1) -> Dict[str, Any]:
+    """
+    오늘 남은 호출 한도만큼만 수집 (여러 날에 나눠 수집, --plan)
+    
+    저장된 커서에서 데이터가 오래된 종목부터 한도 안에서 꺼내 수집하고,
+    결과를 커서에 반영한 뒤 예상 완료일을 출력합니다.
+    재시도도 한도를 쓰므로 남은 호출의 PLAN_RETRY_HEADROOM만큼은 배정하지 않고,
+    그래도 한도가 소진되면 남은 종목은 커서에 그대로 남아 다음 실행에서 먼저 수집됩니다.
+    재무제표는 연도 단위 주기(실행 기록으로 재무제표별 이어받기), 현재가는 전 종목을 받으면 새 주기.
     
+    Args:
+        mode: "financials" 또는 "prices"
+        plan: 로드된 수집 계획 (오늘 사용량은 main에서 리미터에 복원)
+    
+    Returns:
+        dict: 이번 실행의 성공/실패 카운트
+    """
+    year = datetime.now().strftime("%Y")
+    if mode == "financials":
+        cycle, calls_per_ticker = year, len(FINANCIAL_STATEMENTS)
+        collect = lambda batch: collect_financials(batch, year, workers, resume=True)
+    else:
+        cycle, calls_per_ticker = None, 1
+        collect = lambda batch: collect_prices(batch, workers)
+    
+    pending = plan.prepare(mode, tickers, cycle)
+    remaining = _rate_limiter.remaining_today()
+    reserve = 0 if remaining is None else math.ceil(remaining * PLAN_RETRY_HEADROOM)
+    if remaining is not None and remaining - reserve < calls_per_ticker:
+        # 여유를 떼면 한 종목도 못 받는 경우 - 오늘 마지막 호출은 그대로 사용
+        reserve = 0
+    batch = pending if remaining is None else pending[:(remaining - reserve) // calls_per_ticker]
+    
+    print("\n" + "=" * 60)
+    print(f"🗓️ 분할 수집 계획 ({mode})")
+    print("=" * 60)
+    print(f"📋 이번 주기 남은 종목: {len(pending)}개 (오래된 데이터부터)")
+    print(f"📒 오늘 남은 API: {'무제한' if remaining is None else f'{remaining}회'} "
+          f"→ 이번 실행 {len(batch)}개 종목 (종목당 최대 {calls_per_ticker}회, 재시도 여유 {reserve}회)")
+    
+    results = {"success": 0, "failed": 0, "failed_tickers": [], "remaining_tickers": []}
+    if batch:
+        results = collect(batch)
+        skipped = set(results["remaining_tickers"]) | set(results["failed_tickers"])
+        plan.record(mode, [t for t in batch if t not in skipped], results["failed_tickers"])
+    
+    today, calls_today = _rate_limiter.usage()
     print("\n" + "-" * 60)
-    print(f"✅ 성공: {results['success']}개")
-    print(f"❌ 실패: {results['failed']}개")
-    if results["failed_tickers"]:
-        print(f"   실패 종목: {', '.join(results['failed_tickers'][:20])}")
+    plan.print_summary(mode, calls_per_ticker, _rate_limiter.per_day, today, calls_today)
     
     return results
 
@@ -552,29 +996,19 @@ def get_cached_tickers() -> Optional[List[str]]:
     Storage에서 캐시된 티커 목록 로드
     
     가장 최근 저장된 통합 티커 목록(all.json)을 읽어옵니다.
+    (구성 종목이 바뀐 달에만 저장하므로 이번 달 폴더가 없을 수 있음)
     없으면 None 반환.
     
     Returns:
         list: 티커 목록 또는 None
     """
-    today = datetime.now()
-    year_month = today.strftime("%Y-%m")
-    
-    # 이번 달 데이터 시도
-    data = read_from_storage(f"tickers/{year_month}/all.json")
-    if data and "tickers" in data:
-        print(f"✅ 캐시된 티커 목록 로드: {data['count']}개")
-        return data["tickers"]
-    
-    # 지난 달 데이터 시도
-    if today.month == 1:
-        prev_year_month = f"{today.year - 1}-12"
-    else:
-        prev_year_month = f"{today.year}-{today.month - 1:02d}"
+    latest_month = latest_stored_ticker_month()
+    if latest_month is None:
+        return None
     
-    data = read_from_storage(f"tickers/{prev_year_month}/all.json")
+    data = read_from_storage(f"tickers/{latest_month}/all.json")
     if data and "tickers" in data:
-        print(f"✅ 이전 티커 목록 로드: {data['count']}개 ({prev_year_month})")
+        print(f"✅ 캐시된 티커 목록 로드: {data['count']}개 ({latest_month})")
         return data["tickers"]
     
     return None
@@ -597,7 +1031,12 @@ def main():
 실행 예시:
   python fmp_data_collect.py --mode tickers      # 티커 목록 갱신
   python fmp_data_collect.py --mode financials   # 재무제표 수집
+  python fmp_data_collect.py --mode financials --resume        # 중단된 수집 이어서
+  python fmp_data_collect.py --mode financials --retry-failed  # 실패 종목만 재시도
+  python fmp_data_collect.py --mode financials --bulk          # bulk CSV로 수집 (요금제 필요)
   python fmp_data_collect.py --mode prices       # 현재가 수집
+  python fmp_data_collect.py --mode prices --bulk              # bulk 프로필로 현재가 수집
+  python fmp_data_collect.py --mode financials --plan          # 오늘 남은 한도만큼만 (매일 실행)
   python fmp_data_collect.py --mode test         # 테스트 (5종목)
         """
     )
@@ -617,7 +1056,54 @@ def main():
         help="수집할 종목 수 제한 (테스트용)"
     )
     
+    parser.add_argument(
+        "--per-minute",
+        type=int,
+        default=DEFAULT_CALLS_PER_MINUTE,
+        help=f"분당 API 호출 한도 (기본값: {DEFAULT_CALLS_PER_MINUTE}, 환경 변수 FMP_CALLS_PER_MINUTE)"
+    )
+    
+    parser.add_argument(
+        "--per-day",
+        type=int,
+        default=DEFAULT_CALLS_PER_DAY,
+        help=f"일일 API 호출 한도 (기본값: {DEFAULT_CALLS_PER_DAY}, 0이면 제한 없음, 환경 변수 FMP_CALLS_PER_DAY)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="동시 수집 스레드 수 (유료 요금제처럼 분당 한도가 클 때 사용, 기본값: 1)"
+    )
+    
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="FMP bulk CSV(재무제표 연도별, 프로필 part별)로 먼저 수집하고 빠진 종목만 종목별 호출 (bulk 지원 요금제 필요)"
+    )
+    
+    run_group = parser.add_mutually_exclusive_group()
+    run_group.add_argument(
+        "--resume",
+        action="store_true",
+        help="financials 모드: 실행 기록(financials/{year}/_run.json)상 완료된 재무제표는 건너뛰고 이어서 수집"
+    )
+    run_group.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="financials 모드: 실행 기록상 실패한 종목만 다시 수집"
+    )
+    run_group.add_argument(
+        "--plan",
+        action="store_true",
+        help=f"financials/prices 모드: 오늘 남은 일일 한도만큼만 오래된 종목부터 수집하고 "
+             f"커서를 저장 ({QUOTA_PLAN_FILE}, 매일 실행하면 여러 날에 나눠 완료)"
+    )
+    
     args = parser.parse_args()
+    if args.plan and args.bulk:
+        parser.error("--plan과 --bulk는 함께 사용할 수 없습니다")
     
     print("\n" + "=" * 60)
     print("🚀 FMP 데이터 수집 스크립트")
@@ -629,6 +1115,43 @@ def main():
     # 환경 변수 검증
     validate_env()
     
+    limiter = configure_rate_limit(args.per_minute, args.per_day)
+    
+    # 같은 날 앞선 실행(모든 모드)에서 사용한 호출 수 복원
+    plan = None
+    if args.mode != "tickers":
+        try:
+            plan = QuotaPlan(BUCKET_NAME, QUOTA_PLAN_FILE).load()
+        except QuotaPlanLoadError as e:
+            # 빈 계획으로 저장하면 커서와 오늘 사용량을 덮어씀
+            print(f"\n❌ {e}")
+            if args.plan:
+                print("   수집 계획을 덮어쓰지 않도록 중단합니다. 원인을 해결한 뒤 다시 실행해주세요.")
+                sys.exit(1)
+            print("   이번 실행의 API 사용량은 수집 계획에 기록하지 않습니다.")
+    
+    if plan is not None:
+        today, _ = limiter.usage()
+        limiter.restore_usage(plan.calls_on(today))
+        if plan.calls_on(today):
+            print(f"📒 오늘(UTC {today}) 이미 사용한 API: {plan.calls_on(today)}회")
+        limiter.on_usage(plan.save_usage, QUOTA_PLAN_SAVE_EVERY)
+    
+    try:
+        run_mode(args, plan)
+    finally:
+        # 중간에 실패/중단돼도 오늘 사용량은 저장 (다음 실행이 일일 한도를 넘지 않도록)
+        if plan is not None:
+            plan.save_usage(*limiter.usage())
+    
+    print("\n" + "=" * 60)
+    print("✅ 수집 완료!")
+    print(f"📅 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60 + "\n")
+
+
+def run_mode(args: argparse.Namespace, plan: Optional[QuotaPlan]):
+    """선택한 수집 모드 실행 (plan: --plan용 수집 계획)"""
     # 모드별 실행
     if args.mode == "tickers":
         collect_tickers()
@@ -650,7 +1173,11 @@ def main():
             tickers = tickers[:args.limit]
             print(f"⚠️ 종목 수 제한: {args.limit}개")
         
-        collect_financials(tickers)
+        if args.plan:
+            collect_planned("financials", tickers, plan, workers=args.workers)
+        else:
+            collect_financials(tickers, workers=args.workers,
+                               resume=args.resume, retry_failed=args.retry_failed, bulk=args.bulk)
         
     elif args.mode == "prices":
         # 캐시된 티커 목록 로드 시도
@@ -665,7 +1192,10 @@ def main():
             tickers = tickers[:args.limit]
             print(f"⚠️ 종목 수 제한: {args.limit}개")
         
-        collect_prices(tickers)
+        if args.plan:
+            collect_planned("prices", tickers, plan, workers=args.workers)
+        else:
+            collect_prices(tickers, workers=args.workers, bulk=args.bulk)
         
     elif args.mode == "test":
         # 테스트 모드: 5개 종목만
@@ -676,16 +1206,12 @@ def main():
         
         # 재무제표 수집 테스트
         print("\n[1/2] 재무제표 수집 테스트...")
-        collect_financials(test_tickers)
+        collect_financials(test_tickers, workers=args.workers, bulk=args.bulk)
         
         # 현재가 수집 테스트
         print("\n[2/2] 현재가 수집 테스트...")
-        collect_prices(test_tickers)
+        collect_prices(test_tickers, workers=args.workers, bulk=args.bulk)
     
-    print("\n" + "=" * 60)
-    print("✅ 수집 완료!")
-    print(f"📅 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60 + "\n")
 
 
 if __name__ == "__main__":
@@ -20,13 +20,27 @@
 
 import os
 import json
-import math
 import argparse
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from tqdm import tqdm
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from storage_gateway import (
+    download_bytes,
+    list_folder,
+    list_folder_all,
+    configure_storage,
+    is_local_storage,
+)
+from storage_cache import StorageDiskCache, DEFAULT_CACHE_MAX_MB
+from buffett_scoring import (
+    compute_year_metrics,
+    fair_per_tier,
+    MetricSeries,
+    score_series,
+    FMP_POLICY,
+    DEFAULT_SCORING,
+)
 
 # ============================================================================
 # 환경 설정
@@ -43,8 +57,19 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 BUCKET_NAME = "fmp-raw-data"
 
 
-def validate_env():
-    """환경 변수 검증"""
+def validate_env(require_database: bool = False):
+    """
+    환경 변수 검증
+
+    로컬 Storage 미러 사용 시 Storage용 Supabase 확인은 생략하지만,
+    require_database(DB 테이블 저장, *_result.py)면 Supabase 접속 정보는 항상 확인합니다.
+    """
+    if is_local_storage():
+        if not require_database:
+            print("✅ 로컬 Storage 미러 사용 (Supabase 환경 변수 확인 생략)")
+            return
+        print("✅ 로컬 Storage 미러 사용 (DB 저장용 Supabase 환경 변수만 확인)")
+
     missing = []
     
     if not SUPABASE_URL:
@@ -61,20 +86,34 @@ def validate_env():
     print("✅ 환경 변수 검증 완료")
 
 
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트 생성"""
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
-
 # ============================================================================
 # Storage 데이터 읽기
 # ============================================================================
 
+# 로컬 디스크 캐시 (--cache-dir 지정 시 활성화)
+_disk_cache: Optional[StorageDiskCache] = None
+
+
+def configure_cache(cache_dir: Optional[str], max_mb: int = DEFAULT_CACHE_MAX_MB) -> Optional[StorageDiskCache]:
+    """Storage 읽기 디스크 캐시 설정 (cache_dir가 없으면 비활성화)"""
+    global _disk_cache
+    _disk_cache = StorageDiskCache(cache_dir, max_mb) if cache_dir else None
+    return _disk_cache
+
+
+def print_cache_stats():
+    """디스크 캐시 사용 시 적중/실패 통계 출력"""
+    if _disk_cache is not None:
+        _disk_cache.print_stats()
+
+
 def read_from_storage(file_path: str) -> Optional[Any]:
-    """Storage에서 JSON 파일 읽기"""
+    """Storage에서 JSON 파일 읽기 (디스크 캐시 설정 시 캐시 경유)"""
     try:
-        supabase = get_supabase_client()
-        response = supabase.storage.from_(BUCKET_NAME).download(file_path)
+        if _disk_cache is not None:
+            response = _disk_cache.read(BUCKET_NAME, file_path)
+        else:
+            response = download_bytes(BUCKET_NAME, file_path)
         return json.loads(response.decode('utf-8'))
     except Exception as e:
         return None
@@ -114,10 +153,9 @@ def get_financial_data(ticker: str, year: str) -> Optional[Dict[str, List[Dict]]
 
 
 def list_tickers_from_prices(date: str) -> List[str]:
-    """prices 폴더에서 티커 목록 추출"""
+    """prices 폴더에서 티커 목록 추출 (전체 페이지)"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.storage.from_(BUCKET_NAME).list(f"prices/{date}")
+        result = list_folder_all(BUCKET_NAME, f"prices/{date}")
         
         if not result:
             return []
@@ -143,8 +181,7 @@ def find_latest_financial_year() -> Optional[str]:
         가장 최근 연도 문자열 (예: "2026") 또는 None
     """
     try:
-        supabase = get_supabase_client()
-        result = supabase.storage.from_(BUCKET_NAME).list("financials")
+        result = list_folder(BUCKET_NAME, "financials")
         
         if not result:
             return None
@@ -190,52 +227,9 @@ def get_latest_fiscal_year_from_data(financials: Dict[str, List[Dict]]) -> Optio
 
 
 # ============================================================================
-# 버핏 평가 계산 함수
+# 버핏 평가 보조 함수
 # ============================================================================
 
-def calculate_roe(net_income: float, total_equity: float) -> float:
-    """ROE (자기자본이익률) 계산"""
-    if total_equity == 0 or total_equity is None:
-        return 0.0
-    return (net_income / total_equity) * 100
-
-
-def calculate_roic(ebit: float, tax_rate: float, total_equity: float, total_liabilities: float) -> float:
-    """ROIC (투하자본이익률) 계산"""
-    if ebit is None or tax_rate is None:
-        return 0.0
-    nopat = ebit * (1 - tax_rate / 100)
-    invested_capital = total_equity + total_liabilities
-    if invested_capital == 0:
-        return 0.0
-    return (nopat / invested_capital) * 100
-
-
-def calculate_net_margin(net_income: float, revenue: float) -> float:
-    """순이익률 계산"""
-    if revenue == 0 or revenue is None:
-        return 0.0
-    return (net_income / revenue) * 100
-
-
-def calculate_fcf_margin(free_cash_flow: float, revenue: float) -> float:
-    """FCF 마진 계산"""
-    if revenue == 0 or revenue is None:
-        return 0.0
-    return (free_cash_flow / revenue) * 100
-
-
-def calculate_cagr(start_value: float, end_value: float, years: int) -> float:
-    """연평균 성장률 계산"""
-    if start_value <= 0 or start_value is None or end_value is None or years <= 0:
-        return 0.0
-    ratio = end_value / start_value
-    if ratio <= 0:
-        return 0.0
-    cagr = (math.pow(ratio, 1.0 / years) - 1) * 100
-    return max(cagr, 0.0)
-
-
 def get_trust_grade(years: int) -> Tuple[int, str, str]:
     """데이터 연수에 따른 신뢰등급"""
     if years >= 4:
@@ -258,9 +252,53 @@ def safe_get(data: Dict, key: str, default: float = 0) -> float:
 # FMP 데이터 → 연도별 지표 변환
 # ============================================================================
 
-def extract_yearly_metrics(financials: Dict[str, List[Dict]]) -> List[Dict]:
+def index_by_fiscal_year(statements: List[Dict]) -> Dict[str, Dict]:
+    """재무제표 목록 → {fiscalYear: 행} (같은 연도가 여러 번 있으면 첫 행 사용)"""
+    index: Dict[str, Dict] = {}
+    for row in statements:
+        fiscal_year = row.get("fiscalYear")
+        if fiscal_year and fiscal_year not in index:
+            index[fiscal_year] = row
+    return index
+
+
+def join_statements_by_year(financials: Dict[str, List[Dict]]) -> Tuple[List[Tuple[str, Dict, Dict, Dict]], List[str]]:
+    """
+    손익계산서/재무상태표/현금흐름표를 fiscalYear 기준으로 1회 조인
+    
+    Returns:
+        (손익계산서 행 순서의 (연도, 손익, 재무상태, 현금흐름) 목록 - 없는 재무제표는 {},
+         세 재무제표 중 하나라도 빠진 연도 목록 - 오름차순)
     """
-    FMP 재무제표 데이터에서 연도별 지표 추출
+    income_list = financials.get("income_statement", [])
+    balance_by_year = index_by_fiscal_year(financials.get("balance_sheet", []))
+    cashflow_by_year = index_by_fiscal_year(financials.get("cash_flow", []))
+    
+    joined = []
+    income_years = set()
+    
+    for income in income_list:
+        fiscal_year = income.get("fiscalYear")
+        if not fiscal_year:
+            continue
+        income_years.add(fiscal_year)
+        joined.append((
+            fiscal_year,
+            income,
+            balance_by_year.get(fiscal_year, {}),
+            cashflow_by_year.get(fiscal_year, {}),
+        ))
+    
+    all_years = income_years | balance_by_year.keys() | cashflow_by_year.keys()
+    complete_years = income_years & balance_by_year.keys() & cashflow_by_year.keys()
+    incomplete_years = sorted(all_years - complete_years)
+    
+    return joined, incomplete_years
+
+
+def extract_yearly_metrics(financials: Dict[str, List[Dict]]) -> Tuple[MetricSeries, List[str]]:
+    """
+    FMP 재무제표 데이터에서 연도별 지표 추출 (buffett_scoring 정규화 레코드)
     
     FMP 필드 매핑:
     - revenue → Total Revenue
@@ -273,270 +311,57 @@ def extract_yearly_metrics(financials: Dict[str, List[Dict]]) -> List[Dict]:
     - totalStockholdersEquity → Stockholders Equity
     - totalLiabilities → Total Liabilities
     - freeCashFlow → Free Cash Flow
-    """
-    income_list = financials.get("income_statement", [])
-    balance_list = financials.get("balance_sheet", [])
-    cashflow_list = financials.get("cash_flow", [])
     
-    if not income_list:
-        return []
+    순이익/자기자본/매출/EPS 중 하나라도 0인 연도는 평가에서 제외합니다.
     
-    # fiscalYear 기준으로 데이터 매칭
-    results = []
+    Returns:
+        (연도별 지표, 재무제표가 일부 빠진 연도 목록)
+    """
+    joined, incomplete_years = join_statements_by_year(financials)
+    rows = []
     
-    for income in income_list:
-        fiscal_year = income.get("fiscalYear")
-        if not fiscal_year:
-            continue
-        
-        # 같은 연도의 balance sheet 찾기
-        balance = next(
-            (b for b in balance_list if b.get("fiscalYear") == fiscal_year),
-            {}
-        )
-        
-        # 같은 연도의 cash flow 찾기
-        cashflow = next(
-            (c for c in cashflow_list if c.get("fiscalYear") == fiscal_year),
-            {}
-        )
-        
+    for fiscal_year, income, balance, cashflow in joined:
         # 필드 추출
         revenue = safe_get(income, "revenue")
         net_income = safe_get(income, "netIncome")
-        ebit = safe_get(income, "ebit")
-        pretax_income = safe_get(income, "incomeBeforeTax")
-        tax_expense = safe_get(income, "incomeTaxExpense")
-        interest_expense = safe_get(income, "interestExpense")
         diluted_eps = safe_get(income, "epsDiluted")
-        
         total_equity = safe_get(balance, "totalStockholdersEquity")
-        total_liabilities = safe_get(balance, "totalLiabilities")
-        
-        free_cash_flow = safe_get(cashflow, "freeCashFlow")
-        
-        # 세율 계산
-        tax_rate = (tax_expense / pretax_income * 100) if pretax_income != 0 else 0
         
-        # 지표 계산
-        roe = calculate_roe(net_income, total_equity)
-        roic = calculate_roic(ebit, tax_rate, total_equity, total_liabilities)
-        net_margin = calculate_net_margin(net_income, revenue)
-        fcf_margin = calculate_fcf_margin(free_cash_flow, revenue)
-        debt_ratio = (total_liabilities / total_equity * 100) if total_equity != 0 else 0
-        
-        # 이자보상배율
-        if interest_expense == 0:
-            interest_coverage = float("inf")
-        else:
-            interest_coverage = ebit / abs(interest_expense) if interest_expense != 0 else float("inf")
+        # 유효한 데이터만 사용
+        if net_income == 0 or total_equity == 0 or revenue == 0 or diluted_eps == 0:
+            continue
         
-        results.append({
-            "year": int(fiscal_year),
-            "revenue": revenue,
-            "net_income": net_income,
-            "ebit": ebit,
-            "total_equity": total_equity,
-            "total_liabilities": total_liabilities,
-            "free_cash_flow": free_cash_flow,
-            "eps": diluted_eps,
-            "roe": roe,
-            "roic": roic,
-            "net_margin": net_margin,
-            "fcf_margin": fcf_margin,
-            "debt_ratio": debt_ratio,
-            "interest_coverage": interest_coverage,
-            "interest_expense": interest_expense,
-        })
+        rows.append(compute_year_metrics(
+            int(fiscal_year),
+            revenue=revenue,
+            net_income=net_income,
+            ebit=safe_get(income, "ebit"),
+            pretax_income=safe_get(income, "incomeBeforeTax"),
+            tax_provision=safe_get(income, "incomeTaxExpense"),
+            total_equity=total_equity,
+            total_liabilities=safe_get(balance, "totalLiabilities"),
+            free_cash_flow=safe_get(cashflow, "freeCashFlow"),
+            eps=diluted_eps,
+            interest_expense=safe_get(income, "interestExpense"),
+        ))
     
     # 연도순 정렬 (오래된 순)
-    results.sort(key=lambda x: x["year"])
+    rows.sort(key=lambda row: row[0])
     
-    return results
+    return MetricSeries.from_rows(rows), incomplete_years
 
 
 # ============================================================================
 # 버핏 점수 계산
 # ============================================================================
 
-def calculate_buffett_score(yearly_metrics: List[Dict]) -> Optional[Dict]:
+def calculate_buffett_score(series: MetricSeries) -> Optional[Dict]:
     """
     연도별 지표로부터 버핏 점수 계산
     
-    test_nasAndSP.py의 점수 계산 로직을 그대로 사용
+    점수 규칙은 buffett_scoring 공용 모듈 사용 (FMP 정책: 최소 3년, 첫/마지막 EPS로 CAGR)
     """
-    # 유효한 데이터만 필터링
-    valid_results = [
-        r for r in yearly_metrics
-        if r["net_income"] != 0 and r["total_equity"] != 0 
-        and r["revenue"] != 0 and r["eps"] != 0
-    ]
-    
-    if len(valid_results) < 3:
-        return None
-    
-    years_available = len(valid_results)
-    
-    # [1] ROE 점수 (25점 만점)
-    count_15_plus = sum(1 for r in valid_results if r["roe"] >= 15.0)
-    count_12_plus = sum(1 for r in valid_results if r["roe"] >= 12.0)
-    has_loss = any(r["roe"] < 0 for r in valid_results)
-    
-    roe_score = 0
-    if has_loss:
-        roe_score = 0
-    elif count_15_plus == years_available:
-        roe_score = 25
-    elif count_15_plus >= years_available * 0.8:
-        roe_score = 20
-    elif count_12_plus == years_available:
-        roe_score = 15
-    elif count_12_plus >= years_available * 0.8:
-        roe_score = 10
-    
-    # [2] ROIC 점수 (20점 만점)
-    count_12_plus_roic = sum(1 for r in valid_results if r["roic"] >= 12.0)
-    count_9_plus_roic = sum(1 for r in valid_results if r["roic"] >= 9.0)
-    
-    roic_score = 0
-    if count_12_plus_roic == years_available:
-        roic_score = 20
-    elif count_12_plus_roic >= years_available * 0.8:
-        roic_score = 15
-    elif count_9_plus_roic == years_available:
-        roic_score = 10
-    elif count_9_plus_roic >= years_available * 0.8:
-        roic_score = 5
-    
-    # [3] Net Margin 점수 (15점 만점)
-    margins = [r["net_margin"] for r in valid_results]
-    avg_margin = sum(margins) / len(margins)
-    variance = sum((m - avg_margin) ** 2 for m in margins) / len(margins)
-    std_dev = math.sqrt(variance)
-    
-    avg_score = 0
-    if avg_margin >= 20.0:
-        avg_score = 10
-    elif avg_margin >= 15.0:
-        avg_score = 7
-    elif avg_margin >= 10.0:
-        avg_score = 5
-    
-    stability_score = 0
-    if std_dev <= 3.0:
-        stability_score = 5
-    elif std_dev <= 5.0:
-        stability_score = 3
-    elif std_dev <= 8.0:
-        stability_score = 1
-    
-    margin_score = avg_score + stability_score
-    
-    # [4] 추세 점수 (15점 만점)
-    trend_score = 0
-    if years_available >= 4:
-        recent_years = min(3, years_available - 1)
-        past_years = years_available - recent_years
-        recent_roe = sum(r["roe"] for r in valid_results[-recent_years:]) / recent_years
-        past_roe = sum(r["roe"] for r in valid_results[:past_years]) / past_years
-        improvement = ((recent_roe - past_roe) / past_roe * 100) if past_roe != 0 else 0
-        
-        if improvement >= 20.0:
-            trend_score = 15
-        elif improvement >= 10.0:
-            trend_score = 12
-        elif improvement >= 5.0:
-            trend_score = 9
-        elif improvement >= 0.0:
-            trend_score = 6
-        elif improvement >= -5.0:
-            trend_score = 3
-    
-    # [5] 재무 건전성 점수 (15점 만점)
-    latest = valid_results[-1]
-    
-    debt_score = 0
-    if latest["debt_ratio"] <= 50.0:
-        debt_score = 10
-    elif latest["debt_ratio"] <= 80.0:
-        debt_score = 7
-    elif latest["debt_ratio"] <= 120.0:
-        debt_score = 4
-    elif latest["debt_ratio"] <= 150.0:
-        debt_score = 2
-    
-    coverage_score = 0
-    if latest["interest_expense"] == 0:
-        coverage_score = 5
-    elif latest["interest_coverage"] != float("inf"):
-        if latest["interest_coverage"] >= 10.0:
-            coverage_score = 5
-        elif latest["interest_coverage"] >= 5.0:
-            coverage_score = 3
-        elif latest["interest_coverage"] >= 3.0:
-            coverage_score = 1
-    
-    health_score = debt_score + coverage_score
-    
-    # [6] 현금창출력 점수 (10점 만점)
-    fcf_margins = [r["fcf_margin"] for r in valid_results]
-    avg_fcf_margin = sum(fcf_margins) / len(fcf_margins)
-    
-    cash_score = 0
-    if avg_fcf_margin >= 15.0:
-        cash_score = 10
-    elif avg_fcf_margin >= 10.0:
-        cash_score = 7
-    elif avg_fcf_margin >= 5.0:
-        cash_score = 4
-    elif avg_fcf_margin >= 0.0:
-        cash_score = 2
-    
-    # 총점
-    total_score = roe_score + roic_score + margin_score + trend_score + health_score + cash_score
-    
-    # EPS CAGR 및 적정가 계산
-    eps_list = [r["eps"] for r in valid_results]
-    oldest_eps = eps_list[0]
-    latest_eps = eps_list[-1]
-    
-    eps_cagr = calculate_cagr(oldest_eps, latest_eps, years_available - 1)
-    conservative_growth = eps_cagr * 0.7
-    future_eps = latest_eps * math.pow(1 + conservative_growth / 100, 5) if latest_eps > 0 else 0
-    
-    if eps_cagr >= 15.0:
-        fair_per = 18.0
-    elif eps_cagr >= 8.0:
-        fair_per = 12.0
-    elif eps_cagr >= 0.0:
-        fair_per = 10.0
-    else:
-        fair_per = 8.0
-    
-    theoretical_value = future_eps * fair_per
-    intrinsic_value = theoretical_value * 0.8
-    
-    # 평균 지표
-    avg_roe = sum(r["roe"] for r in valid_results) / len(valid_results)
-    avg_roic = sum(r["roic"] for r in valid_results) / len(valid_results)
-    
-    return {
-        "total_score": total_score,
-        "roe_score": roe_score,
-        "roic_score": roic_score,
-        "margin_score": margin_score,
-        "trend_score": trend_score,
-        "health_score": health_score,
-        "cash_score": cash_score,
-        "intrinsic_value": intrinsic_value,
-        "eps_cagr": eps_cagr,
-        "avg_roe": avg_roe,
-        "avg_roic": avg_roic,
-        "avg_net_margin": avg_margin,
-        "avg_fcf_margin": avg_fcf_margin,
-        "debt_ratio": latest["debt_ratio"],
-        "years_data": years_available,
-    }
+    return score_series(series, FMP_POLICY)
 
 
 # ============================================================================
@@ -545,7 +370,7 @@ def calculate_buffett_score(yearly_metrics: List[Dict]) -> Optional[Dict]:
 
 def generate_pass_reason(ticker: str, score_data: Dict, years: int) -> Optional[str]:
     """우량주 통과 이유 요약문 생성"""
-    if score_data["total_score"] < 85:
+    if score_data["total_score"] < DEFAULT_SCORING.pass_score:
         return None
     
     grade_num, grade_text, grade_stars = get_trust_grade(years)
@@ -595,9 +420,13 @@ def generate_pass_reason(ticker: str, score_data: Dict, years: int) -> Optional[
     return summary
 
 
+# fair_per_tier 구간별 성장성 문구 (고성장/중성장/0 이상/음수)
+PER_TIER_TEXT = ("높은 성장성", "안정적 성장", "완만한 성장", "성장 둔화")
+
+
 def generate_valuation_reason(ticker: str, score_data: Dict, current_price: float, gap_pct: float, years: int) -> Optional[str]:
-    """적정가 산정 이유 요약문 생성"""
-    if score_data["total_score"] < 85:
+    """적정가 산정 이유 요약문 생성 (PER/성장률 반영 비율/안전마진은 점수 계산 기준값 사용)"""
+    if score_data["total_score"] < DEFAULT_SCORING.pass_score:
         return None
     
     intrinsic_value = score_data["intrinsic_value"]
@@ -611,21 +440,11 @@ def generate_valuation_reason(ticker: str, score_data: Dict, current_price: floa
     
     summary += f"💰 저평가 근거:\n\n"
     
-    if eps_cagr >= 15.0:
-        summary += f"- 높은 성장성: 최근 {years}년 EPS 연평균 {eps_cagr:.1f}%\n"
-        summary += f"- PER 18배 적용\n"
-    elif eps_cagr >= 8.0:
-        summary += f"- 안정적 성장: 최근 {years}년 EPS 연평균 {eps_cagr:.1f}%\n"
-        summary += f"- PER 12배 적용\n"
-    elif eps_cagr >= 0.0:
-        summary += f"- 완만한 성장: 최근 {years}년 EPS 연평균 {eps_cagr:.1f}%\n"
-        summary += f"- PER 10배 적용\n"
-    else:
-        summary += f"- 성장 둔화: 최근 {years}년 EPS 연평균 {eps_cagr:.1f}%\n"
-        summary += f"- PER 8배 적용\n"
-    
-    summary += f"- 과거 성장률 70%만 반영\n"
-    summary += f"- 안전마진 20% 적용\n"
+    tier, fair_per = fair_per_tier(eps_cagr)
+    summary += f"- {PER_TIER_TEXT[tier]}: 최근 {years}년 EPS 연평균 {eps_cagr:.1f}%\n"
+    summary += f"- PER {fair_per:g}배 적용\n"
+    summary += f"- 과거 성장률 {DEFAULT_SCORING.growth_haircut * 100:.0f}%만 반영\n"
+    summary += f"- 안전마진 {(1 - DEFAULT_SCORING.safety_factor) * 100:.0f}% 적용\n"
     
     return summary
 
@@ -660,12 +479,12 @@ def evaluate_ticker(ticker: str, date: str, year: str) -> Optional[Dict]:
         return None
     
     # 3. 연도별 지표 추출
-    yearly_metrics = extract_yearly_metrics(financials)
-    if len(yearly_metrics) < 3:
+    series, incomplete_years = extract_yearly_metrics(financials)
+    if len(series) < FMP_POLICY.min_years:
         return None
     
     # 4. 버핏 점수 계산
-    score_data = calculate_buffett_score(yearly_metrics)
+    score_data = calculate_buffett_score(series)
     if not score_data:
         return None
     
@@ -676,7 +495,7 @@ def evaluate_ticker(ticker: str, date: str, year: str) -> Optional[Dict]:
     
     grade_num, grade_text, grade_stars = get_trust_grade(years)
     
-    pass_status = "PASS" if score_data["total_score"] >= 85 else "FAIL"
+    pass_status = "PASS" if score_data["total_score"] >= DEFAULT_SCORING.pass_score else "FAIL"
     recommendation = "BUY" if gap_pct > 0 and pass_status == "PASS" else "WAIT"
     is_undervalued = gap_pct > 0
     
@@ -700,6 +519,7 @@ def evaluate_ticker(ticker: str, date: str, year: str) -> Optional[Dict]:
         "recommendation": recommendation,
         "is_undervalued": is_undervalued,
         "years_data": years,
+        "incomplete_years": incomplete_years,
         
         # 신뢰등급
         "trust_grade": grade_num,
@@ -715,6 +535,18 @@ def evaluate_ticker(ticker: str, date: str, year: str) -> Optional[Dict]:
     }
 
 
+def print_incomplete_years(results: List[Dict]):
+    """재무제표가 일부 빠진 연도가 있는 종목 요약 출력"""
+    incomplete = [r for r in results if r.get("incomplete_years")]
+    if not incomplete:
+        return
+    print(f"\n⚠️ 재무제표 일부 누락 연도 있음: {len(incomplete)}개 종목")
+    for r in incomplete[:10]:
+        print(f"   {r['ticker']}: {', '.join(r['incomplete_years'])}")
+    if len(incomplete) > 10:
+        print(f"   ... 외 {len(incomplete) - 10}개")
+
+
 def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
     """
     전체 평가 실행 (DB 저장 없음)
@@ -760,6 +592,8 @@ def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
         if len(failed) > 20:
             print(f"   ... 외 {len(failed) - 20}개")
     
+    print_incomplete_years(results)
+    
     # 우량주 통과 종목
     pass_count = sum(1 for r in results if r["pass_status"] == "PASS")
     buy_count = sum(1 for r in results if r["recommendation"] == "BUY")
@@ -784,6 +618,8 @@ def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
             print(f"{i:<4} {r['ticker']:<8} {name:<20} {r['total_score']:<6.0f} {r['pass_status']:<6} "
                   f"${r['current_price']:>9.2f} ${r['intrinsic_value']:>9.2f} {r['gap_pct']:>+7.1f}%")
     
+    print_cache_stats()
+    
     print("\n" + "=" * 70)
     print("ℹ️  DB 저장을 하려면 fmp_result.py를 실행하세요.")
     print("=" * 70 + "\n")
@@ -830,6 +666,27 @@ DB 저장까지 하려면:
         help="재무제표 데이터 연도 (YYYY 또는 'auto'로 자동 탐색)"
     )
     
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+    
+    parser.add_argument(
+        "--storage-dir",
+        type=str,
+        default=None,
+        help="Supabase 대신 읽을 로컬 Storage 미러 루트 (storage_sync.py로 생성, 기본값: STORAGE_LOCAL_DIR)"
+    )
+    
     args = parser.parse_args()
     
     print("\n" + "=" * 70)
@@ -840,8 +697,11 @@ DB 저장까지 하려면:
     print("=" * 70)
     
     # 환경 변수 검증
+    configure_storage(args.storage_dir)
     validate_env()
     
+    configure_cache(args.cache_dir, args.cache_max_mb)
+    
     # 재무제표 연도 결정
     if args.year == "auto":
         year = find_latest_financial_year()
@@ -24,16 +24,23 @@ from tqdm import tqdm
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from db_batch import fetch_all_rows, upsert_rows_batched, DEFAULT_BATCH_SIZE
+
+from storage_gateway import get_supabase_client
+
 # fmp_evaluate.py에서 평가 함수 import
 from fmp_evaluate import (
     validate_env,
-    get_supabase_client,
     evaluate_ticker,
     list_tickers_from_prices,
     find_latest_financial_year,
     get_trust_grade,
     generate_pass_reason,
     generate_valuation_reason,
+    configure_cache,
+    print_cache_stats,
+    print_incomplete_years,
+    DEFAULT_CACHE_MAX_MB,
 )
 
 # ============================================================================
@@ -52,29 +59,55 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 # DB 저장 함수
 # ============================================================================
 
-def ensure_stock_exists(supabase: Client, ticker: str, company_name: str, 
-                        exchange: str = None, industry: str = None) -> int:
+def load_stock_ids(supabase: Client) -> Dict[str, int]:
     """
-    stocks 테이블에 종목이 없으면 생성, 있으면 stock_id 반환
+    stocks 테이블 전체를 1회 조회하여 ticker → stock_id 맵 생성
     """
-    # 기존 stock 조회
-    result = supabase.table("stocks").select("stock_id").eq("ticker", ticker).execute()
+    rows = fetch_all_rows(supabase, "stocks", "ticker, stock_id")
+    return {row["ticker"]: row["stock_id"] for row in rows}
+
+
+def insert_missing_stocks(supabase: Client, stock_ids: Dict[str, int], 
+                          eval_results: List[Dict]) -> int:
+    """
+    stock_ids 맵에 없는 종목만 stocks 테이블에 한 번에 추가하고 맵을 갱신
     
-    if result.data and len(result.data) > 0:
-        return result.data[0]["stock_id"]
-    
-    # 없으면 새로 생성
-    insert_result = supabase.table("stocks").insert({
-        "ticker": ticker,
-        "company_name": company_name or ticker,
-        "exchange": exchange,
-        "industry": industry,
-    }).execute()
+    동시에 다른 실행이 같은 종목을 추가해 insert가 실패하면 다시 조회하여 맵을 채웁니다.
     
-    if insert_result.data and len(insert_result.data) > 0:
-        return insert_result.data[0]["stock_id"]
+    Returns:
+        새로 추가된 종목 수
+    """
+    new_stocks = {}
+    for r in eval_results:
+        if r["ticker"] not in stock_ids and r["ticker"] not in new_stocks:
+            new_stocks[r["ticker"]] = {
+                "ticker": r["ticker"],
+                "company_name": r.get("company_name") or r["ticker"],
+                "exchange": r.get("exchange"),
+                "industry": r.get("industry"),
+            }
+    
+    if not new_stocks:
+        return 0
     
-    raise Exception(f"Failed to create stock: {ticker}")
+    tickers = list(new_stocks)
+    inserted = 0
+    try:
+        result = supabase.table("stocks").insert(list(new_stocks.values())).execute()
+        inserted = len(result.data or [])
+        for row in result.data or []:
+            stock_ids[row["ticker"]] = row["stock_id"]
+    except Exception as e:
+        print(f"   ❌ 종목 일괄 추가 실패, 재조회: {e}")
+        result = supabase.table("stocks").select("ticker, stock_id").in_("ticker", tickers).execute()
+        for row in result.data or []:
+            stock_ids[row["ticker"]] = row["stock_id"]
+    
+    missing = [t for t in tickers if t not in stock_ids]
+    if missing:
+        print(f"   ❌ 종목 저장 실패: {', '.join(missing[:20])}")
+    
+    return inserted
 
 
 def create_buffett_run(supabase: Client, universe: str, data_source: str, data_version: str) -> int:
@@ -93,56 +126,89 @@ def create_buffett_run(supabase: Client, universe: str, data_source: str, data_v
     raise Exception("Failed to create buffett_run")
 
 
-def save_buffett_result(supabase: Client, run_id: int, stock_id: int, 
-                        eval_result: Dict) -> bool:
+def build_buffett_result_row(run_id: int, stock_id: int, eval_result: Dict) -> Dict:
     """
-    buffett_result 테이블에 평가 결과 저장
+    buffett_result 테이블 1행 생성
     """
-    try:
-        supabase.table("buffett_result").insert({
-            "run_id": run_id,
-            "stock_id": stock_id,
-            "total_score": eval_result["total_score"],
-            "pass_status": eval_result["pass_status"],
-            "current_price": eval_result["current_price"],
-            "intrinsic_value": eval_result["intrinsic_value"],
-            "gap_pct": eval_result["gap_pct"],
-            "recommendation": eval_result["recommendation"],
-            "is_undervalued": eval_result["is_undervalued"],
-            "years_data": eval_result["years_data"],
-            "trust_grade": eval_result["trust_grade"],
-            "trust_grade_text": eval_result["trust_grade_text"],
-            "trust_grade_stars": eval_result["trust_grade_stars"],
-            "pass_reason": eval_result["pass_reason"],
-            "valuation_reason": eval_result["valuation_reason"],
-        }).execute()
-        return True
-    except Exception as e:
-        print(f"   ❌ buffett_result 저장 실패: {e}")
-        return False
+    return {
+        "run_id": run_id,
+        "stock_id": stock_id,
+        "total_score": eval_result["total_score"],
+        "pass_status": eval_result["pass_status"],
+        "current_price": eval_result["current_price"],
+        "intrinsic_value": eval_result["intrinsic_value"],
+        "gap_pct": eval_result["gap_pct"],
+        "recommendation": eval_result["recommendation"],
+        "is_undervalued": eval_result["is_undervalued"],
+        "years_data": eval_result["years_data"],
+        "trust_grade": eval_result["trust_grade"],
+        "trust_grade_text": eval_result["trust_grade_text"],
+        "trust_grade_stars": eval_result["trust_grade_stars"],
+        "pass_reason": eval_result["pass_reason"],
+        "valuation_reason": eval_result["valuation_reason"],
+    }
 
 
-def save_latest_price(supabase: Client, stock_id: int, current_price: float, price_date: str) -> bool:
+def save_buffett_results(supabase: Client, rows: List[Dict], 
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> int:
     """
-    latest_price 테이블에 현재가 저장 (upsert)
+    buffett_result 테이블에 평가 결과 일괄 저장 (run_id+stock_id 기준 배치 upsert)
+    
+    - 일시적 오류(연결/5xx): 같은 배치를 그대로 재시도 (upsert라 중복 행 없음)
+    - 제약 조건 위반 등: 배치를 나눠 문제 행만 제외
+    
+    Returns:
+        저장 성공 행 수
     """
-    try:
-        supabase.table("latest_price").upsert({
-            "stock_id": stock_id,
-            "current_price": current_price,
-            "price_date": price_date,
-        }, on_conflict="stock_id").execute()
-        return True
-    except Exception as e:
-        print(f"   ❌ latest_price 저장 실패: {e}")
-        return False
+    if not rows:
+        return 0
+    
+    saved, failed = upsert_rows_batched(supabase, "buffett_result", rows, "run_id,stock_id", batch_size)
+    
+    if failed:
+        print(f"   ❌ buffett_result 저장 실패: {len(failed)}건 (stock_id: "
+              f"{', '.join(str(r['stock_id']) for r in failed[:20])})")
+    
+    return saved
+
+
+def build_latest_price_row(stock_id: int, current_price: float, price_date: str) -> Dict:
+    """
+    latest_price 테이블 1행 생성
+    """
+    return {
+        "stock_id": stock_id,
+        "current_price": current_price,
+        "price_date": price_date,
+    }
+
+
+def save_latest_prices(supabase: Client, rows: List[Dict], 
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    latest_price 테이블에 현재가 일괄 저장 (stock_id 기준 upsert, 배치별 원자적 반영)
+    
+    Returns:
+        저장 성공 행 수
+    """
+    if not rows:
+        return 0
+    
+    saved, failed = upsert_rows_batched(supabase, "latest_price", rows, "stock_id", batch_size)
+    
+    if failed:
+        print(f"   ❌ latest_price 저장 실패: {len(failed)}건 (stock_id: "
+              f"{', '.join(str(r['stock_id']) for r in failed[:20])})")
+    
+    return saved
 
 
 # ============================================================================
 # 메인 실행 함수
 # ============================================================================
 
-def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe: str = "ALL"):
+def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe: str = "ALL",
+                            batch_size: int = DEFAULT_BATCH_SIZE):
     """
     전체 평가 실행 및 DB 저장
     
@@ -151,6 +217,7 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe:
         date: 현재가 데이터 날짜
         year: 재무제표 데이터 연도
         universe: 지수 유형 (SP500, NASDAQ100, ALL)
+        batch_size: buffett_result/latest_price 일괄 저장 배치 크기
     """
     print("\n" + "=" * 70)
     print("🚀 버핏원픽 평가 + DB 저장 시작")
@@ -167,9 +234,14 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe:
     run_id = create_buffett_run(supabase, universe, "FMP", date)
     print(f"✅ 평가 실행 ID: {run_id}")
     
+    # ticker → stock_id 맵 (1회 조회)
+    stock_ids = load_stock_ids(supabase)
+    print(f"✅ 등록 종목 조회: {len(stock_ids)}개")
+    
     results = []
     failed = []
-    saved_count = 0
+    pending_rows = []
+    pending_prices = []
     
     for ticker in tqdm(tickers, desc="평가 + 저장", ncols=80):
         # 1. 평가
@@ -179,27 +251,28 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe:
             continue
         
         results.append(eval_result)
+    
+    # 2. DB 저장
+    # stocks 테이블 (새 종목만 한 번에 추가)
+    try:
+        added = insert_missing_stocks(supabase, stock_ids, results)
+        if added:
+            print(f"\n🆕 새 종목 추가: {added}개")
+    except Exception as e:
+        print(f"\n   ❌ 새 종목 추가 실패: {e}")
+    
+    for eval_result in results:
+        stock_id = stock_ids.get(eval_result["ticker"])
+        if not stock_id:
+            continue
         
-        # 2. DB 저장
-        try:
-            # stocks 테이블
-            stock_id = ensure_stock_exists(
-                supabase, 
-                ticker, 
-                eval_result["company_name"],
-                eval_result.get("exchange"),
-                eval_result.get("industry")
-            )
-            
-            # buffett_result 테이블
-            save_buffett_result(supabase, run_id, stock_id, eval_result)
-            
-            # latest_price 테이블
-            save_latest_price(supabase, stock_id, eval_result["current_price"], date)
-            
-            saved_count += 1
-        except Exception as e:
-            print(f"\n   ❌ {ticker} DB 저장 실패: {e}")
+        # buffett_result, latest_price 테이블
+        pending_rows.append(build_buffett_result_row(run_id, stock_id, eval_result))
+        pending_prices.append(build_latest_price_row(stock_id, eval_result["current_price"], date))
+    
+    # buffett_result, latest_price 일괄 저장
+    saved_count = save_buffett_results(supabase, pending_rows, batch_size)
+    save_latest_prices(supabase, pending_prices, batch_size)
     
     # 결과 정렬 (총점 내림차순)
     results.sort(key=lambda x: x["total_score"], reverse=True)
@@ -217,6 +290,8 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe:
         if len(failed) > 20:
             print(f"   ... 외 {len(failed) - 20}개")
     
+    print_incomplete_years(results)
+    
     # 우량주 통과 종목
     pass_count = sum(1 for r in results if r["pass_status"] == "PASS")
     buy_count = sum(1 for r in results if r["recommendation"] == "BUY")
@@ -241,6 +316,8 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str, universe:
             print(f"{i:<4} {r['ticker']:<8} {name:<20} {r['total_score']:<6.0f} {r['pass_status']:<6} "
                   f"${r['current_price']:>9.2f} ${r['intrinsic_value']:>9.2f} {r['gap_pct']:>+7.1f}%")
     
+    print_cache_stats()
+    
     print("\n" + "=" * 70)
     print(f"✅ 결과가 DB에 저장되었습니다. (run_id: {run_id})")
     print(f"🔗 API 조회: /api/buffett?runId={run_id}")
@@ -294,6 +371,27 @@ def main():
         help="지수 유형"
     )
     
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"buffett_result/latest_price 일괄 저장 배치 크기 (기본값: {DEFAULT_BATCH_SIZE})"
+    )
+    
     args = parser.parse_args()
     
     print("\n" + "=" * 70)
@@ -305,7 +403,9 @@ def main():
     print("=" * 70)
     
     # 환경 변수 검증
-    validate_env()
+    validate_env(require_database=True)
+    
+    configure_cache(args.cache_dir, args.cache_max_mb)
     
     # 재무제표 연도 결정
     if args.year == "auto":
@@ -336,7 +436,7 @@ def main():
         print(f"   {', '.join(tickers)}")
     
     # 평가 + DB 저장 실행
-    run_evaluation_and_save(tickers, args.date, year, universe)
+    run_evaluation_and_save(tickers, args.date, year, universe, batch_size=max(1, args.batch_size))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+"""
+일일 API 호출 한도 분할 수집 계획 (FMP 무료 요금제용)
+
+설계 의도:
+- 일 250회 한도로는 재무제표(약 1,560회)/현재가(약 520회)를 한 번에 받을 수 없으므로
+  매일 남은 한도만큼만 수집하고, 다음 실행에서 저장된 커서부터 이어서 수집
+- 오늘 사용한 호출 수(UTC 날짜 기준)를 모든 수집 모드가 공유
+  → 같은 날 여러 모드/여러 번 실행해도 일일 한도를 넘기지 않음
+- 모드별 수집 주기(cycle): 남은 종목 순서(커서)를 저장, 저장된 데이터가 오래된 종목
+  (한 번도 받지 않은 종목 우선)부터 수집
+- 남은 호출 수와 일일 한도로 예상 완료일 출력
+
+저장 형식:
+    {"usage": {"date": "2026-10-17", "calls": 120},
+     "modes": {mode: {"cycle", "started_at", "total", "pending": [...], "failed": [...],
+                      "last_collected": {ticker: iso}}}}
+
+사용법:
+    plan = QuotaPlan("fmp-raw-data", "_quota_plan.json").load()
+    pending = plan.prepare("financials", tickers, cycle="2026")
+    plan.record("financials", collected, failed)
+    plan.save_usage("2026-10-17", 250)   # 사용량 기록 + 저장 (수집 중에도 주기적으로 호출)
+"""
+
+import json
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from storage_gateway import upload_bytes, download_bytes, is_not_found_error
+
+
+class QuotaPlanLoadError(RuntimeError):
+    """계획 파일이 있지만 읽을 수 없음 (빈 계획으로 덮어쓰면 커서/오늘 사용량이 사라짐)"""
+
+
+class QuotaPlan:
+    """
+    모드별 수집 커서 + 오늘 사용한 호출 수 기록
+
+    cycle이 주어진 모드(예: 재무제표 연도)는 해당 주기의 종목을 모두 받으면 완료,
+    cycle이 없는 모드(예: 현재가)는 모두 받으면 다음 실행에서 새 주기를 시작합니다.
+    """
+
+    def __init__(self, bucket: str, path: str):
+        self.bucket = bucket
+        self.path = path
+        self.usage: Dict[str, Any] = {}
+        self.modes: Dict[str, Dict[str, Any]] = {}
+        # 수집 스레드의 중간 저장과 메인 스레드의 기록/저장이 겹치지 않도록
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 로드/저장
+    # ------------------------------------------------------------------
+
+    def load(self) -> "QuotaPlan":
+        """
+        Storage에서 계획 로드 (없으면 빈 계획)
+
+        Raises:
+            QuotaPlanLoadError: 파일은 있지만 다운로드(일시 오류)/파싱에 실패한 경우
+        """
+        try:
+            raw = download_bytes(self.bucket, self.path)
+        except Exception as e:
+            if is_not_found_error(e):
+                self.usage, self.modes = {}, {}
+                return self
+            raise QuotaPlanLoadError(f"수집 계획 로드 실패 ({self.path}): {e}") from e
+
+        try:
+            data = json.loads(raw.decode("utf-8"))
+            self.usage = data.get("usage", {})
+            self.modes = data.get("modes", {})
+        except (ValueError, AttributeError) as e:
+            raise QuotaPlanLoadError(f"수집 계획 파일 손상 ({self.path}): {e}") from e
+        return self
+
+    def save(self) -> bool:
+        """계획 저장 (실패해도 수집 결과에는 영향 없음)"""
+        with self._lock:
+            payload = json.dumps({
+                "updated_at": datetime.now().isoformat(),
+                "usage": self.usage,
+                "modes": self.modes,
+            }, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+            try:
+                upload_bytes(self.bucket, self.path, payload, upsert=True)
+                return True
+            except Exception as e:
+                print(f"⚠️ 수집 계획 저장 실패 ({self.path}): {e}")
+                return False
+
+    # ------------------------------------------------------------------
+    # 일일 사용량
+    # ------------------------------------------------------------------
+
+    def calls_on(self, day: str) -> int:
+        """day(UTC 날짜)에 이미 사용한 호출 수"""
+        return int(self.usage.get("calls", 0)) if self.usage.get("date") == day else 0
+
+    def record_usage(self, day: str, calls: int):
+        """day에 사용한 누적 호출 수 기록 (같은 날이면 줄어들지 않음 - 중간 저장 순서가 바뀌어도 안전)"""
+        with self._lock:
+            self.usage = {"date": day, "calls": max(calls, self.calls_on(day))}
+
+    def save_usage(self, day: str, calls: int) -> bool:
+        """누적 호출 수 기록 후 바로 저장 (강제 종료돼도 그때까지의 사용량은 남음)"""
+        with self._lock:
+            self.record_usage(day, calls)
+            return self.save()
+
+    # ------------------------------------------------------------------
+    # 모드별 커서
+    # ------------------------------------------------------------------
+
+    def prepare(self, mode: str, tickers: Sequence[str], cycle: Optional[str] = None) -> List[str]:
+        """
+        이번 주기에 남은 종목 (수집 순서대로)
+
+        - cycle이 바뀌었거나, cycle 없는 모드의 주기가 끝났으면 새 주기 시작
+        - 새 주기: 마지막 수집 시각이 오래된 종목부터 (한 번도 받지 않은 종목 우선, 동률은 tickers 순서)
+        - 진행 중인 주기: 목록에서 빠진 종목은 제외, 새로 들어온 종목은 뒤에 추가
+        """
+        state = self.modes.get(mode, {})
+        last_collected = state.get("last_collected", {})
+        finished = not state.get("pending")
+
+        if not state or state.get("cycle") != cycle or (cycle is None and finished):
+            state = {
+                "cycle": cycle,
+                "started_at": datetime.now().isoformat(),
+                "pending": sorted(tickers, key=lambda t: last_collected.get(t, "")),
+                "failed": [],
+                "last_collected": last_collected,
+            }
+        else:
+            universe = set(tickers)
+            pending = [t for t in state["pending"] if t in universe]
+            known = set(pending) | set(state.get("failed", []))
+            added = [t for t in tickers if t not in known
+                     and last_collected.get(t, "") < state["started_at"]]
+            state["pending"] = pending + sorted(added, key=lambda t: last_collected.get(t, ""))
+
+        state["total"] = (len(state["pending"]) + len(state.get("failed", []))
+                          + sum(1 for t in tickers if last_collected.get(t, "") >= state["started_at"]))
+        self.modes[mode] = state
+        return list(state["pending"])
+
+    def record(self, mode: str, collected: Sequence[str], failed: Sequence[str] = ()):
+        """
+        이번 실행 결과 반영
+
+        수집/실패 종목은 커서에서 빠지고(실패 종목은 run manifest --retry-failed로 재시도),
+        수집하지 못한 종목(한도 소진)은 그대로 남아 다음 실행에서 먼저 수집됩니다.
+        """
+        with self._lock:
+            state = self.modes[mode]
+            now = datetime.now().isoformat()
+            done = set(collected) | set(failed)
+
+            for ticker in collected:
+                state["last_collected"][ticker] = now
+            state["pending"] = [t for t in state["pending"] if t not in done]
+            state["failed"] = sorted(set(state.get("failed", [])) | set(failed))
+
+    # ------------------------------------------------------------------
+    # 예상 완료일
+    # ------------------------------------------------------------------
+
+    def projection(self, mode: str, calls_per_ticker: int, per_day: Optional[int],
+                   today: str, calls_today: int) -> Tuple[int, Optional[str]]:
+        """
+        남은 호출 수와 예상 완료일(UTC 날짜)
+
+        Returns:
+            (남은 호출 수, 완료일) - 일일 한도가 없으면 완료일은 오늘
+        """
+        remaining = len(self.modes.get(mode, {}).get("pending", [])) * calls_per_ticker
+        if remaining == 0 or per_day is None:
+            return remaining, today
+
+        left_today = max(0, per_day - calls_today)
+        days = 0 if remaining <= left_today else math.ceil((remaining - left_today) / per_day)
+        end = datetime.strptime(today, "%Y-%m-%d") + timedelta(days=days)
+        return remaining, end.strftime("%Y-%m-%d")
+
+    def print_summary(self, mode: str, calls_per_ticker: int, per_day: Optional[int],
+                      today: str, calls_today: int):
+        """주기 진행 상황과 예상 완료일 출력"""
+        state = self.modes.get(mode, {})
+        pending = len(state.get("pending", []))
+        failed = len(state.get("failed", []))
+        total = state.get("total", 0)
+        remaining, end = self.projection(mode, calls_per_ticker, per_day, today, calls_today)
+
+        cycle = f" ({state['cycle']})" if state.get("cycle") else ""
+        print(f"🗓️ 수집 주기{cycle}: {total - pending - failed}/{total}개 종목 완료 (실패 {failed}개)")
+        if remaining == 0:
+            print("   ✅ 이번 주기 수집 완료")
+        else:
+            print(f"   📆 예상 완료일: {end} (UTC, 남은 종목 {pending}개, API 약 {remaining}회, "
+                  f"일일 {per_day if per_day else '무제한'}회)")
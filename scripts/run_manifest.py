@@ -0,0 +1,176 @@
+"""
+수집 실행 기록 (재시작/실패 재시도용)
+
+설계 의도:
+- 장시간 수집(FMP 재무제표 약 5시간, GitHub Actions 작업)이 중간에 끊겨도
+  처음부터 다시 받지 않도록 종목/항목별 진행 상태를 Storage에 저장
+- 재시작 비용은 기록 파일 1회 다운로드 (버킷 목록 조회 없음)
+- 항목(예: income-statement)별로 done/failed, 시도 횟수, 내용 해시, 갱신 시각을 기록
+- 일정 개수마다, 그리고 종료 시 저장 (강제 종료 시에도 마지막 저장 시점부터 재시작)
+- 기록 파일이 없을 때만 빈 기록으로 시작, 읽기 실패/손상은 ManifestLoadError
+  (빈 기록으로 이어서 수집하면 기존 기록을 덮어쓰게 되므로 호출한 쪽에서 중단)
+
+사용법:
+    manifest = RunManifest("fmp-raw-data", "financials/2026/_run.json", ["income-statement"]).load()
+    tickers = manifest.select(tickers, resume=True)
+    manifest.mark("AAPL", "income-statement", True, content_hash(data))
+    manifest.save()
+"""
+
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from storage_gateway import upload_bytes, download_bytes, is_not_found_error
+
+# 항목 상태
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# 기록 자동 저장 주기 (mark 횟수)
+DEFAULT_SAVE_EVERY = 25
+
+
+class ManifestLoadError(RuntimeError):
+    """실행 기록 파일이 있지만 읽지 못함 (연결 오류, 손상된 JSON 등)"""
+
+
+class RunManifest:
+    """
+    종목 × 항목별 수집 상태 기록 (스레드 안전)
+
+    저장 형식:
+        {"started_at", "updated_at", "items": [...],
+         "entries": {ticker: {item: {"status", "attempts", "hash", "updated_at"}}},
+         "failed_tickers": [...]}
+    """
+
+    def __init__(self, bucket: str, path: str, items: Sequence[str],
+                 save_every: int = DEFAULT_SAVE_EVERY):
+        self.bucket = bucket
+        self.path = path
+        self.items = list(items)
+        self.save_every = save_every
+        self.started_at = datetime.now().isoformat()
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._unsaved = 0
+        self._load_failed = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 로드/저장
+    # ------------------------------------------------------------------
+
+    def load(self) -> "RunManifest":
+        """
+        Storage에서 기록 로드 (파일이 없으면 빈 기록)
+
+        Raises:
+            ManifestLoadError: 파일 없음 외의 읽기 실패 또는 손상된 기록
+                (이후 save()는 기존 기록을 덮어쓰지 않도록 저장하지 않음)
+        """
+        try:
+            payload = download_bytes(self.bucket, self.path)
+        except Exception as e:
+            if is_not_found_error(e):
+                self.entries = {}
+                return self
+            self._load_failed = True
+            raise ManifestLoadError(f"실행 기록 읽기 실패 ({self.path}): {e}") from e
+
+        try:
+            data = json.loads(payload.decode("utf-8"))
+            self.entries = data["entries"]
+            self.started_at = data.get("started_at", self.started_at)
+        except Exception as e:
+            self._load_failed = True
+            raise ManifestLoadError(f"실행 기록 손상 ({self.path}): {e}") from e
+        return self
+
+    def save(self) -> bool:
+        """기록 저장 (실패해도 수집은 계속, 로드에 실패한 기록은 저장하지 않음)"""
+        if self._load_failed:
+            print(f"⚠️ 실행 기록을 읽지 못해 저장하지 않습니다 ({self.path})")
+            return False
+
+        with self._lock:
+            payload = json.dumps({
+                "started_at": self.started_at,
+                "updated_at": datetime.now().isoformat(),
+                "items": self.items,
+                "entries": self.entries,
+                "failed_tickers": self._failed_tickers(),
+            }, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            self._unsaved = 0
+
+        try:
+            upload_bytes(self.bucket, self.path, payload, upsert=True)
+            return True
+        except Exception as e:
+            print(f"⚠️ 실행 기록 저장 실패 ({self.path}): {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # 상태 조회/기록
+    # ------------------------------------------------------------------
+
+    def _failed_tickers(self) -> List[str]:
+        return sorted(ticker for ticker, entry in self.entries.items()
+                      if any(v.get("status") == STATUS_FAILED for v in entry.values()))
+
+    @property
+    def failed_tickers(self) -> List[str]:
+        """항목 중 하나라도 실패한 종목"""
+        with self._lock:
+            return self._failed_tickers()
+
+    def is_done(self, ticker: str, item: Optional[str] = None) -> bool:
+        """항목(없으면 모든 항목) 수집 완료 여부"""
+        with self._lock:
+            entry = self.entries.get(ticker, {})
+            items = [item] if item else self.items
+            return all(entry.get(i, {}).get("status") == STATUS_DONE for i in items)
+
+    def select(self, tickers: Sequence[str], resume: bool = False,
+               retry_failed: bool = False) -> List[str]:
+        """
+        이번 실행에서 수집할 종목
+
+        - retry_failed: 기록상 실패 항목이 있는 종목만 (tickers 순서 유지)
+        - resume: 모든 항목이 완료된 종목 제외
+        - 둘 다 아니면 새 실행 (기존 기록 초기화)
+        """
+        if retry_failed:
+            failed = set(self.failed_tickers)
+            return [t for t in tickers if t in failed]
+        if resume:
+            return [t for t in tickers if not self.is_done(t)]
+
+        with self._lock:
+            self.entries = {}
+            self.started_at = datetime.now().isoformat()
+        return list(tickers)
+
+    def mark(self, ticker: str, item: str, ok: bool, digest: Optional[str] = None):
+        """항목 결과 기록 (save_every개마다 자동 저장)"""
+        with self._lock:
+            state = self.entries.setdefault(ticker, {}).setdefault(item, {"attempts": 0})
+            state["status"] = STATUS_DONE if ok else STATUS_FAILED
+            state["attempts"] = state.get("attempts", 0) + 1
+            state["updated_at"] = datetime.now().isoformat()
+            if digest:
+                state["hash"] = digest
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+
+        if should_save:
+            self.save()
+
+    def print_summary(self):
+        """완료/실패 종목 수 출력"""
+        with self._lock:
+            done = sum(1 for entry in self.entries.values()
+                       if all(entry.get(i, {}).get("status") == STATUS_DONE for i in self.items))
+            failed = len(self._failed_tickers())
+        print(f"🧾 실행 기록: 완료 {done}개, 실패 {failed}개 ({self.bucket}/{self.path})")
@@ -0,0 +1,179 @@
+"""
+Storage 읽기용 로컬 디스크 캐시
+
+설계 의도:
+- 평가 스크립트가 매일 같은 재무제표(연 1회 변경)를 다시 받지 않도록 로컬에 보관
+- 캐시 키: 버킷 + 경로, 유효성: ETag/Last-Modified 또는 내용 버전(해시 인덱스)
+  - 버전이 주어지고 캐시와 같으면 네트워크 없이 사용
+  - 그 외에는 If-None-Match 조건부 요청으로 확인 (304면 캐시 사용)
+- 전체 크기 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+
+사용법:
+    cache = StorageDiskCache(".storage-cache", max_mb=512)
+    payload = cache.read("yf-raw-data", "financials/2026/AAPL/data.json")
+    cache.print_stats()
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from storage_gateway import download_if_modified
+
+# 기본 캐시 크기 상한 (MB)
+DEFAULT_CACHE_MAX_MB = 512
+
+
+class StorageDiskCache:
+    """
+    버킷 경로 단위 디스크 캐시 (스레드 안전, 크기 제한 LRU)
+
+    항목마다 {key}.bin(내용)과 {key}.json(경로, ETag, 버전)을 저장하며,
+    파일 수정 시각을 마지막 사용 시각으로 사용합니다.
+
+    - 쓰기는 임시 파일 → os.replace로 교체 (읽는 쪽은 이전 또는 새 내용 전체만 봄)
+    - 읽기는 lock 없이 하고, 그 사이 다른 스레드가 항목을 삭제(LRU)했으면 다시 다운로드
+    """
+
+    def __init__(self, cache_dir: str, max_mb: int = DEFAULT_CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_mb * 1024 * 1024
+
+        self.hits = 0          # 네트워크 없이 사용
+        self.revalidated = 0   # 조건부 요청 304 후 사용
+        self.misses = 0        # 새로 다운로드
+        self.evicted = 0
+
+        self._lock = threading.Lock()
+
+        # 중단된 쓰기에서 남은 임시 파일 정리
+        for tmp_path in self.cache_dir.glob(".*.tmp"):
+            tmp_path.unlink(missing_ok=True)
+        self._total_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.bin"))
+
+    # ------------------------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------------------------
+
+    def _key(self, bucket: str, file_path: str) -> str:
+        return hashlib.sha256(f"{bucket}/{file_path}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.bin", self.cache_dir / f"{key}.json"
+
+    def _load_entry(self, key: str) -> Optional[Dict]:
+        data_path, meta_path = self._paths(key)
+        if not data_path.exists() or not meta_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _touch(self, key: str) -> Optional[bytes]:
+        """캐시 내용 읽기 + 사용 시각 갱신 (그 사이 LRU로 삭제됐으면 None)"""
+        data_path, _ = self._paths(key)
+        try:
+            os.utime(data_path, None)
+            return data_path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes):
+        """임시 파일에 쓴 뒤 os.replace로 교체"""
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def _store(self, key: str, bucket: str, file_path: str, payload: bytes,
+               etag: Optional[str], version: Optional[str]):
+        data_path, meta_path = self._paths(key)
+        meta = json.dumps({
+            "path": f"{bucket}/{file_path}",
+            "etag": etag,
+            "version": version,
+        }).encode("utf-8")
+
+        with self._lock:
+            if data_path.exists():
+                self._total_bytes -= data_path.stat().st_size
+            # 메타를 먼저 지워, 도중에 중단돼도 이전 ETag/버전이 새 내용과 짝지어지지 않게 함
+            meta_path.unlink(missing_ok=True)
+            self._write_atomic(data_path, payload)
+            self._write_atomic(meta_path, meta)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def _evict(self):
+        """상한 초과 시 마지막 사용 시각이 오래된 순으로 삭제 (lock 보유 상태에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = sorted(self.cache_dir.glob("*.bin"), key=lambda p: p.stat().st_mtime)
+        for data_path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = data_path.stat().st_size
+            data_path.unlink(missing_ok=True)
+            data_path.with_suffix(".json").unlink(missing_ok=True)
+            self._total_bytes -= size
+            self.evicted += 1
+
+    def _count(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def read(self, bucket: str, file_path: str, version: Optional[str] = None) -> bytes:
+        """
+        캐시를 거쳐 Storage 파일 읽기
+
+        Args:
+            bucket: 버킷 이름
+            file_path: 파일 경로
+            version: 내용 버전 (예: 해시 인덱스 값). 캐시 항목과 같으면 네트워크 생략
+
+        Raises:
+            requests.HTTPError 등 다운로드 에러 (파일 없음 포함)
+        """
+        key = self._key(bucket, file_path)
+        entry = self._load_entry(key)
+
+        if entry and version and entry.get("version") == version:
+            cached = self._touch(key)
+            if cached is not None:
+                self._count("hits")
+                return cached
+            entry = None
+
+        payload, etag = download_if_modified(bucket, file_path, entry.get("etag") if entry else None)
+
+        if payload is None and entry:
+            cached = self._touch(key)
+            if cached is not None:
+                self._count("revalidated")
+                if version:
+                    self._store(key, bucket, file_path, cached, etag, version)
+                return cached
+            # 304를 받은 뒤 항목이 삭제됨 → 조건 없이 다시 다운로드
+            payload, etag = download_if_modified(bucket, file_path, None)
+
+        self._count("misses")
+        self._store(key, bucket, file_path, payload, etag, version)
+        return payload
+
+    def print_stats(self):
+        """캐시 적중/실패 통계 출력"""
+        total = self.hits + self.revalidated + self.misses
+        hit_rate = (self.hits + self.revalidated) / total * 100 if total else 0.0
+        print(f"\n🗄️ Storage 캐시: 적중 {self.hits}개, 재검증 {self.revalidated}개, "
+              f"다운로드 {self.misses}개 (적중률 {hit_rate:.1f}%)")
+        print(f"   캐시 크기: {self._total_bytes / 1024 / 1024:.1f}MB, 삭제 {self.evicted}개 ({self.cache_dir})")
@@ -0,0 +1,420 @@
+"""
+Supabase Storage 공용 게이트웨이
+
+설계 의도:
+- yf_*/fmp_* 스크립트가 함께 쓰는 Storage 접근 계층
+- 프로세스 전체에서 Supabase 클라이언트를 1개만 생성하여 재사용
+  (호출마다 create_client 하면 HTTP 커넥션 풀이 매번 버려짐)
+- 클라이언트 생성은 스레드 안전 (동시 수집/평가 스레드에서 공유)
+- 생성 횟수를 세어 재사용 여부를 확인할 수 있게 함
+- 읽기/쓰기/목록은 StorageBackend 뒤에 둠 (Supabase 또는 같은 폴더 구조의 로컬 미러)
+  STORAGE_LOCAL_DIR 환경 변수나 configure_storage()로 로컬 미러를 선택하면
+  평가/수집 스크립트가 네트워크 없이 동작 (미러 동기화: storage_sync.py)
+
+사용법:
+    from storage_gateway import get_supabase_client, upload_bytes, download_bytes
+
+    payload = download_bytes("yf-raw-data", "tickers/2026-01/all.json")
+"""
+
+import os
+import json
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from supabase import create_client, Client
+
+# ============================================================================
+# 공유 클라이언트
+# ============================================================================
+
+_client: Optional[Client] = None
+_http_session: Optional[requests.Session] = None
+_client_lock = threading.Lock()
+_connections_opened = 0
+
+# 조건부 다운로드용 HTTP 세션의 커넥션 풀 크기 (동시 스레드 수 이상)
+HTTP_POOL_SIZE = 32
+
+# 목록 조회 페이지 크기 (Supabase 최대값)
+LIST_PAGE_SIZE = 1000
+
+# 전체 목록 조회 시 동시에 요청하는 페이지 수
+LIST_PARALLEL_PAGES = 4
+
+
+def get_supabase_client() -> Client:
+    """
+    프로세스 공용 Supabase 클라이언트 반환 (최초 호출 시 1회 생성)
+
+    클라이언트 내부의 HTTP 커넥션 풀(keep-alive)이 모든 호출에서 재사용됩니다.
+    """
+    global _client, _connections_opened
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+                key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+                _client = create_client(url, key)
+                _connections_opened += 1
+
+    return _client
+
+
+def get_http_session() -> requests.Session:
+    """
+    Storage REST 직접 호출용 공용 HTTP 세션 (keep-alive 커넥션 풀)
+
+    supabase-py가 지원하지 않는 조건부 요청(If-None-Match)에 사용합니다.
+    """
+    global _http_session, _connections_opened
+
+    if _http_session is None:
+        with _client_lock:
+            if _http_session is None:
+                key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+                http_session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                http_session.mount("https://", adapter)
+                http_session.mount("http://", adapter)
+                http_session.headers.update({
+                    "apikey": key,
+                    "Authorization": f"Bearer {key}",
+                })
+                _http_session = http_session
+                _connections_opened += 1
+
+    return _http_session
+
+
+def get_connections_opened() -> int:
+    """지금까지 생성된 Supabase 클라이언트/HTTP 세션 수 (재사용 시 각 1개)"""
+    return _connections_opened
+
+
+def reset_client():
+    """공유 클라이언트/세션 폐기 (다음 호출 시 새로 생성)"""
+    global _client, _http_session
+    with _client_lock:
+        _client = None
+        _http_session = None
+
+
+# ============================================================================
+# Storage 백엔드
+# ============================================================================
+
+class StorageBackend(ABC):
+    """
+    Storage 백엔드 인터페이스 (버킷 + 경로 단위 바이트 읽기/쓰기/목록)
+
+    하위 클래스는 아래 추상 메서드를 모두 구현해야 인스턴스를 만들 수 있습니다.
+
+    list 결과 항목은 Supabase Storage 형식을 따름:
+    {"name", "id"(폴더는 None), "updated_at", "metadata": {"eTag", "size", ...}}
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def upload(self, bucket: str, file_path: str, payload: bytes,
+               content_type: str, upsert: bool) -> None:
+        """payload를 bucket/file_path에 저장 (upsert=False면 기존 파일이 있을 때 오류)"""
+
+    @abstractmethod
+    def download(self, bucket: str, file_path: str) -> bytes:
+        """bucket/file_path 내용 (없으면 예외)"""
+
+    @abstractmethod
+    def download_if_modified(self, bucket: str, file_path: str,
+                             etag: Optional[str]) -> Tuple[Optional[bytes], Optional[str]]:
+        """etag와 같으면 (None, etag), 바뀌었으면 (내용, 새 ETag)"""
+
+    @abstractmethod
+    def remove(self, bucket: str, file_paths: List[str]) -> None:
+        """파일 삭제 (없는 경로는 무시)"""
+
+    @abstractmethod
+    def list(self, bucket: str, folder: str, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """folder 바로 아래 항목 (options: limit, offset, search)"""
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase Storage (공유 클라이언트/HTTP 세션 사용)"""
+
+    name = "supabase"
+
+    def upload(self, bucket, file_path, payload, content_type, upsert):
+        file_options = {"content-type": content_type}
+        if upsert:
+            file_options["upsert"] = "true"
+
+        get_supabase_client().storage.from_(bucket).upload(file_path, payload, file_options)
+
+    def download(self, bucket, file_path):
+        return get_supabase_client().storage.from_(bucket).download(file_path)
+
+    def download_if_modified(self, bucket, file_path, etag):
+        url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+        object_url = f"{url.rstrip('/')}/storage/v1/object/{bucket}/{quote(file_path)}"
+
+        headers = {"If-None-Match": etag} if etag else {}
+        response = get_http_session().get(object_url, headers=headers, timeout=30)
+
+        if response.status_code == 304:
+            return None, etag
+
+        response.raise_for_status()
+        return response.content, response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+    def remove(self, bucket, file_paths):
+        get_supabase_client().storage.from_(bucket).remove(file_paths)
+
+    def list(self, bucket, folder, options):
+        return get_supabase_client().storage.from_(bucket).list(folder, options)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    로컬 디렉터리 미러 ({root}/{bucket}/{경로}, 버킷과 같은 폴더 구조)
+
+    - ETag 대신 "크기-수정시각(ns)"을 사용 (내용을 읽지 않고 변경 확인)
+    - 쓰기는 임시 파일 → rename으로 원자적으로 교체 (동시 스레드 안전)
+    - upsert=False로 기존 파일에 쓰면 FileExistsError (Supabase의 중복 에러와 동일한 동작)
+    """
+
+    name = "local"
+
+    # Supabase list의 기본 limit
+    DEFAULT_LIST_LIMIT = 100
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, bucket: str, file_path: str) -> Path:
+        return self.root / bucket / file_path.strip("/")
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+    def upload(self, bucket, file_path, payload, content_type, upsert):
+        path = self._path(bucket, file_path)
+        if not upsert and path.exists():
+            raise FileExistsError(f"{bucket}/{file_path} 이미 존재")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def download(self, bucket, file_path):
+        return self._path(bucket, file_path).read_bytes()
+
+    def download_if_modified(self, bucket, file_path, etag):
+        path = self._path(bucket, file_path)
+        current = self._etag(path.stat())
+        if etag == current:
+            return None, etag
+        return path.read_bytes(), current
+
+    def remove(self, bucket, file_paths):
+        for file_path in file_paths:
+            self._path(bucket, file_path).unlink(missing_ok=True)
+
+    def list(self, bucket, folder, options):
+        directory = self._path(bucket, folder)
+        if not directory.is_dir():
+            return []
+
+        search = options.get("search") or ""
+        entries = sorted(
+            (e for e in os.scandir(directory)
+             if e.name.startswith(search) and not e.name.startswith(".")),
+            key=lambda e: e.name,
+        )
+        offset = int(options.get("offset", 0))
+        limit = int(options.get("limit", self.DEFAULT_LIST_LIMIT))
+
+        items = []
+        for entry in entries[offset:offset + limit]:
+            if entry.is_dir():
+                items.append({"name": entry.name, "id": None, "updated_at": None, "metadata": None})
+                continue
+            stat = entry.stat()
+            modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
+            items.append({
+                "name": entry.name,
+                "id": f"{bucket}/{folder.strip('/')}/{entry.name}",
+                "updated_at": modified,
+                "metadata": {"eTag": self._etag(stat), "size": stat.st_size, "lastModified": modified},
+            })
+        return items
+
+
+# 로컬 미러 디렉터리 환경 변수 (지정 시 Supabase 대신 로컬 백엔드 사용)
+LOCAL_STORAGE_ENV = "STORAGE_LOCAL_DIR"
+
+_backend: Optional[StorageBackend] = None
+
+
+def configure_storage(local_dir: Optional[str] = None) -> StorageBackend:
+    """
+    Storage 백엔드 설정
+
+    Args:
+        local_dir: 로컬 미러 루트 (없으면 STORAGE_LOCAL_DIR 환경 변수, 그것도 없으면 Supabase)
+    """
+    global _backend
+    local_dir = local_dir or os.getenv(LOCAL_STORAGE_ENV)
+    with _client_lock:
+        _backend = LocalStorageBackend(local_dir) if local_dir else SupabaseStorageBackend()
+    return _backend
+
+
+def get_storage_backend() -> StorageBackend:
+    """현재 Storage 백엔드 (최초 호출 시 환경 변수로 결정)"""
+    if _backend is None:
+        configure_storage()
+    return _backend
+
+
+def is_local_storage() -> bool:
+    """로컬 미러 백엔드 사용 여부"""
+    return isinstance(get_storage_backend(), LocalStorageBackend)
+
+
+# ============================================================================
+# Storage 접근 함수 (에러는 호출한 스크립트에서 처리)
+# ============================================================================
+
+def upload_bytes(bucket: str, file_path: str, payload: bytes,
+                 content_type: str = "application/json", upsert: bool = False) -> None:
+    """
+    Storage에 바이트 업로드
+
+    Args:
+        bucket: 버킷 이름
+        file_path: 저장 경로
+        payload: 저장할 바이트
+        content_type: Content-Type 헤더
+        upsert: True면 기존 파일을 덮어씀
+    """
+    get_storage_backend().upload(bucket, file_path, payload, content_type, upsert)
+
+
+def download_bytes(bucket: str, file_path: str) -> bytes:
+    """Storage에서 바이트 다운로드"""
+    return get_storage_backend().download(bucket, file_path)
+
+
+def download_if_modified(bucket: str, file_path: str,
+                         etag: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    조건부 다운로드 (If-None-Match)
+
+    Args:
+        bucket: 버킷 이름
+        file_path: 파일 경로
+        etag: 가지고 있는 사본의 ETag (없으면 일반 다운로드)
+
+    Returns:
+        (내용, ETag) - 변경 없음(304)이면 내용은 None
+
+    Raises:
+        requests.HTTPError: 파일 없음 등 HTTP 에러 (로컬 백엔드는 FileNotFoundError)
+    """
+    return get_storage_backend().download_if_modified(bucket, file_path, etag)
+
+
+def remove_files(bucket: str, file_paths: List[str]) -> None:
+    """Storage 파일 삭제"""
+    get_storage_backend().remove(bucket, file_paths)
+
+
+def is_not_found_error(error: Exception) -> bool:
+    """
+    download_bytes/download_if_modified 에러가 "파일 없음"인지 판단
+
+    - 로컬 미러: FileNotFoundError
+    - supabase-py: StorageApiError (status 404 또는 error "not_found")
+    - 조건부 다운로드(requests): HTTP 404, 또는 본문 statusCode 404인 400 응답
+
+    연결 실패/타임아웃/5xx 같은 일시적 오류는 False (호출한 쪽에서 결과를 캐시하지 않도록)
+    """
+    if isinstance(error, FileNotFoundError):
+        return True
+
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        response = error.response
+        if response.status_code == 404:
+            return True
+        if response.status_code != 400:
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        status, code = body.get("statusCode"), body.get("error")
+    else:
+        status, code = getattr(error, "status", None), getattr(error, "code", None)
+
+    return str(status) == "404" or str(code).lower().replace(" ", "_") == "not_found"
+
+
+def content_hash(data: Any, ignore_keys: tuple = ("collected_at",)) -> str:
+    """
+    JSON 데이터의 내용 해시 (sha256)
+
+    수집 시각처럼 매번 바뀌는 최상위 키(ignore_keys)는 제외하고,
+    키 정렬된 정규 JSON으로 계산하여 같은 내용이면 같은 해시가 나옵니다.
+    """
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if k not in ignore_keys}
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True,
+                           separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def list_folder(bucket: str, folder: str,
+                options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Storage 폴더 목록 조회 (한 페이지)
+
+    Returns:
+        항목 목록 (폴더는 id가 None)
+    """
+    return get_storage_backend().list(bucket, folder, options or {})
+
+
+def list_folder_all(bucket: str, folder: str, parallel_pages: int = LIST_PARALLEL_PAGES) -> List[Dict[str, Any]]:
+    """
+    Storage 폴더 전체 목록 조회 (모든 페이지)
+
+    offset 페이지라 전체 개수를 미리 알 수 없으므로, 다음 parallel_pages개 페이지를
+    동시에 요청하고 LIST_PAGE_SIZE보다 짧은 페이지가 나오면 종료합니다.
+    """
+    items: List[Dict[str, Any]] = []
+    offset = 0
+
+    with ThreadPoolExecutor(max_workers=parallel_pages) as executor:
+        while True:
+            offsets = [offset + i * LIST_PAGE_SIZE for i in range(parallel_pages)]
+            pages = executor.map(
+                lambda o: list_folder(bucket, folder, {"limit": LIST_PAGE_SIZE, "offset": o}), offsets)
+
+            for page in pages:
+                items.extend(page or [])
+                if len(page or []) < LIST_PAGE_SIZE:
+                    return items
+
+            offset += parallel_pages * LIST_PAGE_SIZE
@@ -0,0 +1,279 @@
+"""
+Storage 버킷 ↔ 로컬 미러 증분 동기화
+
+목적: yf-raw-data / fmp-raw-data 버킷을 같은 폴더 구조(tickers/, financials/, prices/)의
+      로컬 디렉터리로 내려받거나(down), 로컬 미러를 버킷에 올림(up)
+- 로컬 미러는 storage_gateway.LocalStorageBackend 형식 ({root}/{bucket}/{경로})
+  → --storage-dir / STORAGE_LOCAL_DIR로 평가 스크립트를 오프라인 실행, yf_backtest --mirror-dir로 사용
+- 원본 쪽 ETag를 동기화 기록(manifest)에 남겨, 다음 실행에서는 바뀐 파일만 전송
+  기록 위치: {root}/.sync/{bucket}.{down|up}.json
+- 전송은 스레드 풀로 병렬 처리, 실패한 파일은 기록하지 않아 다음 실행에서 다시 시도
+- 원본에서 사라진 파일은 삭제하지 않음 (복구용 사본 보존)
+
+실행 예시:
+  python storage_sync.py --direction down --bucket yf-raw-data --root ./mirror
+  python storage_sync.py --direction down --bucket yf-raw-data --root ./mirror --prefix prices/2026-01-30
+  python storage_sync.py --direction up --bucket fmp-raw-data --root ./mirror --dry-run
+"""
+
+import os
+import sys
+import json
+import argparse
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+from storage_gateway import StorageBackend, SupabaseStorageBackend, LocalStorageBackend
+
+# 환경 변수 로드 (.env.local 지원, 프로젝트 루트에서 찾기)
+script_dir = Path(__file__).resolve().parent
+project_root = script_dir.parent.parent
+
+env_local = project_root / ".env.local"
+env_file = project_root / ".env"
+
+if env_local.exists():
+    load_dotenv(env_local)
+elif env_file.exists():
+    load_dotenv(env_file)
+else:
+    load_dotenv()
+
+# ============================================================================
+# 설정
+# ============================================================================
+
+BUCKETS = ["yf-raw-data", "fmp-raw-data"]
+
+# 목록 조회 페이지 크기 (Supabase 최대값)
+LIST_PAGE_SIZE = 1000
+
+# 기본 병렬 전송 스레드 수
+DEFAULT_SYNC_WORKERS = 8
+
+# 동기화 기록 폴더 (로컬 미러 루트 아래, 백엔드 목록에는 나타나지 않음)
+SYNC_STATE_DIR = ".sync"
+
+# 전송 중간 기록 저장 주기 (파일 수)
+MANIFEST_SAVE_EVERY = 500
+
+# 확장자로 알 수 없는 Content-Type (yf_data_collect 스냅샷)
+CONTENT_TYPES = {".jsonl": "application/x-ndjson"}
+
+
+# ============================================================================
+# 목록 조회
+# ============================================================================
+
+def walk_files(backend: StorageBackend, bucket: str, prefix: str = "") -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    prefix 아래 모든 파일을 재귀 조회
+
+    Yields:
+        (경로, ETag) - ETag가 없으면 None (항상 전송 대상)
+    """
+    folders = [prefix.strip("/")]
+
+    while folders:
+        folder = folders.pop()
+        offset = 0
+
+        while True:
+            items = backend.list(bucket, folder, {"limit": LIST_PAGE_SIZE, "offset": offset})
+            if not items:
+                break
+
+            for item in items:
+                path = f"{folder}/{item['name']}" if folder else item["name"]
+                if item.get("id") is None:
+                    folders.append(path)
+                else:
+                    metadata = item.get("metadata") or {}
+                    yield path, metadata.get("eTag") or item.get("updated_at")
+
+            if len(items) < LIST_PAGE_SIZE:
+                break
+            offset += LIST_PAGE_SIZE
+
+
+# ============================================================================
+# 동기화 기록
+# ============================================================================
+
+def manifest_path(root: str, bucket: str, direction: str) -> Path:
+    return Path(root) / SYNC_STATE_DIR / f"{bucket}.{direction}.json"
+
+
+def load_manifest(path: Path) -> Dict[str, str]:
+    """동기화 기록 {경로: 원본 ETag} (없거나 손상되면 빈 기록)"""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def save_manifest(path: Path, manifest: Dict[str, str]):
+    """동기화 기록 저장 (임시 파일 → rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# 동기화
+# ============================================================================
+
+def sync_bucket(source: StorageBackend, target: StorageBackend, bucket: str,
+                state_path: Path, prefix: str = "", workers: int = DEFAULT_SYNC_WORKERS,
+                dry_run: bool = False) -> Dict[str, int]:
+    """
+    source → target 증분 동기화 (ETag가 기록과 다른 파일만 전송)
+
+    Returns:
+        {"listed", "copied", "skipped", "failed"} 개수
+    """
+    manifest = load_manifest(state_path)
+
+    print(f"\n📂 원본 목록 조회: {bucket}/{prefix or ''}")
+    files = list(walk_files(source, bucket, prefix))
+    pending = [(path, etag) for path, etag in files if etag is None or manifest.get(path) != etag]
+
+    stats = {"listed": len(files), "copied": 0, "skipped": len(files) - len(pending), "failed": 0}
+    print(f"   전체 {len(files)}개, 변경 {len(pending)}개, 건너뜀 {stats['skipped']}개")
+
+    if dry_run or not pending:
+        return stats
+
+    def copy(path: str) -> Optional[str]:
+        content_type = (CONTENT_TYPES.get(os.path.splitext(path)[1])
+                        or mimetypes.guess_type(path)[0] or "application/octet-stream")
+        try:
+            target.upload(bucket, path, source.download(bucket, path), content_type, True)
+            return None
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda item: (item, copy(item[0])), pending)
+
+        try:
+            for (path, etag), error in tqdm(results, total=len(pending), desc=f"{bucket} 동기화",
+                                            ncols=80, ascii=True, leave=True):
+                if error:
+                    stats["failed"] += 1
+                    tqdm.write(f"   ❌ {path}: {error}")
+                    continue
+
+                stats["copied"] += 1
+                if etag is not None:
+                    manifest[path] = etag
+                if stats["copied"] % MANIFEST_SAVE_EVERY == 0:
+                    save_manifest(state_path, manifest)
+        finally:
+            save_manifest(state_path, manifest)
+
+    return stats
+
+
+# ============================================================================
+# 메인 실행
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Storage 버킷 ↔ 로컬 미러 증분 동기화",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+실행 예시:
+  python storage_sync.py --direction down --bucket yf-raw-data --root ./mirror
+  python storage_sync.py --direction down --bucket yf-raw-data --root ./mirror --prefix prices/2026-01-30
+  python storage_sync.py --direction up --bucket fmp-raw-data --root ./mirror --dry-run
+        """
+    )
+
+    parser.add_argument(
+        "--direction",
+        type=str,
+        required=True,
+        choices=["down", "up"],
+        help="동기화 방향 (down: 버킷 → 로컬, up: 로컬 → 버킷)"
+    )
+
+    parser.add_argument(
+        "--bucket",
+        type=str,
+        nargs="+",
+        default=BUCKETS,
+        choices=BUCKETS,
+        help="동기화할 버킷 (기본값: 전체)"
+    )
+
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=os.getenv("STORAGE_LOCAL_DIR") or "./storage-mirror",
+        help="로컬 미러 루트 ({root}/{bucket}/..., 기본값: STORAGE_LOCAL_DIR 또는 ./storage-mirror)"
+    )
+
+    parser.add_argument(
+        "--prefix",
+        type=str,
+        default="",
+        help="이 경로 아래만 동기화 (예: prices/2026-01-30, financials/2026)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_SYNC_WORKERS,
+        help=f"병렬 전송 스레드 수 (기본값: {DEFAULT_SYNC_WORKERS})"
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="전송 없이 변경 파일 수만 확인"
+    )
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("🔄 Storage 미러 동기화")
+    print("=" * 70)
+    print(f"📅 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🔧 방향: {args.direction}, 로컬 미러: {args.root}")
+    print("=" * 70)
+
+    if not (os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")) \
+            or not os.getenv("SUPABASE_SERVICE_ROLE_KEY"):
+        print("❌ 필수 환경 변수가 없습니다: SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY")
+        sys.exit(1)
+
+    remote = SupabaseStorageBackend()
+    local = LocalStorageBackend(args.root)
+    source, target = (remote, local) if args.direction == "down" else (local, remote)
+
+    failed = 0
+    for bucket in args.bucket:
+        stats = sync_bucket(source, target, bucket, manifest_path(args.root, bucket, args.direction),
+                            args.prefix, max(1, args.workers), args.dry_run)
+        failed += stats["failed"]
+        print(f"   ✅ {bucket}: 전송 {stats['copied']}개, 건너뜀 {stats['skipped']}개, 실패 {stats['failed']}개")
+
+    print("\n" + "=" * 70)
+    print("❌ 일부 파일 동기화 실패 (다시 실행하면 실패한 파일만 재시도)" if failed else "✅ 동기화 완료")
+    print("=" * 70)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
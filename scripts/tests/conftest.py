@@ -0,0 +1,61 @@
+"""
+scripts 테스트 공용 설정
+
+스크립트들은 패키지가 아닌 평면 모듈(scripts/*.py)이므로 scripts 디렉토리를
+import 경로에 추가합니다.
+
+fake_storage: 모듈의 download_bytes/upload_bytes를 메모리 Storage로 바꾸는 fixture
+    storage = fake_storage(run_manifest)                       # 없는 파일은 FileNotFoundError
+    storage = fake_storage(quota_planner, missing=not_found)   # 없는 파일 예외를 직접 지정
+    storage.files[path] = b"..."                   # 내용
+    storage.files[path] = ConnectionError("reset") # 다운로드 시 발생시킬 예외
+    storage.files[path] = [error, b"..."]          # 다운로드마다 차례로 반환 (마지막 값은 유지)
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+class FakeStorage:
+    """{경로: bytes / 예외 / 응답 목록} 메모리 Storage (downloads: 다운로드한 경로 기록)"""
+
+    def __init__(self, missing: Callable[[str], Exception] = FileNotFoundError):
+        self.files: Dict[str, object] = {}
+        self.downloads: List[str] = []
+        self.missing = missing
+
+    def download_bytes(self, bucket: str, file_path: str) -> bytes:
+        self.downloads.append(file_path)
+        if file_path not in self.files:
+            raise self.missing(file_path)
+        value = self.files[file_path]
+        if isinstance(value, list):
+            value = value.pop(0) if len(value) > 1 else value[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def upload_bytes(self, bucket: str, file_path: str, payload: bytes, upsert: bool = False):
+        self.files[file_path] = payload
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    """fake_storage(*modules, missing=...) → 해당 모듈들의 Storage 입출력을 대체한 FakeStorage"""
+    def install(*modules, missing: Callable[[str], Exception] = FileNotFoundError) -> FakeStorage:
+        storage = FakeStorage(missing)
+        for module in modules:
+            monkeypatch.setattr(module, "download_bytes", storage.download_bytes)
+            if hasattr(module, "upload_bytes"):
+                monkeypatch.setattr(module, "upload_bytes", storage.upload_bytes)
+        return storage
+
+    return install
@@ -0,0 +1,48 @@
+"""
+yf_backtest 평가일 기준 재무제표 선택 테스트 (미래 재무제표 미사용)
+"""
+
+import json
+import math
+from pathlib import Path
+
+import pandas as pd
+
+from yf_backtest import fundamentals_as_of, load_fundamentals_from_mirror
+
+FIXTURE = Path(__file__).parent / "fixtures" / "scoring" / "STBL.json"
+
+
+def fundamentals(score: float, intrinsic: float, available_from: str) -> pd.DataFrame:
+    return pd.DataFrame({"total_score": [score], "intrinsic_value": [intrinsic],
+                         "available_from": [available_from]}, index=["AAA"])
+
+
+def test_year_collected_after_eval_date_falls_back_to_previous_year():
+    by_year = {
+        "2025": fundamentals(70.0, 100.0, "2025-02-10"),
+        "2026": fundamentals(90.0, 150.0, "2026-03-15"),
+    }
+    dates = ["2025-01-06", "2025-06-02", "2026-01-05", "2026-03-15", "2026-06-01"]
+
+    as_of = fundamentals_as_of(dates, pd.Index(["AAA"]), by_year)
+    intrinsic = as_of["intrinsic_value"]["AAA"].tolist()
+
+    # 2025-01-06: 2025 수집 전, 이전 연도도 없음 / 2026-01-05: 2026 수집 전 → 2025 사용
+    assert math.isnan(intrinsic[0])
+    assert intrinsic[1:] == [100.0, 100.0, 150.0, 150.0]
+    assert as_of["total_score"]["AAA"].tolist()[1:] == [70.0, 70.0, 90.0, 90.0]
+
+
+def test_mirror_fundamentals_carry_collection_date(tmp_path):
+    financial_data = json.loads(FIXTURE.read_text(encoding="utf-8"))["yf"]
+    for ticker, collected_at in [("DATED", "2026-02-20T06:01:02"), ("UNDATED", None)]:
+        path = tmp_path / "financials" / "2026" / ticker / "data.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps({**financial_data, "collected_at": collected_at}), encoding="utf-8")
+
+    loaded = load_fundamentals_from_mirror(str(tmp_path), "2026")
+
+    # 수집일을 모르는 종목은 어느 평가일에 쓸 수 있었는지 알 수 없어 제외
+    assert list(loaded.index) == ["DATED"]
+    assert loaded.loc["DATED", "available_from"] == "2026-02-20"
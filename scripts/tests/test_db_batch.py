@@ -0,0 +1,113 @@
+"""
+db_batch 재시도/분할 규칙 테스트 (가짜 Supabase 클라이언트)
+"""
+
+from typing import Dict, List
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+import db_batch
+from db_batch import insert_rows_batched, is_transient_error, upsert_rows_batched
+
+UNIQUE_VIOLATION = {"message": "duplicate key value", "code": "23505", "hint": None, "details": None}
+BAD_GATEWAY = {"message": "JSON could not be generated", "code": 502, "hint": None, "details": None}
+
+
+class FakeClient:
+    """
+    table().insert/upsert().execute() 호출을 기록하는 클라이언트
+
+    errors: 요청마다 차례로 발생시킬 예외 (None이면 성공)
+    bad_rows: 이 id가 들어 있는 요청은 항상 제약 조건 위반
+    """
+
+    def __init__(self, errors=(), bad_rows=()):
+        self.errors = list(errors)
+        self.bad_rows = set(bad_rows)
+        self.requests: List[List[Dict]] = []
+        self.saved: List[Dict] = []
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        return _Request(self, rows)
+
+    def upsert(self, rows, on_conflict=None):
+        return _Request(self, rows)
+
+
+class _Request:
+    def __init__(self, client: FakeClient, rows: List[Dict]):
+        self.client = client
+        self.rows = rows
+
+    def execute(self):
+        self.client.requests.append(self.rows)
+        error = self.client.errors.pop(0) if self.client.errors else None
+        if error is None and any(r["id"] in self.client.bad_rows for r in self.rows):
+            error = APIError(UNIQUE_VIOLATION)
+        if error is not None:
+            raise error
+        self.client.saved.extend(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(db_batch, "RETRY_BACKOFF_SECONDS", 0)
+
+
+def rows(n: int) -> List[Dict]:
+    return [{"id": i} for i in range(n)]
+
+
+def test_transient_classification():
+    assert is_transient_error(httpx.ConnectTimeout("timeout"))
+    assert is_transient_error(APIError(BAD_GATEWAY))
+    assert is_transient_error(APIError({**BAD_GATEWAY, "code": 429}))
+    assert is_transient_error(APIError({**UNIQUE_VIOLATION, "code": "40P01"}))
+    assert not is_transient_error(APIError(UNIQUE_VIOLATION))
+    assert not is_transient_error(APIError({**BAD_GATEWAY, "code": 400}))
+    assert not is_transient_error(ValueError("bad row"))
+
+
+def test_upsert_retries_transient_errors():
+    client = FakeClient(errors=[httpx.ReadTimeout("timeout"), APIError(BAD_GATEWAY)])
+
+    saved, failed = upsert_rows_batched(client, "t", rows(4), on_conflict="id")
+
+    assert (saved, failed) == (4, [])
+    assert len(client.requests) == 3
+
+
+def test_insert_does_not_retry_or_split_transient_errors():
+    client = FakeClient(errors=[httpx.ReadTimeout("timeout")])
+
+    saved, failed = insert_rows_batched(client, "t", rows(4))
+
+    assert (saved, failed) == (0, rows(4))
+    assert len(client.requests) == 1
+
+
+def test_constraint_error_is_isolated_without_retry():
+    client = FakeClient(bad_rows={2})
+
+    saved, failed = upsert_rows_batched(client, "t", rows(4), on_conflict="id")
+
+    assert (saved, failed) == (3, [{"id": 2}])
+    assert sorted(r["id"] for r in client.saved) == [0, 1, 3]
+    # [0..3] → [0,1] ✓, [2,3] → [2] ✗, [3] ✓ (요청마다 1회씩, 재시도 없음)
+    assert len(client.requests) == 5
+
+
+def test_composite_key_upsert_retries_and_keeps_last_row():
+    client = FakeClient(errors=[httpx.RemoteProtocolError("connection reset")])
+    results = [{"id": i, "run_id": 7, "stock_id": i % 3} for i in range(4)]
+
+    saved, failed = upsert_rows_batched(client, "buffett_result", results, on_conflict="run_id,stock_id")
+
+    assert (saved, failed) == (3, [])
+    assert len(client.requests) == 2
+    assert [r["id"] for r in client.saved] == [3, 1, 2]
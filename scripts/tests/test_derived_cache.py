@@ -0,0 +1,49 @@
+"""
+펀더멘털 파생 캐시 무효화 테스트 (점수 기준값/정책이 바뀌면 캐시를 쓰지 않음)
+"""
+
+import json
+from dataclasses import replace
+
+import pytest
+
+import yf_evaluate
+from buffett_scoring import DEFAULT_SCORING, FMP_POLICY
+from yf_evaluate import DERIVED_CACHE_VERSION, FundamentalsCache, scoring_fingerprint
+
+ENTRIES = {"AAPL": {"hash": "abc", "fundamentals": None}}
+
+
+@pytest.fixture
+def stored_cache(fake_storage):
+    """scoring 기준으로 만든 캐시 파일을 저장해 두고 FundamentalsCache로 로드"""
+    storage = fake_storage(yf_evaluate)
+
+    def load(scoring: str) -> FundamentalsCache:
+        cache = FundamentalsCache("2026")
+        storage.files[cache.path] = json.dumps(
+            {"version": DERIVED_CACHE_VERSION, "scoring": scoring, "tickers": ENTRIES}).encode()
+        return cache.load()
+
+    return load
+
+
+def test_cache_built_with_same_scoring_is_used(stored_cache):
+    assert stored_cache(scoring_fingerprint()).entries == ENTRIES
+
+
+@pytest.mark.parametrize("config, policy", [
+    (replace(DEFAULT_SCORING, pass_score=80.0), yf_evaluate.YF_POLICY),
+    (DEFAULT_SCORING, FMP_POLICY),
+], ids=["config", "policy"])
+def test_cache_built_with_other_scoring_is_discarded(stored_cache, config, policy):
+    assert stored_cache(scoring_fingerprint(config, policy)).entries == {}
+
+
+def test_saved_cache_records_scoring(fake_storage):
+    storage = fake_storage(yf_evaluate)
+    cache = FundamentalsCache("2026")
+    cache.entries, cache._dirty = dict(ENTRIES), True
+
+    assert cache.save()
+    assert json.loads(storage.files[cache.path])["scoring"] == scoring_fingerprint()
@@ -0,0 +1,24 @@
+"""
+실행 스크립트 import 확인 (GitHub Actions가 직접 실행하는 스크립트의 import 오류를 미리 잡음)
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = sorted(
+    path for path in SCRIPTS_DIR.glob("*.py")
+    if 'if __name__ == "__main__":' in path.read_text(encoding="utf-8")
+)
+
+
+@pytest.mark.parametrize("path", ENTRY_POINTS, ids=[p.stem for p in ENTRY_POINTS])
+def test_entry_point_imports(path):
+    # 파일 이름에 하이픈이 있는 스크립트도 있으므로 경로로 로드
+    spec = importlib.util.spec_from_file_location(f"entry_{path.stem.replace('-', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert callable(getattr(module, "main", None))
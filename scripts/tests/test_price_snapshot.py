@@ -0,0 +1,41 @@
+"""
+yf_evaluate 현재가 스냅샷 캐시 테스트 (Storage는 conftest의 fake_storage로 대체)
+"""
+
+import pytest
+import requests
+
+import yf_evaluate
+from yf_evaluate import load_price_snapshot
+
+SNAPSHOT_PATH = "prices/2026-01-30/snapshot.jsonl"
+SNAPSHOT = b'{"ticker": "AAPL", "current_price": 200.0}\n{"ticker": "MSFT", "current_price": 400.0}\n'
+
+
+@pytest.fixture
+def storage(fake_storage, monkeypatch):
+    monkeypatch.setattr(yf_evaluate, "_disk_cache", None)
+    monkeypatch.setattr(yf_evaluate, "_price_snapshots", {})
+    return fake_storage(yf_evaluate)
+
+
+def test_transient_failure_is_not_cached(storage):
+    storage.files[SNAPSHOT_PATH] = [requests.ConnectionError("reset"), SNAPSHOT]
+
+    assert load_price_snapshot("2026-01-30") is None
+    assert sorted(load_price_snapshot("2026-01-30")) == ["AAPL", "MSFT"]
+    assert len(storage.downloads) == 2
+
+
+def test_missing_snapshot_is_cached(storage):
+    assert load_price_snapshot("2026-01-30") is None
+    assert load_price_snapshot("2026-01-30") is None
+    assert storage.downloads == [SNAPSHOT_PATH]
+
+
+def test_loaded_snapshot_is_cached(storage):
+    storage.files[SNAPSHOT_PATH] = SNAPSHOT
+
+    assert load_price_snapshot("2026-01-30")["MSFT"]["current_price"] == 400.0
+    assert load_price_snapshot("2026-01-30")["AAPL"]["current_price"] == 200.0
+    assert len(storage.downloads) == 1
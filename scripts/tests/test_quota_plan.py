@@ -0,0 +1,118 @@
+"""
+분할 수집 계획 테스트 (사용량 중간 저장, 계획 로드 실패 처리 - Storage는 conftest의 fake_storage로 대체)
+"""
+
+import json
+
+import pytest
+from storage3.exceptions import StorageApiError
+
+import fmp_data_collect
+import quota_planner
+from fmp_data_collect import ApiRateLimiter, DailyQuotaExceeded
+from quota_planner import QuotaPlan, QuotaPlanLoadError
+
+PLAN_FILE = "_quota_plan.json"
+
+
+@pytest.fixture
+def storage(fake_storage):
+    # Supabase가 실제로 돌려주는 파일 없음 오류로 is_not_found_error 판별까지 확인
+    return fake_storage(quota_planner, missing=lambda path: StorageApiError("Object not found", "not_found", 404))
+
+
+def test_limiter_reports_usage_every_n_calls():
+    limiter = ApiRateLimiter(per_minute=100, per_day=7)
+    reported = []
+    limiter.on_usage(lambda day, calls: reported.append(calls), every=3)
+
+    for _ in range(7):
+        limiter.acquire()
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.acquire()
+
+    assert reported == [3, 6]
+
+
+def test_usage_is_saved_while_collecting(storage):
+    plan = QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+    limiter = ApiRateLimiter(per_minute=100, per_day=None)
+    limiter.on_usage(plan.save_usage, every=2)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    # 강제 종료되더라도 마지막 중간 저장 시점까지의 사용량은 남아 있음
+    today, _ = limiter.usage()
+    assert QuotaPlan("fmp-raw-data", PLAN_FILE).load().calls_on(today) == 4
+
+
+def test_usage_never_goes_back_within_a_day(storage):
+    plan = QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+
+    plan.save_usage("2026-10-17", 50)
+    plan.save_usage("2026-10-17", 25)
+    assert plan.calls_on("2026-10-17") == 50
+
+    plan.save_usage("2026-10-18", 3)
+    assert plan.calls_on("2026-10-18") == 3
+
+
+def test_missing_plan_loads_empty(storage):
+    plan = QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+
+    assert (plan.usage, plan.modes) == ({}, {})
+
+
+@pytest.mark.parametrize("stored", [
+    StorageApiError("Internal", "InternalError", 500),
+    b"{not json",
+])
+def test_unreadable_plan_raises(storage, stored):
+    storage.files[PLAN_FILE] = stored
+
+    with pytest.raises(QuotaPlanLoadError):
+        QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+
+
+def test_stored_plan_round_trips(storage):
+    storage.files[PLAN_FILE] = json.dumps({"usage": {"date": "2026-10-17", "calls": 120}, "modes": {}}).encode()
+
+    assert QuotaPlan("fmp-raw-data", PLAN_FILE).load().calls_on("2026-10-17") == 120
+
+
+def collected_batches(monkeypatch, name: str) -> list:
+    """수집 함수(collect_prices/collect_financials)를 대체하고 넘겨받은 종목을 기록"""
+    collected = []
+
+    def fake_collect(batch, *args, **kwargs):
+        collected.extend(batch)
+        return {"success": len(batch), "failed": 0, "failed_tickers": [], "remaining_tickers": []}
+
+    monkeypatch.setattr(fmp_data_collect, name, fake_collect)
+    return collected
+
+
+def test_planned_batch_leaves_retry_headroom(storage, monkeypatch):
+    monkeypatch.setattr(fmp_data_collect, "_rate_limiter", ApiRateLimiter(per_minute=100, per_day=20))
+    collected = collected_batches(monkeypatch, "collect_prices")
+    plan = QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+    tickers = [f"T{i:02d}" for i in range(30)]
+
+    fmp_data_collect.collect_planned("prices", tickers, plan)
+
+    # 남은 20회 중 2회(10%)는 재시도용으로 남김
+    assert collected == tickers[:18]
+    assert plan.modes["prices"]["pending"] == tickers[18:]
+
+
+def test_small_remainder_is_not_starved_by_headroom(storage, monkeypatch):
+    # 재무제표처럼 종목당 3회인데 오늘 3회만 남은 경우: 여유를 떼지 않고 1개 종목 수집
+    monkeypatch.setattr(fmp_data_collect, "FINANCIAL_STATEMENTS", ["income", "balance", "cashflow"])
+    collected = collected_batches(monkeypatch, "collect_financials")
+    monkeypatch.setattr(fmp_data_collect, "_rate_limiter", ApiRateLimiter(per_minute=100, per_day=3))
+    plan = QuotaPlan("fmp-raw-data", PLAN_FILE).load()
+
+    fmp_data_collect.collect_planned("financials", ["AAA", "BBB"], plan)
+
+    assert collected == ["AAA"]
@@ -0,0 +1,36 @@
+"""
+yf_data_collect 토큰 버킷/--rate 검증 테스트
+"""
+
+import argparse
+
+import pytest
+
+from yf_data_collect import TokenBucket, positive_float
+
+
+@pytest.mark.parametrize("rate, capacity", [(0, None), (-2, None), (5, 0.5)])
+def test_token_bucket_rejects_invalid_settings(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, capacity)
+
+
+def test_token_bucket_rejects_request_larger_than_capacity():
+    with pytest.raises(ValueError):
+        TokenBucket(2, capacity=3).acquire(4)
+
+
+def test_slow_rate_still_allows_one_request():
+    bucket = TokenBucket(0.5)
+    assert bucket.capacity == 1.0
+    bucket.acquire()
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "nan", "abc"])
+def test_rate_argument_must_be_positive(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_float(value)
+
+
+def test_rate_argument_accepts_fraction():
+    assert positive_float("0.5") == 0.5
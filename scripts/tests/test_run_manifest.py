@@ -0,0 +1,52 @@
+"""
+RunManifest 로드/저장 테스트 (Storage는 conftest의 fake_storage로 대체)
+"""
+
+import json
+
+import pytest
+import requests
+
+import run_manifest
+from run_manifest import ManifestLoadError, RunManifest
+
+PATH = "financials/2026/_run.json"
+
+
+@pytest.fixture
+def storage(fake_storage):
+    return fake_storage(run_manifest)
+
+
+def test_missing_manifest_starts_empty(storage):
+    manifest = RunManifest("fmp-raw-data", PATH, ["data"]).load()
+
+    assert manifest.select(["AAPL", "MSFT"], resume=True) == ["AAPL", "MSFT"]
+    manifest.mark("AAPL", "data", True)
+    assert manifest.save()
+    assert json.loads(storage.files[PATH])["entries"]["AAPL"]["data"]["status"] == "done"
+
+
+def test_saved_manifest_resumes(storage):
+    manifest = RunManifest("fmp-raw-data", PATH, ["data"])
+    manifest.mark("AAPL", "data", True)
+    manifest.mark("MSFT", "data", False)
+    manifest.save()
+
+    loaded = RunManifest("fmp-raw-data", PATH, ["data"]).load()
+
+    assert loaded.select(["AAPL", "MSFT"], resume=True) == ["MSFT"]
+    assert loaded.select(["AAPL", "MSFT"], retry_failed=True) == ["MSFT"]
+
+
+@pytest.mark.parametrize("stored", [requests.ConnectionError("reset"), b"{not json", b"{}"])
+def test_unreadable_manifest_raises_and_is_not_overwritten(storage, stored):
+    storage.files[PATH] = stored
+    manifest = RunManifest("fmp-raw-data", PATH, ["data"])
+
+    with pytest.raises(ManifestLoadError):
+        manifest.load()
+
+    manifest.mark("AAPL", "data", True)
+    assert not manifest.save()
+    assert storage.files[PATH] is stored
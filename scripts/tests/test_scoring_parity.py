@@ -0,0 +1,191 @@
+"""
+버핏 점수 경로별 결과 일치(golden output) 테스트
+
+fixtures/scoring/{TICKER}.json 구성:
+- yf: yf-raw-data 재무제표 JSON (financials/balance_sheet/cashflow, 연도 문자열 키)
+- fmp: fmp-raw-data 재무제표 (income_statement/balance_sheet/cash_flow 목록)
+- price / profile: yf 현재가 스냅샷 항목 / FMP 프로필
+- expected: 공용 점수 모듈 도입 전(경로별 개별 구현) 코드로 만든 결과
+  - yf: yf_evaluate.evaluate_ticker
+  - fmp: fmp_evaluate.evaluate_ticker
+  - yf_live: yf_buffett_logic.evaluate_stock_silent
+
+같은 재무제표를 각 경로에 넣었을 때 결과가 golden과 같고,
+score_series(종목별)와 score_metrics_frame(일괄)의 결과가 같은지 확인합니다.
+"""
+
+import contextlib
+import io
+import json
+import math
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import yf_batch_evaluate
+import yf_buffett_logic
+import fmp_evaluate
+from buffett_scoring import (
+    FMP_POLICY,
+    YF_LIVE_POLICY,
+    YF_POLICY,
+    build_metrics_frame,
+    score_metrics_frame,
+    score_series,
+)
+from yf_evaluate import evaluate_fundamentals, evaluate_loaded_ticker, extract_yearly_metrics
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "scoring"
+PRICE_DATE = "2026-01-30"
+FINANCIAL_YEAR = "2026"
+
+
+def load_fixtures() -> List[Dict]:
+    return [json.loads(path.read_text(encoding="utf-8")) for path in sorted(FIXTURE_DIR.glob("*.json"))]
+
+
+FIXTURES = load_fixtures()
+FIXTURE_IDS = [f["ticker"] for f in FIXTURES]
+
+# 공용 점수 모듈 도입 시 의도적으로 바뀐 결과 (경로, 종목)
+# - yf_live/NEGE: 첫 EPS 양수 + 최신 EPS 음수면 예전에는 CAGR 계산 오류로 종목이 빠졌으나,
+#   이제 다른 두 경로처럼 CAGR 0%로 평가
+INTENDED_CHANGES = {("yf_live", "NEGE")}
+
+
+class FakeTicker:
+    """yfinance.Ticker 대역: 저장소 재무제표를 yfinance DataFrame 형태(최신 연도부터)로 제공"""
+
+    def __init__(self, fixture: Dict):
+        statements = fixture["yf"]
+        self.financials = self._frame(statements["financials"])
+        self.balance_sheet = self._frame(statements["balance_sheet"])
+        self.cashflow = self._frame(statements["cashflow"])
+        self.info = {"currentPrice": fixture["price"]["current_price"]}
+
+    @staticmethod
+    def _frame(statement: Dict[str, Dict]) -> pd.DataFrame:
+        rows = list(next(iter(statement.values())))
+        return pd.DataFrame(
+            {pd.Timestamp(f"{year}-12-31"): [values[r] for r in rows] for year, values in statement.items()},
+            index=rows,
+        )
+
+
+def assert_same(actual, expected, path: str = "result"):
+    """
+    golden 결과와 비교 (float은 정확히 같아야 함, NaN끼리는 같다고 봄)
+
+    dict는 golden에 있는 키만 비교합니다 (이후 추가된 필드는 허용).
+    numpy 스칼라(DataFrame에서 읽은 값)는 Python 값으로 바꿔 비교합니다.
+    """
+    if isinstance(actual, np.generic):
+        actual = actual.item()
+
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict), f"{path}: dict가 아님 ({actual!r})"
+        for key, value in expected.items():
+            assert key in actual, f"{path}.{key} 없음"
+            assert_same(actual[key], value, f"{path}.{key}")
+        return
+
+    if isinstance(expected, float) and math.isnan(expected):
+        assert isinstance(actual, float) and math.isnan(actual), f"{path}: {actual!r} != nan"
+        return
+
+    assert actual == expected, f"{path}: {actual!r} != {expected!r}"
+    assert type(actual) is type(expected) or {type(actual), type(expected)} <= {int, float}, \
+        f"{path}: 타입 다름 ({type(actual).__name__} != {type(expected).__name__})"
+
+
+# ============================================================================
+# 경로별 결과 = golden
+# ============================================================================
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=FIXTURE_IDS)
+def test_yf_storage_path_matches_golden(fixture):
+    result = evaluate_loaded_ticker(fixture["ticker"], fixture["yf"], fixture["price"])
+
+    if fixture["expected"]["yf"] is None:
+        assert result is None
+    else:
+        assert_same(result, fixture["expected"]["yf"])
+
+
+def test_yf_batch_path_matches_golden(monkeypatch):
+    by_ticker = {f["ticker"]: f for f in FIXTURES}
+    monkeypatch.setattr(yf_batch_evaluate, "load_ticker_data",
+                        lambda t, date, year: (by_ticker[t]["yf"], by_ticker[t]["price"]))
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        metrics, info = yf_batch_evaluate.load_universe(list(by_ticker), PRICE_DATE, FINANCIAL_YEAR, workers=2)
+    results = {r["ticker"]: r for r in yf_batch_evaluate.frame_to_results(yf_batch_evaluate.score_frame(metrics, info))}
+
+    for ticker, fixture in by_ticker.items():
+        expected = fixture["expected"]["yf"]
+        if expected is None:
+            assert ticker not in results
+        else:
+            assert_same(results[ticker], expected, ticker)
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=FIXTURE_IDS)
+def test_fmp_path_matches_golden(fixture, monkeypatch):
+    monkeypatch.setattr(fmp_evaluate, "get_financial_data", lambda t, year: fixture["fmp"])
+    monkeypatch.setattr(fmp_evaluate, "get_price_data", lambda t, date: fixture["profile"])
+
+    result = fmp_evaluate.evaluate_ticker(fixture["ticker"], PRICE_DATE, FINANCIAL_YEAR)
+
+    if fixture["expected"]["fmp"] is None:
+        assert result is None
+    else:
+        assert_same(result, fixture["expected"]["fmp"])
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=FIXTURE_IDS)
+def test_yf_live_path_matches_golden(fixture, monkeypatch):
+    monkeypatch.setattr(yf_buffett_logic.yf, "Ticker", lambda ticker, session=None: FakeTicker(fixture))
+
+    result = yf_buffett_logic.evaluate_stock_silent(fixture["ticker"])
+
+    if ("yf_live", fixture["ticker"]) in INTENDED_CHANGES:
+        assert fixture["expected"]["yf_live"] is None
+        assert result is not None and result["eps_cagr"] == 0.0
+    elif fixture["expected"]["yf_live"] is None:
+        assert result is None
+    else:
+        assert_same(result, fixture["expected"]["yf_live"])
+
+
+# ============================================================================
+# 종목별 계산(score_series) = 일괄 계산(score_metrics_frame)
+# ============================================================================
+
+@pytest.mark.parametrize("policy", [YF_POLICY, FMP_POLICY, YF_LIVE_POLICY], ids=["yf", "fmp", "yf_live"])
+def test_score_series_matches_score_metrics_frame(policy):
+    series_by_ticker = {f["ticker"]: extract_yearly_metrics(f["yf"]) for f in FIXTURES}
+    tickers = pd.Index(list(series_by_ticker))
+    scores = score_metrics_frame(build_metrics_frame(series_by_ticker), tickers, policy)
+
+    for i, ticker in enumerate(tickers):
+        single = score_series(series_by_ticker[ticker], policy)
+
+        if single is None:
+            assert not scores["scored"][i], ticker
+            continue
+
+        assert scores["scored"][i], ticker
+        for key, value in single.items():
+            assert_same(scores[key][i], value, f"{ticker}.{key}")
+
+
+@pytest.mark.parametrize("fixture", [f for f in FIXTURES if f["expected"]["yf"]],
+                         ids=[f["ticker"] for f in FIXTURES if f["expected"]["yf"]])
+def test_valuation_reason_uses_scoring_per(fixture):
+    result = evaluate_loaded_ticker(fixture["ticker"], fixture["yf"], fixture["price"])
+    fundamentals = evaluate_fundamentals(fixture["ticker"], fixture["yf"])
+
+    assert json.loads(result["valuation_reason"])["applied_per"] == fundamentals["fair_per"]
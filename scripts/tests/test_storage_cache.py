@@ -0,0 +1,87 @@
+"""
+StorageDiskCache 동작 테스트 (Storage 다운로드는 가짜 함수로 대체)
+"""
+
+import pytest
+
+import storage_cache
+from storage_cache import StorageDiskCache
+
+PATH = "financials/2026/AAPL/data.json"
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """가짜 Storage: {경로: (내용, ETag)}, 호출 기록은 calls"""
+    files = {PATH: (b'{"v": 1}', "etag-1")}
+    calls = []
+
+    def fake_download_if_modified(bucket, file_path, etag):
+        calls.append(etag)
+        payload, current = files[file_path]
+        if etag == current:
+            return None, etag
+        return payload, current
+
+    monkeypatch.setattr(storage_cache, "download_if_modified", fake_download_if_modified)
+    return files, calls
+
+
+def test_version_hit_skips_network(tmp_path, remote):
+    _, calls = remote
+    cache = StorageDiskCache(str(tmp_path))
+
+    assert cache.read("yf-raw-data", PATH, version="v1") == b'{"v": 1}'
+    assert cache.read("yf-raw-data", PATH, version="v1") == b'{"v": 1}'
+
+    assert (cache.misses, cache.hits, len(calls)) == (1, 1, 1)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_entry_evicted_during_hit_falls_back_to_download(tmp_path, remote, monkeypatch):
+    _, calls = remote
+    cache = StorageDiskCache(str(tmp_path))
+    cache.read("yf-raw-data", PATH, version="v1")
+
+    # 메타를 읽은 직후 다른 스레드가 LRU로 항목을 지운 상황
+    load_entry = cache._load_entry
+
+    def load_then_evict(key):
+        entry = load_entry(key)
+        for path in cache._paths(key):
+            path.unlink()
+        return entry
+
+    monkeypatch.setattr(cache, "_load_entry", load_then_evict)
+
+    assert cache.read("yf-raw-data", PATH, version="v1") == b'{"v": 1}'
+    assert cache.misses == 2
+    assert calls == [None, None]
+
+
+def test_entry_evicted_after_not_modified_downloads_again(tmp_path, remote, monkeypatch):
+    _, calls = remote
+    cache = StorageDiskCache(str(tmp_path))
+    cache.read("yf-raw-data", PATH)
+
+    # 304 응답을 받은 직후 항목이 지워진 상황
+    download = storage_cache.download_if_modified
+
+    def not_modified_then_evict(bucket, file_path, etag):
+        result = download(bucket, file_path, etag)
+        for path in cache._paths(cache._key(bucket, file_path)):
+            path.unlink(missing_ok=True)
+        return result
+
+    monkeypatch.setattr(storage_cache, "download_if_modified", not_modified_then_evict)
+
+    assert cache.read("yf-raw-data", PATH) == b'{"v": 1}'
+    assert calls == [None, "etag-1", None]
+
+
+def test_leftover_temp_files_are_removed(tmp_path, remote):
+    (tmp_path / ".abc.bin.123.tmp").write_bytes(b"partial")
+
+    StorageDiskCache(str(tmp_path))
+
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,112 @@
+"""
+storage_gateway 테스트 (공유 클라이언트 재사용, 파일 없음 판별 - Supabase 클라이언트는 가짜 객체로 대체)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from storage3.exceptions import StorageApiError
+
+import storage_gateway
+from storage_gateway import (
+    configure_storage,
+    download_bytes,
+    get_connections_opened,
+    is_not_found_error,
+    list_folder,
+    reset_client,
+    upload_bytes,
+)
+
+THREADS = 16
+CALLS_PER_THREAD = 20
+
+
+class FakeBucket:
+    def __init__(self):
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def upload(self, file_path, payload, file_options):
+        with self._lock:
+            self.files[file_path] = payload
+
+    def download(self, file_path):
+        with self._lock:
+            return self.files.get(file_path, b"{}")
+
+    def list(self, folder, options):
+        with self._lock:
+            return [{"name": name, "id": name} for name in self.files]
+
+
+class FakeClient:
+    def __init__(self):
+        self.bucket = FakeBucket()
+        self.storage = self
+
+    def from_(self, bucket):
+        return self.bucket
+
+
+@pytest.fixture
+def supabase_backend(monkeypatch):
+    """가짜 create_client로 Supabase 백엔드 사용 (생성이 느려 경합이 잘 드러나게 함)"""
+    created = []
+
+    def fake_create_client(url, key):
+        time.sleep(0.05)
+        created.append(FakeClient())
+        return created[-1]
+
+    monkeypatch.delenv(storage_gateway.LOCAL_STORAGE_ENV, raising=False)
+    monkeypatch.setattr(storage_gateway, "create_client", fake_create_client)
+    reset_client()
+    configure_storage()
+    yield created
+    reset_client()
+    monkeypatch.setattr(storage_gateway, "_backend", None)
+
+
+def test_storage_calls_across_threads_open_one_client(supabase_backend):
+    before = get_connections_opened()
+    start = threading.Barrier(THREADS)
+
+    def worker(i):
+        start.wait()
+        for n in range(CALLS_PER_THREAD):
+            upload_bytes("yf-raw-data", f"t{i}/{n}.json", b"{}", upsert=True)
+            download_bytes("yf-raw-data", f"t{i}/{n}.json")
+            list_folder("yf-raw-data", f"t{i}")
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(worker, range(THREADS)))
+
+    assert len(supabase_backend) == 1
+    assert get_connections_opened() - before == 1
+    assert len(supabase_backend[0].bucket.files) == THREADS * CALLS_PER_THREAD
+
+
+def http_error(status: int, body: bytes = b"") -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (FileNotFoundError("missing"), True),
+    (StorageApiError("Object not found", "not_found", 404), True),
+    (StorageApiError("Object not found", "Not found", "400"), True),
+    (http_error(404), True),
+    (http_error(400, b'{"statusCode": "404", "error": "not_found"}'), True),
+    (StorageApiError("Internal", "InternalError", 500), False),
+    (http_error(503), False),
+    (http_error(400, b"bad request"), False),
+    (requests.ConnectionError("reset"), False),
+])
+def test_is_not_found_error(error, expected):
+    assert is_not_found_error(error) is expected
@@ -0,0 +1,32 @@
+"""
+평가/결과 스크립트 환경 변수 검증 테스트 (로컬 Storage 미러 + DB 저장)
+"""
+
+import pytest
+
+import fmp_evaluate
+import storage_gateway
+import yf_evaluate
+
+
+@pytest.fixture(params=[yf_evaluate, fmp_evaluate], ids=["yf", "fmp"])
+def local_without_supabase(request, monkeypatch, tmp_path):
+    """로컬 미러만 설정하고 Supabase 접속 정보는 없는 환경"""
+    module = request.param
+    for name in ("SUPABASE_URL", "NEXT_PUBLIC_SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(fmp_evaluate, "SUPABASE_URL", None)
+    monkeypatch.setattr(fmp_evaluate, "SUPABASE_SERVICE_ROLE_KEY", None)
+    monkeypatch.setattr(storage_gateway, "_backend", None)
+    storage_gateway.configure_storage(str(tmp_path))
+    yield module
+    monkeypatch.setattr(storage_gateway, "_backend", None)
+
+
+def test_local_storage_skips_supabase_check_for_evaluation(local_without_supabase):
+    local_without_supabase.validate_env()
+
+
+def test_local_storage_still_requires_database_credentials(local_without_supabase):
+    with pytest.raises(SystemExit):
+        local_without_supabase.validate_env(require_database=True)
@@ -0,0 +1,359 @@
+"""
+S&P 500 / 나스닥 100 구성 종목 조회 (조건부 요청 캐시)
+
+설계 의도:
+- yf_data_collect / fmp_data_collect / yf_buffett_logic / fetch_korean_names가 각각 내려받던
+  구성 종목 원본(GitHub CSV, Wikipedia HTML)을 한 곳에서 조회
+- 원본을 ETag/Last-Modified와 함께 로컬 캐시에 보관하고 다음 실행에서는
+  If-None-Match/If-Modified-Since 조건부 요청 → 304면 캐시된 파싱 결과를 그대로 사용
+- 200이어도 원본 해시가 캐시와 같으면 다시 파싱하지 않음 (Wikipedia처럼 검증자가 자주 바뀌는 경우)
+- 네트워크/파싱 실패 시 마지막 캐시 사용 (캐시도 없으면 None)
+- 구성 종목 변경분(추가/제외) 계산: 수집 스크립트가 Storage의 최신 tickers/{월}/*.json과 비교해
+  바뀐 경우에만 새 월 폴더에 업로드
+
+캐시 위치: TICKER_CACHE_DIR 환경 변수 또는 scripts/.universe-cache
+  항목마다 {이름}.raw(원본)와 {이름}.json(URL, ETag, Last-Modified, 해시, 파싱 결과)
+
+사용법:
+    tickers = get_sp500_tickers()
+    pairs = get_nasdaq100_constituents()   # [(ticker, company_name), ...]
+    diff = membership_diff(old_tickers, tickers)
+"""
+
+import io
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import requests
+
+# 기본 캐시 위치 (scripts/.universe-cache)
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".universe-cache"
+
+# 원본 요청 타임아웃 (초)
+REQUEST_TIMEOUT = 30
+
+# Wikipedia는 User-Agent 없으면 403
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+@dataclass(frozen=True)
+class UniverseSource:
+    """
+    구성 종목 원본 정의
+
+    kind: "csv" (GitHub 데이터셋) 또는 "html" (Wikipedia 표, 티커 컬럼이 있는 첫 표)
+    ticker_columns / name_columns: 앞에서부터 존재하는 컬럼 사용
+    dash_tickers: "BRK.B" → "BRK-B" (yfinance/FMP 표기)
+    """
+    name: str
+    url: str
+    kind: str
+    ticker_columns: Tuple[str, ...]
+    name_columns: Tuple[str, ...] = ()
+    dash_tickers: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+SP500_GITHUB = UniverseSource(
+    name="sp500-github",
+    url="https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv",
+    kind="csv",
+    ticker_columns=("Symbol",),
+    name_columns=("Security", "Name"),
+    dash_tickers=True,
+)
+
+NASDAQ100_WIKIPEDIA = UniverseSource(
+    name="nasdaq100-wikipedia",
+    url="https://en.wikipedia.org/wiki/Nasdaq-100",
+    kind="html",
+    ticker_columns=("Ticker", "Symbol"),
+    name_columns=("Company", "Security"),
+    headers=BROWSER_HEADERS,
+)
+
+NASDAQ100_GITHUB = UniverseSource(
+    name="nasdaq100-github",
+    url="https://raw.githubusercontent.com/Gary-Strauss/NASDAQ100_Constituents/master/data/nasdaq100_constituents.csv",
+    kind="csv",
+    ticker_columns=("Ticker",),
+    name_columns=("Company", "Name"),
+    dash_tickers=True,
+)
+
+
+# ============================================================================
+# 로컬 캐시
+# ============================================================================
+
+def cache_dir() -> Path:
+    return Path(os.getenv("TICKER_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+def _cache_paths(source: UniverseSource) -> Tuple[Path, Path]:
+    directory = cache_dir()
+    return directory / f"{source.name}.raw", directory / f"{source.name}.json"
+
+
+def load_cache(source: UniverseSource) -> Optional[Dict]:
+    """캐시 메타데이터 (URL이 바뀌었거나 없거나 손상되면 None)"""
+    _, meta_path = _cache_paths(source)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return meta if meta.get("url") == source.url and meta.get("constituents") else None
+
+
+def save_cache(source: UniverseSource, payload: bytes, meta: Dict):
+    """원본과 메타데이터 저장 (실패해도 조회 결과에는 영향 없음)"""
+    raw_path, meta_path = _cache_paths(source)
+    try:
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+        raw_path.write_bytes(payload)
+        meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️ 티커 원본 캐시 저장 실패 ({source.name}): {e}")
+
+
+def _cached_constituents(meta: Dict) -> List[Tuple[str, str]]:
+    return [(ticker, name) for ticker, name in meta["constituents"]]
+
+
+# ============================================================================
+# 원본 파싱
+# ============================================================================
+
+def parse_constituents(source: UniverseSource, payload: bytes) -> List[Tuple[str, str]]:
+    """
+    원본 → [(ticker, company_name), ...] (원본 순서, 중복 제거)
+
+    Raises:
+        ValueError: 티커 컬럼이 있는 표를 찾지 못함
+    """
+    if source.kind == "csv":
+        tables = [pd.read_csv(io.BytesIO(payload))]
+    else:
+        tables = pd.read_html(io.StringIO(payload.decode("utf-8", errors="replace")))
+
+    for table in tables:
+        ticker_col = next((c for c in source.ticker_columns if c in table.columns), None)
+        if ticker_col is None:
+            continue
+        name_col = next((c for c in source.name_columns if c in table.columns), None)
+
+        constituents, seen = [], set()
+        for _, row in table.iterrows():
+            if pd.isna(row[ticker_col]):
+                continue
+            ticker = str(row[ticker_col]).strip()
+            if source.dash_tickers:
+                ticker = ticker.replace(".", "-")
+            if not ticker or ticker in seen:
+                continue
+            seen.add(ticker)
+            name = str(row[name_col]).strip() if name_col and pd.notna(row[name_col]) else ""
+            constituents.append((ticker, name))
+        if constituents:
+            return constituents
+
+    raise ValueError(f"티커 컬럼({', '.join(source.ticker_columns)})이 있는 표를 찾을 수 없습니다")
+
+
+# ============================================================================
+# 조회
+# ============================================================================
+
+def fetch_constituents(source: UniverseSource) -> List[Tuple[str, str]]:
+    """
+    구성 종목 조회 (조건부 요청, 변경 없으면 캐시된 파싱 결과)
+
+    Returns:
+        [(ticker, company_name), ...]
+
+    Raises:
+        요청/파싱 에러 (마지막 캐시도 없을 때만)
+    """
+    meta = load_cache(source)
+    headers = dict(source.headers)
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(source.url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and meta:
+            print(f"   📦 변경 없음 (304, 캐시 사용: {meta.get('fetched_at', '')[:10]})")
+            return _cached_constituents(meta)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        if meta:
+            print(f"   ⚠️ 원본 요청 실패, 마지막 캐시 사용 ({meta.get('fetched_at', '')[:10]}): {e}")
+            return _cached_constituents(meta)
+        raise
+
+    payload = response.content
+    digest = hashlib.sha256(payload).hexdigest()
+    validators = {
+        "url": source.url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": digest,
+        "fetched_at": datetime.now().isoformat(),
+    }
+
+    if meta and meta.get("hash") == digest:
+        print("   📦 원본 내용 동일 (다시 파싱하지 않음)")
+        constituents = _cached_constituents(meta)
+    else:
+        try:
+            constituents = parse_constituents(source, payload)
+        except Exception:
+            if meta:
+                print("   ⚠️ 원본 파싱 실패, 마지막 캐시 사용")
+                return _cached_constituents(meta)
+            raise
+
+    save_cache(source, payload, {**validators, "constituents": constituents})
+    return constituents
+
+
+def get_sp500_constituents() -> Optional[List[Tuple[str, str]]]:
+    """
+    S&P 500 (ticker, company_name) 리스트 (GitHub 공개 데이터셋)
+
+    Returns:
+        리스트 또는 None (실패)
+    """
+    try:
+        print("\n🔍 S&P 500 티커 리스트 가져오는 중...")
+        constituents = fetch_constituents(SP500_GITHUB)
+        print(f"✅ S&P 500: {len(constituents)}개 종목")
+        return constituents
+    except Exception as e:
+        print(f"❌ S&P 500 가져오기 실패: {e}")
+        return None
+
+
+def get_nasdaq100_constituents(source: UniverseSource = NASDAQ100_WIKIPEDIA) -> Optional[List[Tuple[str, str]]]:
+    """
+    나스닥 100 (ticker, company_name) 리스트
+
+    Args:
+        source: NASDAQ100_WIKIPEDIA(기본값) 또는 NASDAQ100_GITHUB
+
+    Returns:
+        리스트 또는 None (실패)
+    """
+    try:
+        print("\n🔍 나스닥 100 티커 리스트 가져오는 중...")
+        constituents = fetch_constituents(source)
+        print(f"✅ 나스닥 100: {len(constituents)}개 종목")
+        return constituents
+    except Exception as e:
+        print(f"❌ 나스닥 100 가져오기 실패: {e}")
+        return None
+
+
+def get_sp500_tickers() -> Optional[List[str]]:
+    """S&P 500 티커 리스트 (실패 시 None)"""
+    constituents = get_sp500_constituents()
+    return [ticker for ticker, _ in constituents] if constituents else None
+
+
+def get_nasdaq100_tickers(source: UniverseSource = NASDAQ100_WIKIPEDIA,
+                          fallback: bool = True) -> Optional[List[str]]:
+    """
+    나스닥 100 티커 리스트
+
+    Args:
+        source: 원본 (기본값: Wikipedia)
+        fallback: 실패 시 하드코딩된 기본 리스트 사용 (False면 None)
+    """
+    constituents = get_nasdaq100_constituents(source)
+    if constituents:
+        return [ticker for ticker, _ in constituents]
+    if fallback:
+        print("⚠️ 대신 기본 리스트를 사용합니다...")
+        return get_nasdaq100_fallback()
+    return None
+
+
+def get_nasdaq100_fallback() -> List[str]:
+    """
+    나스닥 100 기본 리스트 (백업용)
+
+    원본 조회와 캐시가 모두 실패할 때만 사용하는 하드코딩된 리스트입니다.
+    주기적으로 업데이트가 필요합니다.
+    """
+    return [
+        # 메가캡 테크
+        "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA",
+        # 대형 테크
+        "AVGO", "COST", "NFLX", "ADBE", "CSCO", "PEP", "AMD", "INTC",
+        "TMUS", "INTU", "QCOM", "TXN", "AMGN", "HON", "AMAT", "SBUX",
+        # 중형 테크 & 성장주
+        "ADP", "GILD", "ISRG", "BKNG", "ADI", "VRTX", "REGN", "PANW",
+        "MU", "LRCX", "MDLZ", "PYPL", "SNPS", "KLAC", "CDNS", "MRVL",
+        "ASML", "NXPI", "ABNB", "MELI", "WDAY", "FTNT", "DASH", "TEAM",
+        # 소형 테크 & 헬스케어
+        "DXCM", "CHTR", "MNST", "ADSK", "CPRT", "AEP", "ORLY", "ROST",
+        "PCAR", "PAYX", "ODFL", "FAST", "EA", "KDP", "VRSK", "XEL",
+        "CTSH", "DDOG", "EXC", "CTAS", "GEHC", "IDXX", "LULU", "CCEP",
+        # 추가 종목
+        "KHC", "ZS", "BIIB", "TTWO", "ANSS", "ON", "CDW", "CRWD",
+        "GFS", "WBD", "ILMN", "MDB", "MRNA", "WBA", "DLTR", "SIRI",
+        "FANG", "CEG", "SMCI", "TTD", "ARM", "ROP", "CSGP", "AZN",
+        "MCHP", "PDD", "MAR", "CSX",
+    ]
+
+
+# ============================================================================
+# 구성 종목 변경분
+# ============================================================================
+
+def membership_diff(old: Optional[Sequence[str]], new: Sequence[str]) -> Dict[str, List[str]]:
+    """
+    이전 → 현재 구성 종목 변경분
+
+    Returns:
+        {"added": [...], "removed": [...]} (정렬), 이전 목록이 없으면 전부 added
+    """
+    old_set, new_set = set(old or []), set(new)
+    return {"added": sorted(new_set - old_set), "removed": sorted(old_set - new_set)}
+
+
+def has_changes(diff: Dict[str, List[str]]) -> bool:
+    return bool(diff["added"] or diff["removed"])
+
+
+def print_membership_diff(label: str, diff: Dict[str, List[str]]):
+    """구성 종목 변경분 출력"""
+    if not has_changes(diff):
+        print(f"   = {label}: 변경 없음")
+        return
+    print(f"   Δ {label}: 추가 {len(diff['added'])}개, 제외 {len(diff['removed'])}개")
+    if diff["added"]:
+        print(f"     + {', '.join(diff['added'][:30])}{' ...' if len(diff['added']) > 30 else ''}")
+    if diff["removed"]:
+        print(f"     - {', '.join(diff['removed'][:30])}{' ...' if len(diff['removed']) > 30 else ''}")
+
+
+def latest_ticker_month(folder_items: Sequence[Dict]) -> Optional[str]:
+    """
+    tickers/ 목록 조회 결과 중 가장 최근 월 폴더 (YYYY-MM)
+
+    구성 종목이 바뀐 달에만 새 폴더가 생기므로, 최신 목록은 이번 달이 아닐 수 있습니다.
+    """
+    months = sorted(item["name"] for item in folder_items
+                    if item.get("id") is None and len(item["name"]) == 7 and item["name"][4] == "-")
+    return months[-1] if months else None
@@ -0,0 +1,414 @@
+"""
+yfinance 버핏 평가 백테스트
+
+목적: 저장된 현재가 스냅샷(prices/{date}/)과 재무제표(financials/{year}/)로 과거 날짜의 평가를
+재현하고, BUY 종목 포트폴리오의 이후 수익률을 전체 종목과 비교
+- yf-raw-data 버킷을 내려받은 로컬 디렉터리(미러, storage_sync.py로 생성)에서만 읽음 (네트워크 없음)
+- 재무제표 점수는 (연도, 종목)별로 1회만 계산 (yf_evaluate.evaluate_fundamentals와 동일)
+- 현재가 스냅샷은 한 번에 메모리로 읽어 날짜×종목 행렬로 만들고,
+  GAP/BUY 판정과 이후 수익률은 날짜 전체에 대해 벡터 연산 (yf_evaluate.apply_price와 같은 판정)
+- 평가일에는 그 날짜까지 이미 수집된(data.json의 collected_at ≤ 평가일) 가장 최근 financials/{year}만
+  종목별로 사용, 아직 수집 전이면 이전 연도로 대체 (미래 재무제표 미사용)
+
+포트폴리오 (동일 가중, 평가일마다 재구성):
+- universe: 평가 가능한 전체 종목
+- pass: 우량주 (총점 85 이상)
+- buy: 저평가 우량주 (PASS + 적정가 > 현재가, is_undervalued)
+
+수익률 기간(--horizons)은 저장된 스냅샷 개수 기준입니다 (예: 20 = 20번째 다음 스냅샷).
+
+실행 예시:
+  python yf_backtest.py --mirror-dir ./yf-raw-data
+  python yf_backtest.py --mirror-dir ./yf-raw-data --start 2026-01-02 --end 2026-06-30 --step 5
+  python yf_backtest.py --mirror-dir ./yf-raw-data --horizons 5,20,60 --output backtest.csv
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from buffett_scoring import DEFAULT_SCORING
+from yf_evaluate import (
+    evaluate_fundamentals,
+    parse_price_snapshot,
+    PRICE_SNAPSHOT_FILE,
+)
+
+# ============================================================================
+# 설정
+# ============================================================================
+
+# 기본 수익률 기간 (스냅샷 개수)
+DEFAULT_HORIZONS = "5,20,60"
+
+# 우량주 기준 총점 (yf_evaluate와 동일)
+PASS_SCORE = DEFAULT_SCORING.pass_score
+
+# 포트폴리오 이름 (출력 순서)
+PORTFOLIOS = ["universe", "pass", "buy"]
+
+
+# ============================================================================
+# 로컬 미러 읽기
+# ============================================================================
+
+def is_date_folder(name: str) -> bool:
+    """YYYY-MM-DD 형식 폴더인지 확인"""
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def list_mirror_dates(mirror_dir: str) -> List[str]:
+    """미러의 prices/ 아래 날짜 폴더 목록 (오름차순)"""
+    prices_dir = os.path.join(mirror_dir, "prices")
+    if not os.path.isdir(prices_dir):
+        return []
+    return sorted(name for name in os.listdir(prices_dir) if is_date_folder(name))
+
+
+def list_mirror_years(mirror_dir: str) -> List[str]:
+    """미러의 financials/ 아래 연도 폴더 목록 (오름차순)"""
+    financials_dir = os.path.join(mirror_dir, "financials")
+    if not os.path.isdir(financials_dir):
+        return []
+    return sorted(name for name in os.listdir(financials_dir)
+                  if name.isdigit() and os.path.isdir(os.path.join(financials_dir, name)))
+
+
+def read_mirror_json(path: str) -> Optional[Dict]:
+    """미러의 JSON 파일 읽기 (없거나 파싱 실패 시 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def load_price_snapshot_from_mirror(mirror_dir: str, date: str) -> Dict[str, float]:
+    """
+    날짜별 현재가 {ticker: current_price} (snapshot.jsonl 우선, 없으면 종목별 파일)
+    """
+    date_dir = os.path.join(mirror_dir, "prices", date)
+    snapshot_path = os.path.join(date_dir, PRICE_SNAPSHOT_FILE)
+
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, "rb") as f:
+            rows = parse_price_snapshot(f.read())
+    else:
+        rows = {}
+        for name in os.listdir(date_dir):
+            if name.endswith(".json"):
+                row = read_mirror_json(os.path.join(date_dir, name))
+                if row:
+                    rows[name[:-len(".json")]] = row
+
+    return {ticker: row.get("current_price") for ticker, row in rows.items()}
+
+
+def load_price_matrix(mirror_dir: str, dates: List[str]) -> pd.DataFrame:
+    """
+    스냅샷 전체를 한 번에 읽어 날짜×종목 현재가 행렬 생성 (없는 값은 NaN)
+    """
+    columns = {}
+    for date in tqdm(dates, desc="스냅샷 로드", ncols=80, ascii=True, leave=True):
+        columns[date] = load_price_snapshot_from_mirror(mirror_dir, date)
+
+    prices = pd.DataFrame.from_dict(columns, orient="index")
+    prices = prices.apply(pd.to_numeric, errors="coerce").sort_index()
+    prices.index.name = "date"
+    return prices
+
+
+def load_fundamentals_from_mirror(mirror_dir: str, year: str) -> pd.DataFrame:
+    """
+    financials/{year}/{ticker}/data.json 전체 → 종목별 펀더멘털 평가 (가격 무관 부분)
+
+    Returns:
+        index=ticker, columns=[total_score, intrinsic_value, available_from]
+        (available_from: 수집일 YYYY-MM-DD, 이 날짜부터 평가에 사용 / 평가 불가·수집일 없는 종목 제외)
+    """
+    year_dir = os.path.join(mirror_dir, "financials", year)
+    tickers = sorted(name for name in os.listdir(year_dir)
+                     if os.path.isdir(os.path.join(year_dir, name)))
+
+    rows = {}
+    undated = 0
+    for ticker in tqdm(tickers, desc=f"재무제표 {year}", ncols=80, ascii=True, leave=True):
+        financial_data = read_mirror_json(os.path.join(year_dir, ticker, "data.json"))
+        if not financial_data:
+            continue
+        # 수집일을 모르면 어느 평가일에 쓸 수 있었는지 알 수 없으므로 제외
+        collected_at = str(financial_data.get("collected_at") or "")[:10]
+        if not is_date_folder(collected_at):
+            undated += 1
+            continue
+        try:
+            fundamentals = evaluate_fundamentals(ticker, financial_data)
+        except Exception as e:
+            print(f"⚠️ {ticker} ({year}) 평가 오류: {e}")
+            continue
+        if fundamentals:
+            rows[ticker] = {
+                "total_score": fundamentals["total_score"],
+                "intrinsic_value": fundamentals["intrinsic_value"],
+                "available_from": collected_at,
+            }
+
+    if undated:
+        print(f"⚠️ 재무제표 {year}: collected_at 없는 종목 {undated}개 제외")
+
+    return pd.DataFrame.from_dict(rows, orient="index",
+                                  columns=["total_score", "intrinsic_value", "available_from"])
+
+
+def financial_year_for(date: str, years: List[str]) -> Optional[str]:
+    """평가일 연도 이하 중 최신 재무제표 연도 (없으면 None, 종목별 수집일은 fundamentals_as_of에서 확인)"""
+    candidates = [year for year in years if year <= date[:4]]
+    return candidates[-1] if candidates else None
+
+
+def fundamentals_as_of(eval_dates: List[str], tickers: pd.Index,
+                       fundamentals_by_year: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    평가일×종목 총점/적정가 행렬 (평가일 시점에 이미 수집된 재무제표만 사용)
+
+    연도 오름차순으로 덮어써서, 종목마다 평가일 연도 이하이면서
+    collected_at ≤ 평가일인 가장 최근 연도의 값이 남습니다. (해당 연도 수집 전이면 이전 연도)
+    """
+    dates = np.array(eval_dates)
+    date_years = np.array([date[:4] for date in eval_dates])
+    shape = (len(eval_dates), len(tickers))
+    total_score = np.full(shape, np.nan)
+    intrinsic = np.full(shape, np.nan)
+
+    for year in sorted(fundamentals_by_year):
+        fundamentals = fundamentals_by_year[year].reindex(tickers)
+        available_from = fundamentals["available_from"].fillna("9999-99-99").to_numpy(dtype=str)
+        usable = (date_years >= year)[:, None] & (available_from[None, :] <= dates[:, None])
+        usable &= ~np.isnan(fundamentals["intrinsic_value"].to_numpy(dtype=float))[None, :]
+
+        total_score = np.where(usable, fundamentals["total_score"].to_numpy(dtype=float)[None, :], total_score)
+        intrinsic = np.where(usable, fundamentals["intrinsic_value"].to_numpy(dtype=float)[None, :], intrinsic)
+
+    return {
+        "total_score": pd.DataFrame(total_score, index=eval_dates, columns=tickers),
+        "intrinsic_value": pd.DataFrame(intrinsic, index=eval_dates, columns=tickers),
+    }
+
+
+# ============================================================================
+# 백테스트 계산 (벡터화)
+# ============================================================================
+
+def build_portfolio_masks(prices: pd.DataFrame, eval_dates: List[str],
+                          fundamentals_by_year: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    평가일×종목 포트폴리오 편입 여부 (universe / pass / buy)
+
+    평가일 시점의 총점/적정가 행렬(fundamentals_as_of)로 전체 평가일을 행렬 연산 한 번에 판정합니다.
+    """
+    as_of = fundamentals_as_of(eval_dates, prices.columns, fundamentals_by_year)
+    price = prices.loc[eval_dates]
+    intrinsic = as_of["intrinsic_value"]
+
+    universe = (price > 0) & intrinsic.notna()
+    pass_mask = universe & (as_of["total_score"] >= PASS_SCORE)
+    # apply_price: gap_pct > 0 ⇔ 현재가 > 0 이고 적정가 > 현재가
+    buy_mask = pass_mask & (price < intrinsic)
+
+    return {"universe": universe, "pass": pass_mask, "buy": buy_mask}
+
+
+def portfolio_returns(forward: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
+    """
+    평가일별 동일 가중 포트폴리오 수익률
+
+    Returns:
+        index=평가일, columns=[return, picks] (이후 가격이 있는 종목만 포함)
+    """
+    held = mask & forward.notna()
+    picks = held.sum(axis=1)
+    total = forward.where(held, 0.0).sum(axis=1)
+    returns = (total / picks.replace(0, np.nan))
+    return pd.DataFrame({"return": returns, "picks": picks})
+
+
+def run_backtest(prices: pd.DataFrame, eval_dates: List[str],
+                 fundamentals_by_year: Dict[str, pd.DataFrame],
+                 horizons: List[int]) -> pd.DataFrame:
+    """
+    기간별·포트폴리오별 이후 수익률 요약표 생성
+
+    Returns:
+        horizon, portfolio, dates, avg_picks, mean_return_pct, median_return_pct,
+        excess_vs_universe_pct, hit_rate_pct (universe보다 높았던 평가일 비율)
+    """
+    masks = build_portfolio_masks(prices, eval_dates, fundamentals_by_year)
+    summary = []
+
+    for horizon in horizons:
+        forward = (prices.shift(-horizon) / prices - 1).loc[eval_dates]
+        by_portfolio = {name: portfolio_returns(forward, masks[name]) for name in PORTFOLIOS}
+        universe_returns = by_portfolio["universe"]["return"]
+
+        for name in PORTFOLIOS:
+            result = by_portfolio[name]
+            valid = result["return"].notna() & universe_returns.notna()
+            returns = result["return"][valid]
+            excess = returns - universe_returns[valid]
+
+            summary.append({
+                "horizon": horizon,
+                "portfolio": name,
+                "dates": int(valid.sum()),
+                "avg_picks": round(float(result["picks"][valid].mean()), 1) if valid.any() else 0.0,
+                "mean_return_pct": round(float(returns.mean()) * 100, 2) if valid.any() else None,
+                "median_return_pct": round(float(returns.median()) * 100, 2) if valid.any() else None,
+                "excess_vs_universe_pct": round(float(excess.mean()) * 100, 2) if valid.any() else None,
+                "hit_rate_pct": round(float((excess > 0).mean()) * 100, 1) if valid.any() else None,
+            })
+
+    return pd.DataFrame(summary)
+
+
+def print_summary(summary: pd.DataFrame):
+    """요약표 출력"""
+    print("\n" + "=" * 90)
+    print(f"{'기간':>5} {'포트폴리오':<10} {'평가일':>6} {'평균종목':>8} "
+          f"{'평균%':>8} {'중앙값%':>8} {'초과%':>8} {'승률%':>7}")
+    print("-" * 90)
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None and not pd.isna(value) else "-"
+
+    for row in summary.to_dict("records"):
+        print(f"{row['horizon']:>5} {row['portfolio']:<10} {row['dates']:>6} {row['avg_picks']:>8.1f} "
+              f"{fmt(row['mean_return_pct'], '>8.2f')} {fmt(row['median_return_pct'], '>8.2f')} "
+              f"{fmt(row['excess_vs_universe_pct'], '>8.2f')} {fmt(row['hit_rate_pct'], '>7.1f')}")
+    print("=" * 90)
+
+
+# ============================================================================
+# 메인 실행
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="yfinance 버핏 평가 백테스트 (로컬 버킷 미러 사용)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+실행 예시:
+  python yf_backtest.py --mirror-dir ./yf-raw-data
+  python yf_backtest.py --mirror-dir ./yf-raw-data --start 2026-01-02 --end 2026-06-30 --step 5
+  python yf_backtest.py --mirror-dir ./yf-raw-data --horizons 5,20,60 --output backtest.csv
+        """
+    )
+
+    parser.add_argument(
+        "--mirror-dir",
+        type=str,
+        required=True,
+        help="yf-raw-data 버킷 로컬 미러 디렉터리 (prices/, financials/ 포함)"
+    )
+
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help="첫 평가일 (YYYY-MM-DD, 기본값: 가장 오래된 스냅샷)"
+    )
+
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="마지막 평가일 (YYYY-MM-DD, 기본값: 가장 최근 스냅샷)"
+    )
+
+    parser.add_argument(
+        "--step",
+        type=int,
+        default=1,
+        help="평가일 간격 (스냅샷 개수, 기본값: 1 = 모든 스냅샷)"
+    )
+
+    parser.add_argument(
+        "--horizons",
+        type=str,
+        default=DEFAULT_HORIZONS,
+        help=f"이후 수익률 기간, 쉼표 구분 (스냅샷 개수, 기본값: {DEFAULT_HORIZONS})"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="요약표 CSV 저장 경로"
+    )
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("📈 yfinance 버핏 평가 백테스트")
+    print("=" * 70)
+    print(f"📅 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📁 미러: {args.mirror_dir}")
+    print("=" * 70)
+
+    all_dates = list_mirror_dates(args.mirror_dir)
+    years = list_mirror_years(args.mirror_dir)
+    if not all_dates:
+        print(f"\n❌ {args.mirror_dir}/prices/ 에 스냅샷이 없습니다.")
+        return
+    if not years:
+        print(f"\n❌ {args.mirror_dir}/financials/ 에 재무제표가 없습니다.")
+        return
+
+    try:
+        horizons = sorted({int(h) for h in args.horizons.split(",") if h.strip()})
+    except ValueError:
+        print(f"\n❌ --horizons 형식 오류: {args.horizons}")
+        return
+
+    # 평가일: 기간 내 스냅샷 중 step 간격, 사용할 재무제표 연도가 있는 날짜만
+    eval_dates = [d for d in all_dates
+                  if (args.start is None or d >= args.start) and (args.end is None or d <= args.end)]
+    eval_dates = [d for d in eval_dates[::max(1, args.step)] if financial_year_for(d, years)]
+    if not eval_dates:
+        print("\n❌ 평가 가능한 날짜가 없습니다 (기간 또는 재무제표 연도 확인).")
+        return
+
+    print(f"📊 스냅샷: {len(all_dates)}개 ({all_dates[0]} ~ {all_dates[-1]})")
+    print(f"🎯 평가일: {len(eval_dates)}개 ({eval_dates[0]} ~ {eval_dates[-1]})")
+    print(f"⏱️ 수익률 기간: {', '.join(str(h) for h in horizons)} 스냅샷")
+
+    # 평가일 이후 스냅샷까지 포함하여 한 번에 로드
+    prices = load_price_matrix(args.mirror_dir, [d for d in all_dates if d >= eval_dates[0]])
+
+    # 해당 연도 수집 전 평가일은 이전 연도로 대체하므로 그 이하 연도도 함께 로드
+    last_year = max(financial_year_for(d, years) for d in eval_dates)
+    used_years = [year for year in years if year <= last_year]
+    fundamentals_by_year = {year: load_fundamentals_from_mirror(args.mirror_dir, year)
+                            for year in used_years}
+    for year, fundamentals in fundamentals_by_year.items():
+        print(f"✅ 재무제표 {year}: 평가 가능 {len(fundamentals)}개 종목")
+
+    summary = run_backtest(prices, eval_dates, fundamentals_by_year, horizons)
+    print_summary(summary)
+
+    if args.output:
+        summary.to_csv(args.output, index=False)
+        print(f"\n💾 요약표 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+yfinance 버핏 평가 - 전체 종목 일괄(벡터화) 계산
+
+목적: yf_evaluate.evaluate_ticker와 같은 점수를 전체 종목에 대해 한 번에 계산
+- 모든 종목의 연도별 지표를 하나의 long-format DataFrame(ticker, pos, year, 지표)으로 모음
+- 6개 점수 블록, EPS CAGR, 적정가는 buffett_scoring.score_metrics_frame(벡터 연산),
+  GAP/추천/신뢰등급은 이 스크립트에서 계산
+- 결과 DataFrame의 각 행은 evaluate_ticker가 반환하는 dict와 동일
+- 기준값을 바꿔 재평가(what-if)할 때 Storage 재조회 없이 즉시 재계산 가능
+
+동일성 유지:
+- 평균/분산은 종목별로 오래된 연도부터 순서대로 더함 (Python sum과 같은 부동소수 결과)
+- 반올림은 Python round 사용 (numpy round와 결과가 다를 수 있음)
+
+실행 예시:
+  python yf_batch_evaluate.py --mode test --date 2026-01-30
+  python yf_batch_evaluate.py --mode full --date 2026-01-30 --verify
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from buffett_scoring import (
+    MetricSeries,
+    build_metrics_frame,
+    score_metrics_frame,
+    DEFAULT_SCORING,
+    YF_POLICY,
+)
+from storage_gateway import configure_storage
+from yf_evaluate import (
+    validate_env,
+    configure_cache,
+    print_cache_stats,
+    load_ticker_data,
+    extract_yearly_metrics,
+    evaluate_loaded_ticker,
+    list_tickers_from_prices,
+    find_latest_financial_year,
+    get_trust_grade,
+    generate_pass_reason,
+    generate_valuation_reason,
+    DEFAULT_CACHE_MAX_MB,
+)
+
+# ============================================================================
+# 설정
+# ============================================================================
+
+# 결과 컬럼 순서 (evaluate_ticker 결과 dict와 동일, 요약문 제외)
+RESULT_COLUMNS = [
+    "ticker", "company_name", "exchange", "industry",
+    "total_score", "roe_score", "roic_score", "margin_score",
+    "trend_score", "health_score", "cash_score",
+    "pass_status", "current_price", "intrinsic_value", "gap_pct",
+    "recommendation", "is_undervalued",
+    "avg_roe", "avg_roic", "avg_net_margin", "avg_fcf_margin",
+    "debt_ratio", "eps_cagr", "years_data",
+    "trust_grade", "trust_grade_text", "trust_grade_stars",
+]
+
+# Storage 로드 병렬 스레드 수
+DEFAULT_LOAD_WORKERS = 8
+
+
+# ============================================================================
+# 데이터 로드
+# ============================================================================
+
+def load_universe(tickers: List[str], date: str, year: str,
+                  workers: int = DEFAULT_LOAD_WORKERS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    전체 종목의 평가 입력을 로드하여 (지표 DataFrame, 종목 정보 DataFrame) 반환
+
+    종목 정보 DataFrame 컬럼: ticker, company_name, exchange, industry, current_price
+    데이터가 없거나 유효 연도가 2개 미만인 종목은 제외됩니다.
+    """
+    series_by_ticker: Dict[str, MetricSeries] = {}
+    info_rows = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        loaded = executor.map(lambda t: (t, load_ticker_data(t, date, year)), tickers)
+
+        for ticker, (financial_data, price_data) in tqdm(loaded, total=len(tickers), desc="데이터 로드",
+                                                         ncols=80, ascii=True, leave=True):
+            if not financial_data or not price_data:
+                continue
+
+            try:
+                series = extract_yearly_metrics(financial_data)
+            except Exception as e:
+                print(f"⚠️ {ticker} 지표 추출 오류: {e}")
+                continue
+
+            current_price = price_data.get("current_price", 0)
+            if not series or len(series) < YF_POLICY.min_years or current_price is None:
+                continue
+
+            series_by_ticker[ticker] = series
+            info_rows.append({
+                "ticker": ticker,
+                "company_name": price_data.get("company_name", financial_data.get("company_name", ticker)),
+                "exchange": price_data.get("exchange", "Unknown"),
+                "industry": financial_data.get("industry", "Unknown"),
+                "current_price": current_price,
+            })
+
+    info = pd.DataFrame(info_rows, columns=["ticker", "company_name", "exchange", "industry", "current_price"])
+    # 현재가는 원본 타입(int/float) 유지
+    info["current_price"] = pd.Series([r["current_price"] for r in info_rows], dtype=object)
+    return build_metrics_frame(series_by_ticker), info
+
+
+# ============================================================================
+# 반올림 유틸
+# ============================================================================
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Python round(x, 2)와 같은 결과로 반올림"""
+    return np.array([round(float(v), 2) for v in values], dtype=float)
+
+
+def _round2_or_zero(values: np.ndarray, computed: np.ndarray) -> np.ndarray:
+    """
+    computed 위치는 round(x, 2), 나머지는 정수 0
+
+    종목별 계산에서 기본값이 정수 0으로 남는 항목(eps_cagr, gap_pct)을
+    요약문 JSON까지 같게 만들기 위해 사용
+    """
+    return np.array([round(float(v), 2) if ok else 0 for v, ok in zip(values, computed)], dtype=object)
+
+
+# ============================================================================
+# 일괄 점수 계산
+# ============================================================================
+
+def score_frame(metrics: pd.DataFrame, info: pd.DataFrame) -> pd.DataFrame:
+    """
+    전체 종목 점수 일괄 계산
+
+    Args:
+        metrics: build_metrics_frame 결과
+        info: 종목 정보 (ticker, company_name, exchange, industry, current_price)
+
+    Returns:
+        RESULT_COLUMNS 순서의 결과 DataFrame (info의 종목 순서 유지)
+    """
+    info = info[info["ticker"].isin(metrics["ticker"])].reset_index(drop=True)
+    tickers = pd.Index(info["ticker"])
+
+    if tickers.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    scores = score_metrics_frame(metrics, tickers, YF_POLICY)
+    n = scores["years_data"]
+    total_score = scores["total_score"]
+    intrinsic_value = scores["intrinsic_value"]
+
+    current_price = info["current_price"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_gap = (current_price > 0) & (intrinsic_value > 0)
+        gap_pct = np.where(has_gap, (intrinsic_value - current_price) / current_price * 100, 0.0)
+
+    # 신뢰등급 (연수 종류가 몇 개뿐이므로 고유값만 계산)
+    grades = {int(years): get_trust_grade(int(years)) for years in np.unique(n)}
+    grade_num = np.array([grades[years][0] for years in n], dtype=int)
+    grade_text = np.array([grades[years][1] for years in n], dtype=object)
+    grade_stars = np.array([grades[years][2] for years in n], dtype=object)
+
+    passed = total_score >= DEFAULT_SCORING.pass_score
+
+    result = pd.DataFrame({
+        "ticker": info["ticker"],
+        "company_name": info["company_name"],
+        "exchange": info["exchange"],
+        "industry": info["industry"],
+        "total_score": total_score,
+        "roe_score": scores["roe_score"],
+        "roic_score": scores["roic_score"],
+        "margin_score": scores["margin_score"],
+        "trend_score": scores["trend_score"],
+        "health_score": scores["health_score"],
+        "cash_score": scores["cash_score"],
+        "pass_status": np.where(passed, "PASS", "FAIL"),
+        "current_price": info["current_price"],
+        "intrinsic_value": _round2(intrinsic_value),
+        "gap_pct": _round2_or_zero(gap_pct, has_gap),
+        "recommendation": np.where(gap_pct > 0, "BUY", "WAIT"),
+        "is_undervalued": (gap_pct > 0) & passed,
+        "avg_roe": _round2(scores["avg_roe"]),
+        "avg_roic": _round2(scores["avg_roic"]),
+        "avg_net_margin": _round2(scores["avg_net_margin"]),
+        "avg_fcf_margin": _round2(scores["avg_fcf_margin"]),
+        "debt_ratio": _round2(scores["debt_ratio"]),
+        "eps_cagr": _round2_or_zero(scores["eps_cagr"], scores["eps_cagr_computed"]),
+        "years_data": n,
+        "trust_grade": grade_num,
+        "trust_grade_text": grade_text,
+        "trust_grade_stars": grade_stars,
+    })
+
+    return result[RESULT_COLUMNS]
+
+
+def frame_to_results(frame: pd.DataFrame) -> List[Dict]:
+    """
+    결과 DataFrame을 evaluate_ticker와 같은 dict 목록으로 변환 (요약문 포함)
+    """
+    results = frame.to_dict("records")
+    for r in results:
+        r["pass_reason"] = generate_pass_reason(r) or ""
+        r["valuation_reason"] = generate_valuation_reason(r) or ""
+    return results
+
+
+def evaluate_universe(tickers: List[str], date: str, year: str,
+                      workers: int = DEFAULT_LOAD_WORKERS) -> pd.DataFrame:
+    """
+    전체 종목 로드 + 일괄 점수 계산 (결과 DataFrame 반환)
+    """
+    metrics, info = load_universe(tickers, date, year, workers)
+    return score_frame(metrics, info)
+
+
+# ============================================================================
+# 검증
+# ============================================================================
+
+def verify_against_single(tickers: List[str], date: str, year: str, frame: pd.DataFrame) -> int:
+    """
+    evaluate_loaded_ticker(종목별 계산) 결과와 일괄 계산 결과 비교
+
+    Returns:
+        불일치 종목 수
+    """
+    batch = {r["ticker"]: r for r in frame_to_results(frame)}
+    mismatches = 0
+
+    for ticker in tqdm(tickers, desc="검증", ncols=80, ascii=True, leave=True):
+        single = evaluate_loaded_ticker(ticker, *load_ticker_data(ticker, date, year))
+        other = batch.get(ticker)
+
+        if single is None and other is None:
+            continue
+        if single != other:
+            mismatches += 1
+            if single is None or other is None:
+                print(f"   ❌ {ticker}: 한쪽만 결과 있음 (종목별={single is not None}, 일괄={other is not None})")
+            else:
+                diff = [k for k in single if single[k] != other.get(k)]
+                print(f"   ❌ {ticker}: {', '.join(diff)}")
+
+    return mismatches
+
+
+# ============================================================================
+# 메인 실행
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="yfinance 버핏 평가 - 전체 종목 일괄 계산",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+실행 예시:
+  python yf_batch_evaluate.py --mode test --date 2026-01-30
+  python yf_batch_evaluate.py --mode full --date 2026-01-30 --verify
+        """
+    )
+
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="test",
+        choices=["test", "full"],
+        help="실행 모드 (test: 5종목, full: 전체)"
+    )
+
+    parser.add_argument(
+        "--date",
+        type=str,
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="현재가 데이터 날짜 (YYYY-MM-DD)"
+    )
+
+    parser.add_argument(
+        "--year",
+        type=str,
+        default="auto",
+        help="재무제표 데이터 연도 (YYYY 또는 'auto')"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_LOAD_WORKERS,
+        help=f"Storage 로드 병렬 스레드 수 (기본값: {DEFAULT_LOAD_WORKERS})"
+    )
+
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="종목별 계산(evaluate_ticker) 결과와 동일한지 검증"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="결과 CSV 저장 경로 (선택)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+
+    parser.add_argument(
+        "--storage-dir",
+        type=str,
+        default=None,
+        help="Supabase 대신 읽을 로컬 Storage 미러 루트 (storage_sync.py로 생성, 기본값: STORAGE_LOCAL_DIR)"
+    )
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("⚡ yfinance 버핏 평가 (일괄 계산)")
+    print("=" * 70)
+    print(f"📅 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🔧 모드: {args.mode}")
+    print("=" * 70)
+
+    configure_storage(args.storage_dir)
+    validate_env()
+
+    configure_cache(args.cache_dir, args.cache_max_mb)
+
+    if args.year == "auto":
+        year = find_latest_financial_year()
+        if not year:
+            print("\n❌ financials/ 폴더에서 연도를 찾을 수 없습니다.")
+            return
+        print(f"📊 재무제표 연도 자동 탐색: {year}")
+    else:
+        year = args.year
+
+    if args.mode == "test":
+        tickers = ["AAPL", "MSFT", "GOOGL", "NVDA", "META"]
+    else:
+        tickers = list_tickers_from_prices(args.date)
+        if not tickers:
+            print(f"\n❌ prices/{args.date}/ 폴더에 데이터가 없습니다.")
+            return
+
+    metrics, info = load_universe(tickers, args.date, year, max(1, args.workers))
+
+    started = datetime.now()
+    frame = score_frame(metrics, info)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    passed = frame[frame["pass_status"] == "PASS"]
+    undervalued = passed[passed["is_undervalued"]].sort_values("gap_pct", ascending=False, kind="stable")
+
+    print("\n" + "=" * 70)
+    print(f"📊 일괄 평가 완료: 총 {len(frame)}개 종목 ({elapsed * 1000:.0f}ms)")
+    print(f"   ✅ 우량주 (PASS): {len(passed)}개")
+    print(f"   🔥 저평가 우량주: {len(undervalued)}개")
+    print("=" * 70)
+
+    if len(undervalued):
+        print("\n🔥 저평가 우량주 TOP 10:")
+        for i, r in enumerate(undervalued.head(10).to_dict("records"), 1):
+            print(f"   {i}. {r['ticker']}: 총점 {r['total_score']}점, "
+                  f"상승여력 {r['gap_pct']:+.1f}%, 신뢰 {r['trust_grade_stars']}")
+
+    if args.output:
+        frame.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n💾 결과 저장: {args.output}")
+
+    if args.verify:
+        print("\n🔍 종목별 계산과 비교 검증")
+        mismatches = verify_against_single(tickers, args.date, year, frame)
+        if mismatches:
+            print(f"❌ 불일치: {mismatches}개 종목")
+        else:
+            print("✅ 모든 종목 결과 일치")
+
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,204 +12,20 @@ import yfinance as yf
 from curl_cffi.requests import Session
 import pandas as pd
 from datetime import datetime
-import math
 from tqdm import tqdm
 import warnings
-import requests
 
-warnings.filterwarnings("ignore")
-
-
-def get_sp500_tickers():
-    """
-    S&P 500 티커 리스트를 가져옴 (GitHub 백업 소스 사용)
-
-    Returns:
-        list: S&P 500 티커 리스트
-    """
-    try:
-        print("\n🔍 S&P 500 티커 리스트 가져오는 중...")
-
-        # GitHub 공개 데이터셋 사용
-        url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
-        df = pd.read_csv(url)
-        tickers = df["Symbol"].tolist()
-
-        # 클린업
-        tickers = [str(t).strip().replace(".", "-") for t in tickers if pd.notna(t)]
-
-        print(f"✅ 총 {len(tickers)}개 종목 발견!")
-        print(f"📋 샘플: {tickers[:10]}")
-
-        return tickers
-
-    except Exception as e:
-        print(f"❌ S&P 500 가져오기 실패: {str(e)}")
-        return None
-
-
-def get_nasdaq100_tickers():
-    """
-    Wikipedia에서 나스닥 100 티커 리스트를 가져옴
-
-    Returns:
-        list: 나스닥 100 티커 리스트
-    """
-    try:
-        print("\n🔍 나스닥 100 티커 리스트 가져오는 중...")
-        url = "https://en.wikipedia.org/wiki/Nasdaq-100"
-
-        # User-Agent 헤더 추가하여 403 우회
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-
-        # Wikipedia 테이블 읽기
-        tables = pd.read_html(requests.get(url, headers=headers).content)
-
-        # 나스닥 100 구성 종목 테이블 찾기
-        nasdaq100_df = None
-        for i, table in enumerate(tables):
-            if "Ticker" in table.columns or "Symbol" in table.columns:
-                nasdaq100_df = table
-                print(f"✅ 테이블 #{i}에서 발견!")
-                break
-
-        if nasdaq100_df is None:
-            print("❌ 나스닥 100 테이블을 찾을 수 없습니다.")
-            print("⚠️ 대신 기본 리스트를 사용합니다...")
-            return get_nasdaq100_fallback()
+from buffett_scoring import (
+    compute_year_metrics,
+    fair_per_tier,
+    MetricSeries,
+    score_series,
+    YF_LIVE_POLICY,
+    DEFAULT_SCORING,
+)
+from ticker_universe import get_sp500_tickers, get_nasdaq100_tickers
 
-        # 티커 컬럼명 찾기
-        ticker_column = "Ticker" if "Ticker" in nasdaq100_df.columns else "Symbol"
-
-        # 티커 리스트 추출
-        tickers = nasdaq100_df[ticker_column].tolist()
-
-        # 클린업
-        tickers = [str(t).strip() for t in tickers if pd.notna(t)]
-
-        print(f"✅ 총 {len(tickers)}개 종목 발견!")
-        print(f"📋 샘플: {tickers[:10]}")
-
-        return tickers
-
-    except Exception as e:
-        print(f"❌ 오류 발생: {str(e)}")
-        print("⚠️ 대신 기본 리스트를 사용합니다...")
-        return get_nasdaq100_fallback()
-
-
-def get_nasdaq100_fallback():
-    """나스닥 100 기본 리스트 (백업용)"""
-    return [
-        # 메가캡 테크
-        "AAPL",
-        "MSFT",
-        "GOOGL",
-        "GOOG",
-        "AMZN",
-        "NVDA",
-        "META",
-        "TSLA",
-        # 대형 테크
-        "AVGO",
-        "COST",
-        "NFLX",
-        "ADBE",
-        "CSCO",
-        "PEP",
-        "AMD",
-        "INTC",
-        "TMUS",
-        "INTU",
-        "QCOM",
-        "TXN",
-        "AMGN",
-        "HON",
-        "AMAT",
-        "SBUX",
-        # 중형 테크 & 성장주
-        "ADP",
-        "GILD",
-        "ISRG",
-        "BKNG",
-        "ADI",
-        "VRTX",
-        "REGN",
-        "PANW",
-        "MU",
-        "LRCX",
-        "MDLZ",
-        "PYPL",
-        "SNPS",
-        "KLAC",
-        "CDNS",
-        "MRVL",
-        "ASML",
-        "NXPI",
-        "ABNB",
-        "MELI",
-        "WDAY",
-        "FTNT",
-        "DASH",
-        "TEAM",
-        # 소형 테크 & 헬스케어
-        "DXCM",
-        "CHTR",
-        "MNST",
-        "ADSK",
-        "CPRT",
-        "AEP",
-        "ORLY",
-        "ROST",
-        "PCAR",
-        "PAYX",
-        "ODFL",
-        "FAST",
-        "EA",
-        "KDP",
-        "VRSK",
-        "XEL",
-        "CTSH",
-        "DDOG",
-        "EXC",
-        "CTAS",
-        "GEHC",
-        "IDXX",
-        "LULU",
-        "CCEP",
-        # 추가 종목
-        "KHC",
-        "ZS",
-        "BIIB",
-        "TTWO",
-        "ANSS",
-        "ON",
-        "CDW",
-        "CRWD",
-        "GFS",
-        "WBD",
-        "ILMN",
-        "MDB",
-        "MRNA",
-        "WBA",
-        "DLTR",
-        "SIRI",
-        # 추가 12개 (총 100개)
-        "FANG",
-        "CEG",
-        "SMCI",
-        "TTD",
-        "ARM",
-        "ROP",
-        "CSGP",
-        "AZN",
-        "MCHP",
-        "PDD",
-        "MAR",
-        "CSX",
-    ]
+warnings.filterwarnings("ignore")
 
 
 # SSL 인증서 에러 우회용 세션 생성
@@ -217,51 +33,6 @@ session = Session(impersonate="chrome")
 session.verify = False
 
 
-def calculate_roe(net_income, total_equity):
-    """ROE 계산"""
-    if total_equity == 0 or pd.isna(total_equity):
-        return 0.0
-    return (net_income / total_equity) * 100
-
-
-def calculate_roic(ebit, tax_rate, total_equity, total_liabilities):
-    """ROIC 계산"""
-    if pd.isna(ebit) or pd.isna(tax_rate):
-        return 0.0
-
-    nopat = ebit * (1 - tax_rate / 100)
-    invested_capital = total_equity + total_liabilities
-
-    if invested_capital == 0:
-        return 0.0
-
-    return (nopat / invested_capital) * 100
-
-
-def calculate_net_margin(net_income, revenue):
-    """Net Margin 계산"""
-    if revenue == 0 or pd.isna(revenue):
-        return 0.0
-    return (net_income / revenue) * 100
-
-
-def calculate_fcf_margin(free_cash_flow, revenue):
-    """FCF Margin 계산"""
-    if revenue == 0 or pd.isna(revenue):
-        return 0.0
-    return (free_cash_flow / revenue) * 100
-
-
-def calculate_cagr(start_value, end_value, years):
-    """CAGR 계산"""
-    if start_value <= 0 or pd.isna(start_value) or pd.isna(end_value):
-        return 0.0
-
-    ratio = end_value / start_value
-    cagr = (math.pow(ratio, 1.0 / years) - 1) * 100
-    return max(cagr, 0.0)
-
-
 def get_trust_grade(years):
     """
     데이터 연수에 따른 신뢰등급 반환
@@ -291,7 +62,7 @@ def generate_pass_reason(result_data):
         str: 통과 이유 요약문 또는 None
     """
     # 85점 미만은 요약문 생성 안 함
-    if result_data["total_score"] < 85:
+    if result_data["total_score"] < DEFAULT_SCORING.pass_score:
         return None
 
     ticker = result_data["ticker"]
@@ -395,6 +166,19 @@ def generate_pass_reason(result_data):
     return summary
 
 
+# fair_per_tier 구간별 (성장성 문구, PER 평가 문구) - 고성장/중성장/0 이상/음수
+PER_TIER_TEXT = (
+    ("- 높은 성장성: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n",
+     "- 성장주 프리미엄: PER {per:g}배 적용 (고성장 기업)\n"),
+    ("- 안정적 성장: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n",
+     "- 중성장주 평가: PER {per:g}배 적용\n"),
+    ("- 완만한 성장: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n",
+     "- 안정주 평가: PER {per:g}배 적용\n"),
+    ("- EPS 성장 둔화: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}%\n",
+     "- 보수적 평가: PER {per:g}배 적용\n"),
+)
+
+
 def generate_valuation_reason(result_data):
     """
     적정가 산정 이유 요약문 생성 (우량주인 경우만)
@@ -406,7 +190,7 @@ def generate_valuation_reason(result_data):
         str: 적정가 이유 요약문 또는 None
     """
     # 우량주면 적정가 평가 근거를 요약해줌
-    if result_data["total_score"] < 85:
+    if result_data["total_score"] < DEFAULT_SCORING.pass_score:
         return None
 
     ticker = result_data["ticker"]
@@ -431,22 +215,16 @@ def generate_valuation_reason(result_data):
 
     summary += f"💰 저평가 근거:\n\n"
 
-    # EPS 성장률 분석
-    if eps_cagr >= 15.0:
-        summary += f"- 높은 성장성: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n"
-        summary += f"- 성장주 프리미엄: PER 18배 적용 (고성장 기업)\n"
-    elif eps_cagr >= 8.0:
-        summary += f"- 안정적 성장: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n"
-        summary += f"- 중성장주 평가: PER 12배 적용\n"
-    elif eps_cagr >= 0.0:
-        summary += f"- 완만한 성장: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}% 성장\n"
-        summary += f"- 안정주 평가: PER 10배 적용\n"
-    else:
-        summary += f"- EPS 성장 둔화: 최근 {years}년간 EPS 연평균 {eps_cagr:.1f}%\n"
-        summary += f"- 보수적 평가: PER 8배 적용\n"
+    # EPS 성장률 분석 (적용 PER/성장률 반영 비율/안전마진은 점수 계산 기준값)
+    tier, fair_per = fair_per_tier(eps_cagr)
+    growth_text, per_text = PER_TIER_TEXT[tier]
+    summary += growth_text.format(years=years, eps_cagr=eps_cagr)
+    summary += per_text.format(per=fair_per)
 
-    summary += f"- 보수적 추정: 과거 성장률의 70%만 반영하여 미래 5년 추정\n"
-    summary += f"- 안전마진 20%: 이론적 가치의 80%를 적정가로 산정\n\n"
+    haircut_pct = DEFAULT_SCORING.growth_haircut * 100
+    safety_pct = DEFAULT_SCORING.safety_factor * 100
+    summary += f"- 보수적 추정: 과거 성장률의 {haircut_pct:.0f}%만 반영하여 미래 5년 추정\n"
+    summary += f"- 안전마진 {100 - safety_pct:.0f}%: 이론적 가치의 {safety_pct:.0f}%를 적정가로 산정\n\n"
 
     # 투자 포인트
     summary += f"🎯 매수 포인트:\n"
@@ -469,6 +247,73 @@ def generate_valuation_reason(result_data):
     return summary
 
 
+def get_statement_value(statement, row, date):
+    """재무제표 DataFrame에서 값 추출 (항목이 없으면 0)"""
+    return statement.loc[row, date] if row in statement.index else 0
+
+
+def extract_yearly_metrics(financials, balance_sheet, cashflow):
+    """
+    yfinance 재무제표 DataFrame에서 연도별 지표 추출 (buffett_scoring 정규화 레코드)
+
+    Returns:
+        MetricSeries: 오래된 연도부터, 유효한 연도만
+    """
+    rows = []
+
+    for date in financials.columns:
+        year = date.year
+
+        # 2021년 데이터는 자동 필터링 (불완전한 데이터)
+        if year == 2021:
+            continue
+
+        revenue = get_statement_value(financials, "Total Revenue", date)
+        net_income = get_statement_value(financials, "Net Income", date)
+        total_equity = get_statement_value(balance_sheet, "Stockholders Equity", date)
+        diluted_eps = get_statement_value(financials, "Diluted EPS", date)
+
+        # 데이터 유효성 검증
+        if (
+            net_income == 0
+            or pd.isna(net_income)
+            or total_equity == 0
+            or pd.isna(total_equity)
+            or revenue == 0
+            or pd.isna(revenue)
+            or pd.isna(diluted_eps)
+        ):
+            continue
+
+        # Interest Expense: NaN이면 0으로 처리
+        interest_expense = get_statement_value(financials, "Interest Expense", date)
+        if pd.isna(interest_expense):
+            interest_expense = 0
+
+        rows.append(
+            compute_year_metrics(
+                year,
+                revenue=revenue,
+                net_income=net_income,
+                ebit=get_statement_value(financials, "EBIT", date),
+                pretax_income=get_statement_value(financials, "Pretax Income", date),
+                tax_provision=get_statement_value(financials, "Tax Provision", date),
+                total_equity=total_equity,
+                total_liabilities=get_statement_value(
+                    balance_sheet, "Total Liabilities Net Minority Interest", date
+                ),
+                free_cash_flow=get_statement_value(cashflow, "Free Cash Flow", date),
+                eps=diluted_eps,
+                interest_expense=interest_expense,
+            )
+        )
+
+    # yfinance는 최신 연도부터 반환하므로 오래된 순으로 뒤집음
+    rows.reverse()
+
+    return MetricSeries.from_rows(rows)
+
+
 def evaluate_stock_silent(ticker):
     """
     종목을 조용히 평가 (출력 최소화)
@@ -488,302 +333,20 @@ def evaluate_stock_silent(ticker):
         if financials.empty or balance_sheet.empty or cashflow.empty:
             return None
 
-        years_available = len(financials.columns)
-        if years_available < 3:
+        if len(financials.columns) < 3:
             return None
 
         # ================================================================
-        # 데이터 추출
+        # 데이터 추출 + 점수/적정가 계산 (buffett_scoring 공용 규칙)
         # ================================================================
-        results = []
-
-        for date in financials.columns:
-            year = date.year
-
-            # 2021년 데이터는 자동 필터링 (불완전한 데이터)
-            if year == 2021:
-                continue
-
-            # 손익계산서
-            revenue = (
-                financials.loc["Total Revenue", date]
-                if "Total Revenue" in financials.index
-                else 0
-            )
-            net_income = (
-                financials.loc["Net Income", date]
-                if "Net Income" in financials.index
-                else 0
-            )
-            ebit = financials.loc["EBIT", date] if "EBIT" in financials.index else 0
-            pretax_income = (
-                financials.loc["Pretax Income", date]
-                if "Pretax Income" in financials.index
-                else 0
-            )
-            tax_provision = (
-                financials.loc["Tax Provision", date]
-                if "Tax Provision" in financials.index
-                else 0
-            )
-
-            # Interest Expense: NaN이면 0으로 처리
-            interest_expense = (
-                financials.loc["Interest Expense", date]
-                if "Interest Expense" in financials.index
-                else 0
-            )
-            if pd.isna(interest_expense):
-                interest_expense = 0
-
-            # 재무상태표
-            total_equity = (
-                balance_sheet.loc["Stockholders Equity", date]
-                if "Stockholders Equity" in balance_sheet.index
-                else 0
-            )
-            total_liabilities = (
-                balance_sheet.loc["Total Liabilities Net Minority Interest", date]
-                if "Total Liabilities Net Minority Interest" in balance_sheet.index
-                else 0
-            )
-
-            # 현금흐름표
-            free_cash_flow = (
-                cashflow.loc["Free Cash Flow", date]
-                if "Free Cash Flow" in cashflow.index
-                else 0
-            )
-
-            # EPS
-            diluted_eps = (
-                financials.loc["Diluted EPS", date]
-                if "Diluted EPS" in financials.index
-                else 0
-            )
-
-            # 세율
-            tax_rate = (
-                (tax_provision / pretax_income * 100) if pretax_income != 0 else 0
-            )
-
-            # 지표 계산
-            roe = calculate_roe(net_income, total_equity)
-            roic = calculate_roic(ebit, tax_rate, total_equity, total_liabilities)
-            net_margin = calculate_net_margin(net_income, revenue)
-            fcf_margin = calculate_fcf_margin(free_cash_flow, revenue)
-            debt_ratio = (
-                (total_liabilities / total_equity * 100) if total_equity != 0 else 0
-            )
-
-            # 이자보상배율: interest_expense가 0이면 무차입(무한대)
-            if interest_expense == 0:
-                interest_coverage = float("inf")  # 무차입 경영
-            else:
-                interest_coverage = ebit / abs(interest_expense)
-
-            results.append(
-                {
-                    "year": year,
-                    "revenue": revenue,
-                    "net_income": net_income,
-                    "ebit": ebit,
-                    "total_equity": total_equity,
-                    "total_liabilities": total_liabilities,
-                    "free_cash_flow": free_cash_flow,
-                    "eps": diluted_eps,
-                    "roe": roe,
-                    "roic": roic,
-                    "net_margin": net_margin,
-                    "fcf_margin": fcf_margin,
-                    "debt_ratio": debt_ratio,
-                    "interest_coverage": interest_coverage,
-                    "interest_expense": interest_expense,
-                }
-            )
-
-        results.reverse()
-
-        # 데이터 유효성 검증
-        valid_results = [
-            r
-            for r in results
-            if (
-                r["net_income"] != 0
-                and not pd.isna(r["net_income"])
-                and r["total_equity"] != 0
-                and not pd.isna(r["total_equity"])
-                and r["revenue"] != 0
-                and not pd.isna(r["revenue"])
-                and not pd.isna(r["eps"])
-            )
-        ]
-
-        if len(valid_results) < 3:
+        series = extract_yearly_metrics(financials, balance_sheet, cashflow)
+        score_data = score_series(series, YF_LIVE_POLICY)
+        if not score_data:
             return None
 
-        results = valid_results
-        years_available = len(results)
-
-        # ================================================================
-        # 점수 계산
-        # ================================================================
-
-        # [1] ROE 점수
-        count_15_plus = sum(1 for r in results if r["roe"] >= 15.0)
-        count_12_plus = sum(1 for r in results if r["roe"] >= 12.0)
-        has_loss = any(r["roe"] < 0 for r in results)
-
-        roe_score = 0
-        if has_loss:
-            roe_score = 0
-        elif count_15_plus == years_available:
-            roe_score = 25
-        elif count_15_plus >= years_available * 0.8:
-            roe_score = 20
-        elif count_12_plus == years_available:
-            roe_score = 15
-        elif count_12_plus >= years_available * 0.8:
-            roe_score = 10
-
-        # [2] ROIC 점수
-        count_12_plus_roic = sum(1 for r in results if r["roic"] >= 12.0)
-        count_9_plus_roic = sum(1 for r in results if r["roic"] >= 9.0)
-
-        roic_score = 0
-        if count_12_plus_roic == years_available:
-            roic_score = 20
-        elif count_12_plus_roic >= years_available * 0.8:
-            roic_score = 15
-        elif count_9_plus_roic == years_available:
-            roic_score = 10
-        elif count_9_plus_roic >= years_available * 0.8:
-            roic_score = 5
-
-        # [3] Net Margin 점수
-        margins = [r["net_margin"] for r in results]
-        avg_margin = sum(margins) / len(margins)
-        variance = sum((m - avg_margin) ** 2 for m in margins) / len(margins)
-        std_dev = math.sqrt(variance)
-
-        avg_score = 0
-        if avg_margin >= 20.0:
-            avg_score = 10
-        elif avg_margin >= 15.0:
-            avg_score = 7
-        elif avg_margin >= 10.0:
-            avg_score = 5
-
-        stability_score = 0
-        if std_dev <= 3.0:
-            stability_score = 5
-        elif std_dev <= 5.0:
-            stability_score = 3
-        elif std_dev <= 8.0:
-            stability_score = 1
-
-        margin_score = avg_score + stability_score
-
-        # [4] 추세 점수
-        trend_score = 0
-        if years_available >= 4:
-            recent_years = min(3, years_available - 1)
-            past_years = years_available - recent_years
-
-            recent_roe = sum(r["roe"] for r in results[-recent_years:]) / recent_years
-            past_roe = sum(r["roe"] for r in results[:past_years]) / past_years
-
-            improvement = (
-                ((recent_roe - past_roe) / past_roe * 100) if past_roe != 0 else 0
-            )
-
-            if improvement >= 20.0:
-                trend_score = 15
-            elif improvement >= 10.0:
-                trend_score = 12
-            elif improvement >= 5.0:
-                trend_score = 9
-            elif improvement >= 0.0:
-                trend_score = 6
-            elif improvement >= -5.0:
-                trend_score = 3
-
-        # [5] 재무 건전성 점수
-        latest = results[-1]
-
-        debt_score = 0
-        if latest["debt_ratio"] <= 50.0:
-            debt_score = 10
-        elif latest["debt_ratio"] <= 80.0:
-            debt_score = 7
-        elif latest["debt_ratio"] <= 120.0:
-            debt_score = 4
-        elif latest["debt_ratio"] <= 150.0:
-            debt_score = 2
-
-        # 이자보상배율 점수: NaN 체크 개선
-        coverage_score = 0
-        if latest["interest_expense"] == 0:
-            # 무차입 경영 = 최고 점수
-            coverage_score = 5
-        elif not pd.isna(latest["interest_coverage"]) and latest[
-            "interest_coverage"
-        ] != float("inf"):
-            if latest["interest_coverage"] >= 10.0:
-                coverage_score = 5
-            elif latest["interest_coverage"] >= 5.0:
-                coverage_score = 3
-            elif latest["interest_coverage"] >= 3.0:
-                coverage_score = 1
-
-        health_score = debt_score + coverage_score
-
-        # [6] 현금창출력 점수
-        fcf_margins = [r["fcf_margin"] for r in results]
-        avg_fcf_margin = sum(fcf_margins) / len(fcf_margins)
-
-        cash_score = 0
-        if avg_fcf_margin >= 15.0:
-            cash_score = 10
-        elif avg_fcf_margin >= 10.0:
-            cash_score = 7
-        elif avg_fcf_margin >= 5.0:
-            cash_score = 4
-        elif avg_fcf_margin >= 0.0:
-            cash_score = 2
-
-        # 총점
-        total_score = (
-            roe_score
-            + roic_score
-            + margin_score
-            + trend_score
-            + health_score
-            + cash_score
-        )
-
-        # ================================================================
-        # 적정가 계산
-        # ================================================================
-        eps_list = [r["eps"] for r in results]
-        oldest_eps = eps_list[0]
-        latest_eps = eps_list[-1]
-
-        eps_cagr = calculate_cagr(oldest_eps, latest_eps, years_available - 1)
-        conservative_growth = eps_cagr * 0.7
-        future_eps = latest_eps * math.pow(1 + conservative_growth / 100, 5)
-
-        if eps_cagr >= 15.0:
-            fair_per = 18.0
-        elif eps_cagr >= 8.0:
-            fair_per = 12.0
-        elif eps_cagr >= 0.0:
-            fair_per = 10.0
-        else:
-            fair_per = 8.0
-
-        theoretical_value = future_eps * fair_per
-        intrinsic_value = theoretical_value * 0.8
+        total_score = score_data["total_score"]
+        intrinsic_value = score_data["intrinsic_value"]
+        years_available = score_data["years_data"]
 
         current_price = info.get("currentPrice", 0)
 
@@ -793,10 +356,6 @@ def evaluate_stock_silent(ticker):
         else:
             gap_pct = 0
 
-        # 최근 연도 평균 지표들
-        avg_roe = sum(r["roe"] for r in results) / len(results)
-        avg_roic = sum(r["roic"] for r in results) / len(results)
-
         # 신뢰등급 계산
         grade_num, grade_text, grade_stars = get_trust_grade(years_available)
 
@@ -804,23 +363,23 @@ def evaluate_stock_silent(ticker):
         result_dict = {
             "ticker": ticker,
             "total_score": total_score,
-            "roe_score": roe_score,
-            "roic_score": roic_score,
-            "margin_score": margin_score,
-            "trend_score": trend_score,
-            "health_score": health_score,
-            "cash_score": cash_score,
-            "pass": "PASS" if total_score >= 85 else "FAIL",
+            "roe_score": score_data["roe_score"],
+            "roic_score": score_data["roic_score"],
+            "margin_score": score_data["margin_score"],
+            "trend_score": score_data["trend_score"],
+            "health_score": score_data["health_score"],
+            "cash_score": score_data["cash_score"],
+            "pass": "PASS" if total_score >= DEFAULT_SCORING.pass_score else "FAIL",
             "current_price": current_price,
             "intrinsic_value": intrinsic_value,
             "gap_pct": gap_pct,
             "recommendation": "BUY" if gap_pct > 0 else "WAIT",
-            "avg_roe": avg_roe,
-            "avg_roic": avg_roic,
-            "avg_net_margin": avg_margin,
-            "avg_fcf_margin": avg_fcf_margin,
-            "debt_ratio": latest["debt_ratio"],
-            "eps_cagr": eps_cagr,
+            "avg_roe": score_data["avg_roe"],
+            "avg_roic": score_data["avg_roic"],
+            "avg_net_margin": score_data["avg_net_margin"],
+            "avg_fcf_margin": score_data["avg_fcf_margin"],
+            "debt_ratio": score_data["debt_ratio"],
+            "eps_cagr": score_data["eps_cagr"],
             "years_data": years_available,
             "trust_grade": grade_num,
             "trust_grade_text": grade_text,
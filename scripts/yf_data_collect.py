@@ -9,6 +9,9 @@ yfinance 데이터 수집 스크립트
 실행 예시:
   python yf_data_collect.py --mode tickers     # 티커 목록 수집 (월별)
   python yf_data_collect.py --mode financials  # 재무제표 수집 (연별)
+  python yf_data_collect.py --mode financials --resume        # 중단된 수집 이어서
+  python yf_data_collect.py --mode financials --retry-failed  # 실패 종목만 재시도
+  python yf_data_collect.py --mode quarterly   # 분기 재무제표 수집 (TTM 평가용)
   python yf_data_collect.py --mode prices      # 현재가 수집 (일별)
   python yf_data_collect.py --mode test        # 테스트 (5종목)
 """
@@ -16,16 +19,29 @@ yfinance 데이터 수집 스크립트
 import os
 import sys
 import json
+import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import yfinance as yf
 from curl_cffi.requests import Session
 import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from storage_gateway import (
+    upload_bytes,
+    download_bytes,
+    list_folder,
+    content_hash,
+)
+from run_manifest import RunManifest, ManifestLoadError
+from ticker_universe import (
+    get_sp500_tickers, get_nasdaq100_tickers, NASDAQ100_GITHUB,
+    membership_diff, has_changes, print_membership_diff, latest_ticker_month,
+)
 import warnings
 
 warnings.filterwarnings("ignore")
@@ -58,9 +74,100 @@ BUCKET_NAME = "yf-raw-data"  # yfinance 전용 버킷
 session = Session(impersonate="chrome")
 session.verify = False
 
+# 현재가 동시 수집 설정
+DEFAULT_PRICE_WORKERS = 8      # 동시 작업 스레드 수
+DEFAULT_PRICE_RATE = 5.0       # Yahoo 요청 초당 허용량 (전체 스레드 공유)
+
+# Yahoo 일괄 시세 조회 (v7 quote, 요청 1회에 여러 종목)
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+DEFAULT_QUOTE_BATCH_SIZE = 100  # 요청당 종목 수 (0이면 일괄 조회 비활성화)
+
+# 일별 현재가 스냅샷 (전 종목을 JSON Lines 한 파일에 저장)
+PRICE_SNAPSHOT_FILE = "snapshot.jsonl"
+
+# 폴더별 내용 해시 인덱스 (변경 없는 파일은 업로드 생략)
+HASH_INDEX_FILE = "_hashes.json"
+
+# 재무제표 실행 기록 파일명 (financials/{year}/ 아래, --resume / --retry-failed용)
+RUN_MANIFEST_FILE = "_run.json"
+
+# 분기 재무제표 파일명 (financials/{year}/{ticker}/ 아래, 연간 data.json과 나란히 저장)
+QUARTERLY_FILE = "quarterly.json"
+
+# 분기 재무제표에서 저장할 항목 (평가에 쓰는 항목만, 연간 대비 4배 분량을 줄이기 위함)
+QUARTERLY_FIELDS = {
+    "financials": [
+        "Total Revenue", "Net Income", "EBIT", "Pretax Income",
+        "Tax Provision", "Interest Expense", "Diluted EPS",
+    ],
+    "balance_sheet": ["Stockholders Equity", "Total Liabilities Net Minority Interest"],
+    "cashflow": ["Free Cash Flow"],
+}
+
+# prices JSON 스키마에 필요한 필드만 요청
+QUOTE_FIELDS = [
+    "shortName", "longName", "regularMarketPrice", "marketCap",
+    "forwardPE", "trailingPE", "exchange", "currency",
+]
+
+# curl_cffi Session은 스레드 간 공유가 안전하지 않으므로 스레드별로 생성
+_thread_local = threading.local()
+
+
+def get_thread_session() -> Session:
+    """현재 스레드 전용 curl_cffi 세션 반환 (없으면 생성)"""
+    thread_session = getattr(_thread_local, "session", None)
+    if thread_session is None:
+        thread_session = Session(impersonate="chrome")
+        thread_session.verify = False
+        _thread_local.session = thread_session
+    return thread_session
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷 레이트 리미터
+    
+    초당 rate개의 토큰이 채워지고, 최대 capacity개까지 쌓입니다.
+    acquire()는 토큰이 생길 때까지 대기합니다.
+    
+    rate는 0보다 커야 하고 capacity는 1 이상이어야 합니다
+    (그렇지 않으면 0으로 나누거나 토큰이 영원히 모이지 않음).
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if not rate > 0:
+            raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        if not self.capacity >= 1:
+            raise ValueError(f"capacity는 1 이상이어야 합니다: {self.capacity}")
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 소비 (부족하면 채워질 때까지 대기)"""
+        if tokens > self.capacity:
+            raise ValueError(f"요청 토큰({tokens:g})이 버킷 크기({self.capacity:g})보다 큽니다")
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 # ============================================================================
-# 환경 변수 및 Supabase 클라이언트
+# 환경 변수
 # ============================================================================
 
 def validate_env():
@@ -83,89 +190,143 @@ def validate_env():
     print("✅ 환경 변수 확인 완료")
 
 
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트 생성"""
-    url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    return create_client(url, key)
-
-
 # ============================================================================
 # Storage 저장 함수
 # ============================================================================
 
-def save_to_storage(file_path: str, data: Any) -> bool:
+def save_bytes_to_storage(file_path: str, payload: bytes,
+                          content_type: str = "application/json") -> bool:
     """
-    Supabase Storage에 JSON 데이터 저장
+    Supabase Storage에 바이트 데이터 저장
     
     Args:
-        file_path: 저장 경로 (예: "prices/2026-01-30/AAPL.json")
-        data: 저장할 데이터
+        file_path: 저장 경로 (예: "prices/2026-01-30/snapshot.jsonl")
+        payload: 저장할 바이트
+        content_type: Content-Type 헤더
     
     Returns:
         성공 여부
     """
     try:
-        supabase = get_supabase_client()
-        json_data = json.dumps(data, ensure_ascii=False, indent=2, default=str)
-        
-        # 기존 파일 삭제 시도 (덮어쓰기용)
-        try:
-            supabase.storage.from_(BUCKET_NAME).remove([file_path])
-        except:
-            pass
-        
-        # 새 파일 업로드
-        result = supabase.storage.from_(BUCKET_NAME).upload(
-            file_path,
-            json_data.encode('utf-8'),
-            {"content-type": "application/json"}
-        )
-        
+        # 단일 upsert 업로드 (삭제 후 재업로드 시 생기는 공백 구간 없음)
+        upload_bytes(BUCKET_NAME, file_path, payload, content_type, upsert=True)
         return True
     except Exception as e:
         print(f"⚠️ Storage 저장 실패 ({file_path}): {e}")
         return False
 
 
+def save_to_storage(file_path: str, data: Any,
+                    hash_index: Optional["ContentHashIndex"] = None,
+                    compact: bool = False) -> bool:
+    """
+    Supabase Storage에 JSON 데이터 저장
+    
+    Args:
+        file_path: 저장 경로 (예: "prices/2026-01-30/AAPL.json")
+        data: 저장할 데이터
+        hash_index: 지정 시 내용이 이전과 같으면 업로드 생략
+        compact: True면 들여쓰기/공백 없이 저장
+    
+    Returns:
+        성공 여부 (업로드 생략도 성공)
+    """
+    digest = None
+    if hash_index is not None:
+        digest = content_hash(data)
+        if hash_index.is_unchanged(file_path, digest):
+            return True
+    
+    if compact:
+        json_data = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    else:
+        json_data = json.dumps(data, ensure_ascii=False, indent=2, default=str)
+    if not save_bytes_to_storage(file_path, json_data.encode('utf-8')):
+        return False
+    
+    if hash_index is not None:
+        hash_index.record(file_path, digest)
+    return True
+
+
+class ContentHashIndex:
+    """
+    폴더 단위 내용 해시 인덱스 ({prefix}/_hashes.json)
+    
+    실행 시작 시 한 번 읽고, 업로드한 파일의 해시를 기록한 뒤 종료 시 저장합니다.
+    수집 시각(collected_at)을 제외한 내용이 같으면 업로드를 생략합니다.
+    """
+    
+    def __init__(self, prefix: str, force: bool = False):
+        self.index_path = f"{prefix}/{HASH_INDEX_FILE}"
+        self.force = force
+        self.hashes: Dict[str, str] = {}
+        self.skipped = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def load(self) -> "ContentHashIndex":
+        """Storage에서 인덱스 로드 (없으면 빈 인덱스)"""
+        try:
+            self.hashes = json.loads(download_bytes(BUCKET_NAME, self.index_path).decode('utf-8'))
+        except Exception:
+            self.hashes = {}
+        return self
+    
+    def is_unchanged(self, file_path: str, digest: str) -> bool:
+        """이전 업로드와 내용이 같으면 True (생략 횟수 집계)"""
+        with self._lock:
+            if not self.force and self.hashes.get(file_path) == digest:
+                self.skipped += 1
+                return True
+            return False
+    
+    def record(self, file_path: str, digest: str):
+        """업로드 완료한 파일의 해시 기록"""
+        with self._lock:
+            self.hashes[file_path] = digest
+            self._dirty = True
+    
+    def save(self) -> bool:
+        """변경이 있을 때만 인덱스 저장"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = json.dumps(self.hashes, sort_keys=True, separators=(",", ":")).encode('utf-8')
+        return save_bytes_to_storage(self.index_path, payload)
+
+
 # ============================================================================
 # 티커 수집 함수
 # ============================================================================
 
-def get_sp500_tickers() -> List[str]:
-    """GitHub에서 S&P 500 티커 리스트 가져오기"""
-    try:
-        print("🔍 S&P 500 티커 리스트 가져오는 중...")
-        url = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/master/data/constituents.csv"
-        df = pd.read_csv(url)
-        tickers = df["Symbol"].tolist()
-        tickers = [str(t).strip().replace(".", "-") for t in tickers if pd.notna(t)]
-        print(f"✅ S&P 500: {len(tickers)}개 종목")
-        return tickers
-    except Exception as e:
-        print(f"❌ S&P 500 가져오기 실패: {e}")
-        return []
-
-
-def get_nasdaq100_tickers() -> List[str]:
-    """GitHub에서 나스닥 100 티커 리스트 가져오기"""
+def load_latest_ticker_lists() -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Storage에서 가장 최근 저장된 티커 목록 (구성 종목이 바뀐 달에만 폴더가 생김)
+    
+    Returns:
+        (월, all.json 내용) - 없으면 (None, {})
+    """
     try:
-        print("🔍 나스닥 100 티커 리스트 가져오는 중...")
-        url = "https://raw.githubusercontent.com/Gary-Strauss/NASDAQ100_Constituents/master/data/nasdaq100_constituents.csv"
-        df = pd.read_csv(url)
-        tickers = df["Ticker"].tolist()
-        tickers = [str(t).strip().replace(".", "-") for t in tickers if pd.notna(t)]
-        print(f"✅ 나스닥 100: {len(tickers)}개 종목")
-        return tickers
+        latest_month = latest_ticker_month(list_folder(BUCKET_NAME, "tickers"))
+        if latest_month is None:
+            return None, {}
+        data = download_bytes(BUCKET_NAME, f"tickers/{latest_month}/all.json")
+        return latest_month, json.loads(data.decode('utf-8'))
     except Exception as e:
-        print(f"❌ 나스닥 100 가져오기 실패: {e}")
-        return []
+        print(f"⚠️ 티커 목록 로드 실패: {e}")
+        return None, {}
 
 
 def collect_tickers() -> Dict[str, Any]:
-    """티커 목록 수집 및 저장"""
-    sp500 = get_sp500_tickers()
-    nasdaq100 = get_nasdaq100_tickers()
+    """
+    티커 목록 수집 및 저장
+    
+    구성 종목 원본은 ticker_universe(조건부 요청 캐시)로 가져오고,
+    가장 최근 저장된 목록과 비교해 바뀐 경우에만 tickers/{월}/all.json을 저장합니다.
+    """
+    sp500 = get_sp500_tickers() or []
+    nasdaq100 = get_nasdaq100_tickers(NASDAQ100_GITHUB, fallback=False) or []
     
     # 중복 제거
     all_tickers = list(set(sp500 + nasdaq100))
@@ -181,6 +342,24 @@ def collect_tickers() -> Dict[str, Any]:
         "all": all_tickers
     }
     
+    if not sp500 or not nasdaq100:
+        print("❌ 티커 목록을 가져오지 못해 저장하지 않습니다")
+        return result
+    
+    # 가장 최근 저장된 목록과 구성 종목 비교
+    latest_month, previous = load_latest_ticker_lists()
+    changed = latest_month is None
+    if latest_month:
+        print(f"\n🔎 구성 종목 변경분 (기준: tickers/{latest_month})")
+        for name in ("sp500", "nasdaq100"):
+            diff = membership_diff(previous.get(name), result[name])
+            print_membership_diff(name, diff)
+            changed = changed or has_changes(diff)
+    
+    if not changed:
+        print(f"✅ 구성 종목 변경 없음 - 저장 생략 (최신 목록: tickers/{latest_month})")
+        return result
+    
     # Storage에 저장
     year_month = datetime.now().strftime("%Y-%m")
     file_path = f"tickers/{year_month}/all.json"
@@ -242,119 +421,362 @@ def collect_financials_for_ticker(ticker: str, year: str) -> Optional[Dict]:
         return None
 
 
-def collect_financials(tickers: List[str], year: str):
-    """재무제표 일괄 수집 및 저장"""
-    print(f"\n📊 재무제표 수집 시작 ({len(tickers)}개 종목)")
+def collect_financials(tickers: List[str], year: str, force_upload: bool = False,
+                       resume: bool = False, retry_failed: bool = False):
+    """
+    재무제표 일괄 수집 및 저장
+    
+    financials/{year}/_hashes.json 인덱스와 비교하여
+    내용이 바뀌지 않은 종목은 업로드를 생략합니다 (force_upload=True면 전부 업로드).
+    진행 상태는 financials/{year}/_run.json에 기록되어
+    resume=True면 완료 종목을, retry_failed=True면 실패 종목 외 전부를 건너뜁니다.
+    """
+    manifest = RunManifest(BUCKET_NAME, f"financials/{year}/{RUN_MANIFEST_FILE}", ["data"])
+    if resume or retry_failed:
+        try:
+            manifest.load()
+        except ManifestLoadError as e:
+            # 빈 기록으로 진행하면 완료 종목을 다시 받고 기존 기록을 덮어씀
+            print(f"\n❌ {e}")
+            print("   실행 기록을 덮어쓰지 않도록 중단합니다. 원인을 해결한 뒤 다시 실행해주세요.")
+            sys.exit(1)
+    targets = manifest.select(tickers, resume=resume, retry_failed=retry_failed)
+    
+    print(f"\n📊 재무제표 수집 시작 ({len(targets)}개 종목)")
+    if resume or retry_failed:
+        print(f"   🔁 {'실패 종목 재시도' if retry_failed else '이어서 수집'}: "
+              f"전체 {len(tickers)}개 중 {len(targets)}개")
+    
+    hash_index = ContentHashIndex(f"financials/{year}", force=force_upload).load()
     
     success = 0
     failed = 0
     
-    for ticker in tqdm(tickers, desc="재무제표 수집", ncols=80, ascii=True, leave=True):
-        data = collect_financials_for_ticker(ticker, year)
-        
-        if data:
-            file_path = f"financials/{year}/{ticker}/data.json"
-            if save_to_storage(file_path, data):
+    try:
+        for ticker in tqdm(targets, desc="재무제표 수집", ncols=80, ascii=True, leave=True):
+            data = collect_financials_for_ticker(ticker, year)
+            
+            ok = bool(data) and save_to_storage(f"financials/{year}/{ticker}/data.json", data, hash_index)
+            manifest.mark(ticker, "data", ok, content_hash(data) if ok else None)
+            if ok:
                 success += 1
             else:
                 failed += 1
-        else:
-            failed += 1
+    finally:
+        hash_index.save()
+        manifest.save()
     
     print(f"\n✅ 재무제표 수집 완료: 성공 {success}개, 실패 {failed}개")
+    print(f"   변경 없음 (업로드 생략): {hash_index.skipped}개")
+    manifest.print_summary()
     return success, failed
 
 
-# ============================================================================
-# 현재가 수집 함수
-# ============================================================================
+def quarterly_frame_to_columns(df: pd.DataFrame, fields: List[str],
+                               periods: List[str]) -> Dict[str, List[Optional[float]]]:
+    """
+    분기 DataFrame → {항목: periods 순서의 값 목록} (열 지향 압축 형식)
+    
+    해당 분기 열이 없거나 값이 NaN이면 None
+    """
+    columns_by_period = {col.strftime("%Y-%m-%d"): col for col in df.columns}
+    result = {}
+    for field in fields:
+        if field not in df.index:
+            continue
+        values = []
+        for period in periods:
+            col = columns_by_period.get(period)
+            val = df.loc[field, col] if col is not None else None
+            values.append(float(val) if val is not None and pd.notna(val) else None)
+        result[field] = values
+    return result
 
-def collect_price_for_ticker(ticker: str) -> Optional[Dict]:
-    """단일 종목 현재가 수집"""
+
+def collect_quarterly_for_ticker(ticker: str) -> Optional[Dict]:
+    """
+    단일 종목 분기 재무제표 수집 (quarterly_financials / balance_sheet / cashflow)
+    
+    저장 형식 (평가에 쓰는 항목만, 분기 순서는 최신부터):
+        {"periods": ["2025-09-30", ...],
+         "financials": {"Total Revenue": [값, ...], ...}, "balance_sheet": {...}, "cashflow": {...}}
+    
+    Returns:
+        분기 재무제표 데이터 또는 None
+    """
     try:
         stock = yf.Ticker(ticker, session=session)
-        info = stock.info
         
-        current_price = info.get("currentPrice") or info.get("regularMarketPrice")
-        if not current_price:
+        frames = {
+            "financials": stock.quarterly_financials,
+            "balance_sheet": stock.quarterly_balance_sheet,
+            "cashflow": stock.quarterly_cashflow,
+        }
+        
+        if any(df.empty for df in frames.values()):
             return None
         
+        periods = sorted(
+            {col.strftime("%Y-%m-%d") for df in frames.values() for col in df.columns},
+            reverse=True,
+        )
+        
         data = {
             "ticker": ticker,
             "collected_at": datetime.now().isoformat(),
-            "company_name": info.get("shortName", info.get("longName", ticker)),
-            "current_price": current_price,
-            "market_cap": info.get("marketCap"),
-            "pe_ratio": info.get("forwardPE") or info.get("trailingPE"),
-            "exchange": info.get("exchange", "Unknown"),
-            "currency": info.get("currency", "USD")
+            "periods": periods,
         }
+        for name, df in frames.items():
+            data[name] = quarterly_frame_to_columns(df, QUARTERLY_FIELDS[name], periods)
         
         return data
     except Exception as e:
         return None
 
 
-def collect_prices(tickers: List[str], date: str):
-    """현재가 일괄 수집 및 저장"""
-    print(f"\n💰 현재가 수집 시작 ({len(tickers)}개 종목)")
+def collect_quarterly_financials(tickers: List[str], year: str, force_upload: bool = False):
+    """
+    분기 재무제표 일괄 수집 및 저장 (financials/{year}/{ticker}/quarterly.json)
+    
+    연간 재무제표와 같은 financials/{year}/_hashes.json 인덱스를 사용하여
+    새 분기가 없어 내용이 같은 종목은 업로드를 생략합니다.
+    """
+    print(f"\n📊 분기 재무제표 수집 시작 ({len(tickers)}개 종목)")
+    
+    hash_index = ContentHashIndex(f"financials/{year}", force=force_upload).load()
     
     success = 0
     failed = 0
     
-    for ticker in tqdm(tickers, desc="현재가 수집", ncols=80, ascii=True, leave=True):
-        data = collect_price_for_ticker(ticker)
+    for ticker in tqdm(tickers, desc="분기 재무제표 수집", ncols=80, ascii=True, leave=True):
+        data = collect_quarterly_for_ticker(ticker)
         
         if data:
-            file_path = f"prices/{date}/{ticker}.json"
-            if save_to_storage(file_path, data):
+            file_path = f"financials/{year}/{ticker}/{QUARTERLY_FILE}"
+            if save_to_storage(file_path, data, hash_index, compact=True):
                 success += 1
             else:
                 failed += 1
         else:
             failed += 1
     
-    print(f"\n✅ 현재가 수집 완료: 성공 {success}개, 실패 {failed}개")
+    hash_index.save()
+    
+    print(f"\n✅ 분기 재무제표 수집 완료: 성공 {success}개, 실패 {failed}개")
+    print(f"   변경 없음 (업로드 생략): {hash_index.skipped}개")
     return success, failed
 
 
 # ============================================================================
-# 티커 목록 로드
+# 현재가 수집 함수
 # ============================================================================
 
-def load_tickers_from_storage() -> List[str]:
-    """Storage에서 가장 최근 티커 목록 로드"""
+def build_price_record(ticker: str, info: Dict) -> Optional[Dict]:
+    """
+    yfinance info 또는 v7 quote 응답을 prices JSON 스키마로 변환
+    
+    Returns:
+        현재가 데이터 또는 None (현재가 없음)
+    """
+    current_price = info.get("currentPrice") or info.get("regularMarketPrice")
+    if not current_price:
+        return None
+    
+    return {
+        "ticker": ticker,
+        "collected_at": datetime.now().isoformat(),
+        "company_name": info.get("shortName", info.get("longName", ticker)),
+        "current_price": current_price,
+        "market_cap": info.get("marketCap"),
+        "pe_ratio": info.get("forwardPE") or info.get("trailingPE"),
+        "exchange": info.get("exchange", "Unknown"),
+        "currency": info.get("currency", "USD")
+    }
+
+
+def collect_price_for_ticker(ticker: str) -> Optional[Dict]:
+    """단일 종목 현재가 수집"""
     try:
-        supabase = get_supabase_client()
-        
-        # tickers 폴더의 월별 폴더 목록
-        result = supabase.storage.from_(BUCKET_NAME).list("tickers")
-        if not result:
-            return []
-        
-        # 가장 최근 월 찾기
-        months = [item["name"] for item in result if item.get("id") is None]
-        if not months:
-            return []
-        
-        months.sort(reverse=True)
-        latest_month = months[0]
+        stock = yf.Ticker(ticker, session=get_thread_session())
+        return build_price_record(ticker, stock.info)
+    except Exception as e:
+        return None
+
+
+_yahoo_crumb: Optional[str] = None
+
+
+def get_yahoo_crumb() -> Optional[str]:
+    """v7 quote API용 crumb 조회 (쿠키 발급 후 1회만 요청)"""
+    global _yahoo_crumb
+    if _yahoo_crumb:
+        return _yahoo_crumb
+    
+    try:
+        # 쿠키 발급용 요청 (응답 코드는 무시)
+        try:
+            session.get(YAHOO_COOKIE_URL, timeout=10)
+        except Exception:
+            pass
         
-        # all.json 읽기
-        file_path = f"tickers/{latest_month}/all.json"
-        data = supabase.storage.from_(BUCKET_NAME).download(file_path)
-        ticker_data = json.loads(data.decode('utf-8'))
+        response = session.get(YAHOO_CRUMB_URL, timeout=10)
+        crumb = response.text.strip()
+        if response.status_code == 200 and crumb and "<" not in crumb:
+            _yahoo_crumb = crumb
+    except Exception as e:
+        print(f"⚠️ Yahoo crumb 조회 실패: {e}")
+    
+    return _yahoo_crumb
+
+
+def fetch_quote_batch(symbols: List[str]) -> Dict[str, Dict]:
+    """
+    여러 종목 시세를 v7 quote API 한 번으로 조회
+    
+    Returns:
+        {ticker: 현재가 데이터} (응답에 없는 종목은 제외)
+    """
+    crumb = get_yahoo_crumb()
+    if not crumb:
+        return {}
+    
+    try:
+        response = session.get(
+            YAHOO_QUOTE_URL,
+            params={
+                "symbols": ",".join(symbols),
+                "fields": ",".join(QUOTE_FIELDS),
+                "crumb": crumb,
+            },
+            timeout=30
+        )
+        if response.status_code != 200:
+            return {}
         
-        return ticker_data.get("all", [])
+        quotes = response.json().get("quoteResponse", {}).get("result") or []
     except Exception as e:
-        print(f"⚠️ 티커 목록 로드 실패: {e}")
-        return []
+        return {}
+    
+    records = {}
+    for quote in quotes:
+        ticker = quote.get("symbol")
+        record = build_price_record(ticker, quote) if ticker else None
+        if record:
+            records[ticker] = record
+    
+    return records
+
+
+def fetch_quotes(tickers: List[str], batch_size: int, limiter: TokenBucket) -> Dict[str, Dict]:
+    """전체 종목을 batch_size 단위로 나눠 일괄 조회"""
+    quotes = {}
+    if batch_size <= 0:
+        return quotes
+    
+    chunks = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+    for chunk in tqdm(chunks, desc="일괄 시세 조회", ncols=80, ascii=True, leave=True):
+        limiter.acquire()
+        quotes.update(fetch_quote_batch(chunk))
+    
+    return quotes
+
+
+def build_price_snapshot(records: List[Dict]) -> bytes:
+    """현재가 데이터 목록을 JSON Lines(종목당 한 줄, 티커순)로 직렬화"""
+    lines = [
+        json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        for record in sorted(records, key=lambda r: r["ticker"])
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def collect_prices(tickers: List[str], date: str,
+                   workers: int = DEFAULT_PRICE_WORKERS,
+                   rate: float = DEFAULT_PRICE_RATE,
+                   batch_size: int = DEFAULT_QUOTE_BATCH_SIZE,
+                   per_ticker: bool = False):
+    """
+    현재가 일괄 수집 및 저장 (동시 실행)
+    
+    1. v7 quote API로 batch_size개씩 일괄 조회
+    2. 일괄 응답에 없는 종목만 종목별 .info로 재조회
+    3. 전 종목을 prices/{date}/snapshot.jsonl 한 파일로 저장
+       (per_ticker=True면 호환용 prices/{date}/{ticker}.json도 저장)
+    
+    workers개의 스레드가 Yahoo 조회와 Storage 업로드를 겹쳐서 처리합니다.
+    Yahoo 요청은 모든 스레드가 공유하는 토큰 버킷(rate/초)으로 제한됩니다.
+    """
+    workers = max(1, workers)
+    print(f"\n💰 현재가 수집 시작 ({len(tickers)}개 종목, 동시 {workers}개, 초당 {rate:g}회)")
+    
+    limiter = TokenBucket(rate)
+    
+    quotes = fetch_quotes(tickers, batch_size, limiter)
+    if batch_size > 0:
+        print(f"   일괄 조회: {len(quotes)}개, 개별 조회 필요: {len(tickers) - len(quotes)}개")
+    
+    def collect_and_save(ticker: str) -> Optional[Dict]:
+        data = quotes.get(ticker)
+        if not data:
+            limiter.acquire()
+            data = collect_price_for_ticker(ticker)
+        if not data:
+            return None
+        if per_ticker and not save_to_storage(f"prices/{date}/{ticker}.json", data):
+            return None
+        return data
+    
+    records = []
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(collect_and_save, ticker) for ticker in tickers]
+        
+        for future in tqdm(as_completed(futures), total=len(futures),
+                           desc="현재가 수집", ncols=80, ascii=True, leave=True):
+            data = future.result()
+            if data:
+                records.append(data)
+    
+    success = len(records)
+    failed = len(tickers) - success
+    
+    if records:
+        snapshot_path = f"prices/{date}/{PRICE_SNAPSHOT_FILE}"
+        if save_bytes_to_storage(snapshot_path, build_price_snapshot(records),
+                                 "application/x-ndjson"):
+            print(f"\n✅ 현재가 스냅샷 저장 완료: {snapshot_path}")
+        else:
+            success, failed = 0, len(tickers)
+    
+    print(f"\n✅ 현재가 수집 완료: 성공 {success}개, 실패 {failed}개")
+    return success, failed
+
+
+# ============================================================================
+# 티커 목록 로드
+# ============================================================================
+
+def load_tickers_from_storage() -> List[str]:
+    """Storage에서 가장 최근 티커 목록 로드"""
+    _, ticker_data = load_latest_ticker_lists()
+    return ticker_data.get("all", [])
 
 
 # ============================================================================
 # 메인 실행
 # ============================================================================
 
+def positive_float(value: str) -> float:
+    """argparse type: 0보다 큰 실수"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"숫자가 아닙니다: {value}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"0보다 커야 합니다: {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="yfinance 데이터 수집 스크립트",
@@ -363,6 +785,8 @@ def main():
 실행 예시:
   python yf_data_collect.py --mode tickers     # 티커 목록 (월별)
   python yf_data_collect.py --mode financials  # 재무제표 (연별)
+  python yf_data_collect.py --mode financials --resume  # 중단된 재무제표 수집 이어서
+  python yf_data_collect.py --mode quarterly   # 분기 재무제표 (TTM 평가용)
   python yf_data_collect.py --mode prices      # 현재가 (일별)
   python yf_data_collect.py --mode test        # 테스트
         """
@@ -372,7 +796,7 @@ def main():
         "--mode",
         type=str,
         default="test",
-        choices=["tickers", "financials", "prices", "test", "full"],
+        choices=["tickers", "financials", "quarterly", "prices", "test", "full"],
         help="실행 모드"
     )
     
@@ -390,6 +814,51 @@ def main():
         help="재무제표 데이터 연도 (YYYY)"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_PRICE_WORKERS,
+        help=f"현재가 동시 수집 스레드 수 (기본값: {DEFAULT_PRICE_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--rate",
+        type=positive_float,
+        default=DEFAULT_PRICE_RATE,
+        help=f"Yahoo 초당 요청 한도 (기본값: {DEFAULT_PRICE_RATE:g})"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_QUOTE_BATCH_SIZE,
+        help=f"일괄 시세 조회 시 요청당 종목 수, 0이면 종목별 조회 (기본값: {DEFAULT_QUOTE_BATCH_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--force-upload",
+        action="store_true",
+        help="내용 해시가 같아도 재무제표(연간/분기)를 다시 업로드"
+    )
+    
+    parser.add_argument(
+        "--per-ticker-prices",
+        action="store_true",
+        help="호환용 종목별 현재가 파일(prices/{date}/{ticker}.json)도 저장"
+    )
+    
+    run_group = parser.add_mutually_exclusive_group()
+    run_group.add_argument(
+        "--resume",
+        action="store_true",
+        help="financials 모드: 실행 기록(financials/{year}/_run.json)상 완료된 종목은 건너뛰고 이어서 수집"
+    )
+    run_group.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="financials 모드: 실행 기록상 실패한 종목만 다시 수집"
+    )
+    
     args = parser.parse_args()
     
     print("\n" + "=" * 70)
@@ -413,7 +882,15 @@ def main():
         if not tickers:
             print("❌ 티커 목록이 없습니다. 먼저 --mode tickers를 실행하세요.")
             return
-        collect_financials(tickers, args.year)
+        collect_financials(tickers, args.year, args.force_upload, args.resume, args.retry_failed)
+        
+    elif args.mode == "quarterly":
+        # 분기 재무제표 수집
+        tickers = load_tickers_from_storage()
+        if not tickers:
+            print("❌ 티커 목록이 없습니다. 먼저 --mode tickers를 실행하세요.")
+            return
+        collect_quarterly_financials(tickers, args.year, args.force_upload)
         
     elif args.mode == "prices":
         # 현재가 수집
@@ -421,7 +898,8 @@ def main():
         if not tickers:
             print("❌ 티커 목록이 없습니다. 먼저 --mode tickers를 실행하세요.")
             return
-        collect_prices(tickers, args.date)
+        collect_prices(tickers, args.date, args.workers, args.rate, args.batch_size,
+                       args.per_ticker_prices)
         
     elif args.mode == "test":
         # 테스트 모드 (5종목)
@@ -442,10 +920,11 @@ def main():
         save_to_storage(f"tickers/{year_month}/all.json", test_data)
         
         # 재무제표 수집
-        collect_financials(test_tickers, args.year)
+        collect_financials(test_tickers, args.year, args.force_upload)
         
         # 현재가 수집
-        collect_prices(test_tickers, args.date)
+        collect_prices(test_tickers, args.date, args.workers, args.rate, args.batch_size,
+                       args.per_ticker_prices)
         
     elif args.mode == "full":
         # 전체 실행 (티커 + 재무제표 + 현재가)
@@ -460,10 +939,11 @@ def main():
             return
         
         # 2. 재무제표 수집
-        collect_financials(tickers, args.year)
+        collect_financials(tickers, args.year, args.force_upload)
         
         # 3. 현재가 수집
-        collect_prices(tickers, args.date)
+        collect_prices(tickers, args.date, args.workers, args.rate, args.batch_size,
+                       args.per_ticker_prices)
     
     print("\n" + "=" * 70)
     print("✅ 데이터 수집 완료!")
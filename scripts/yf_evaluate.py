@@ -12,23 +12,49 @@ yfinance 버핏 평가 스크립트
 - 2년: 2점 (★★☆☆☆)
 - 1년 이하: 1점 (★☆☆☆☆)
 
+평가 기준 (--basis):
+- annual: 연간 재무제표 (기본값)
+- ttm: 최근 4개 분기 합산(TTM)을 가장 최근 연도로 사용 (yf_data_collect.py --mode quarterly 필요)
+
 실행 예시:
   python yf_evaluate.py --mode test --date 2026-01-30
   python yf_evaluate.py --mode full --date 2026-01-30
+  python yf_evaluate.py --mode full --date 2026-01-30 --basis ttm
 """
 
 import os
 import sys
 import json
-import math
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 
-import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from storage_gateway import (
+    content_hash,
+    download_bytes,
+    is_not_found_error,
+    upload_bytes,
+    list_folder,
+    list_folder_all,
+    configure_storage,
+    is_local_storage,
+)
+from storage_cache import StorageDiskCache, DEFAULT_CACHE_MAX_MB
+from buffett_scoring import (
+    compute_year_metrics,
+    fair_per_tier,
+    MetricSeries,
+    score_series,
+    ScoringConfig,
+    ScoringPolicy,
+    YF_POLICY,
+    DEFAULT_SCORING,
+)
 import warnings
 
 warnings.filterwarnings("ignore")
@@ -55,13 +81,53 @@ else:
 
 BUCKET_NAME = "yf-raw-data"
 
+# 일별 현재가 스냅샷 파일명 (yf_data_collect.py와 동일)
+PRICE_SNAPSHOT_FILE = "snapshot.jsonl"
+
+# 폴더별 내용 해시 인덱스 파일명 (yf_data_collect.py와 동일)
+HASH_INDEX_FILE = "_hashes.json"
+
+# 분기 재무제표 파일명 (yf_data_collect.py와 동일)
+QUARTERLY_FILE = "quarterly.json"
+
+# 평가 기준: 연간 재무제표 / 최근 4개 분기 합산(TTM)
+BASIS_ANNUAL = "annual"
+BASIS_TTM = "ttm"
+
+# TTM 4개 분기의 첫 분기말~마지막 분기말 최대 간격 (일, 연속 분기 확인용)
+TTM_MAX_SPAN_DAYS = 300
+
+# 펀더멘털 파생 캐시 파일명 (financials/{year}/ 아래, 평가 기준별)
+DERIVED_CACHE_FILES = {
+    BASIS_ANNUAL: "_derived.json",
+    BASIS_TTM: "_derived_ttm.json",
+}
+
+# 스냅샷이 없는 날짜의 종목별 현재가 파일 동시 다운로드 스레드 수
+PRICE_PREFETCH_WORKERS = 16
+
+# 파생 캐시 형식 버전 (캐시 형식이나 점수 코드가 바뀌면 올려서 기존 캐시를 무효화,
+# 기준값/정책 변경은 scoring_fingerprint로 자동 무효화)
+DERIVED_CACHE_VERSION = 1
+
 
 # ============================================================================
-# 환경 변수 및 Supabase 클라이언트
+# 환경 변수
 # ============================================================================
 
-def validate_env():
-    """환경 변수 검증"""
+def validate_env(require_database: bool = False):
+    """
+    환경 변수 검증
+
+    로컬 Storage 미러 사용 시 Storage용 Supabase 확인은 생략하지만,
+    require_database(DB 테이블 저장, *_result.py)면 Supabase 접속 정보는 항상 확인합니다.
+    """
+    if is_local_storage():
+        if not require_database:
+            print("✅ 로컬 Storage 미러 사용 (Supabase 환경 변수 확인 생략)")
+            return
+        print("✅ 로컬 Storage 미러 사용 (DB 저장용 Supabase 환경 변수만 확인)")
+
     supabase_url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
     service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     
@@ -79,82 +145,223 @@ def validate_env():
     print("✅ 환경 변수 확인 완료")
 
 
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트 생성"""
-    url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    return create_client(url, key)
-
-
 # ============================================================================
 # Storage 읽기 함수
 # ============================================================================
 
-def read_from_storage(file_path: str) -> Optional[Any]:
+# 로컬 디스크 캐시 (--cache-dir 지정 시 활성화)
+_disk_cache: Optional[StorageDiskCache] = None
+
+
+def configure_cache(cache_dir: Optional[str], max_mb: int = DEFAULT_CACHE_MAX_MB) -> Optional[StorageDiskCache]:
+    """Storage 읽기 디스크 캐시 설정 (cache_dir가 없으면 비활성화)"""
+    global _disk_cache
+    _disk_cache = StorageDiskCache(cache_dir, max_mb) if cache_dir else None
+    return _disk_cache
+
+
+def print_cache_stats():
+    """디스크 캐시 사용 시 적중/실패 통계 출력"""
+    if _disk_cache is not None:
+        _disk_cache.print_stats()
+
+
+def fetch_bytes_from_storage(file_path: str, version: Optional[str] = None) -> bytes:
+    """
+    Supabase Storage에서 원본 바이트 읽기 (에러는 그대로 발생)
+    
+    디스크 캐시가 설정되어 있으면 캐시를 거칩니다.
+    version(내용 해시)이 캐시와 같으면 네트워크 요청을 생략합니다.
+    """
+    if _disk_cache is not None:
+        return _disk_cache.read(BUCKET_NAME, file_path, version)
+    return download_bytes(BUCKET_NAME, file_path)
+
+
+def read_bytes_from_storage(file_path: str, version: Optional[str] = None) -> Optional[bytes]:
+    """Supabase Storage에서 원본 바이트 읽기 (없거나 실패하면 None)"""
+    try:
+        return fetch_bytes_from_storage(file_path, version)
+    except Exception as e:
+        return None
+
+
+def read_from_storage(file_path: str, version: Optional[str] = None) -> Optional[Any]:
     """Supabase Storage에서 JSON 데이터 읽기"""
+    data = read_bytes_from_storage(file_path, version)
+    if data is None:
+        return None
     try:
-        supabase = get_supabase_client()
-        data = supabase.storage.from_(BUCKET_NAME).download(file_path)
         return json.loads(data.decode('utf-8'))
     except Exception as e:
         return None
 
 
+# 날짜별 현재가 인덱스 캐시
+# ({date: {ticker: row}} = 스냅샷 또는 종목별 파일 프리페치 결과, None = 스냅샷 없음)
+# 일시적 오류로 읽지 못한 날짜는 캐시하지 않음 (다음 호출에서 다시 시도)
+_price_snapshots: Dict[str, Optional[Dict[str, Dict]]] = {}
+_price_snapshots_lock = threading.Lock()
+
+
+def parse_price_snapshot(payload: bytes) -> Dict[str, Dict]:
+    """JSON Lines 스냅샷을 {ticker: row} 인덱스로 변환"""
+    index = {}
+    for line in payload.decode('utf-8').splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        ticker = row.get("ticker")
+        if ticker:
+            index[ticker] = row
+    return index
+
+
+def load_price_snapshot(date: str) -> Optional[Dict[str, Dict]]:
+    """
+    prices/{date}/snapshot.jsonl을 한 번에 읽어 {ticker: row} 인덱스 반환
+    
+    날짜별로 한 번만 다운로드하며, 스냅샷이 없으면 None
+    (종목별 prices/{date}/{ticker}.json 레이아웃 사용)
+    
+    스냅샷 없음/파싱 실패(같은 파일이면 결과가 같음)는 캐시하고,
+    연결 실패 같은 일시적 오류는 캐시하지 않고 None을 반환합니다.
+    """
+    with _price_snapshots_lock:
+        if date in _price_snapshots:
+            return _price_snapshots[date]
+        
+        try:
+            payload = fetch_bytes_from_storage(f"prices/{date}/{PRICE_SNAPSHOT_FILE}")
+        except Exception as e:
+            if not is_not_found_error(e):
+                print(f"⚠️ 현재가 스냅샷 읽기 실패 ({date}), 다음 호출에서 재시도: {e}")
+                return None
+            payload = None
+        
+        index = None
+        if payload is not None:
+            try:
+                index = parse_price_snapshot(payload)
+            except Exception as e:
+                print(f"⚠️ 현재가 스냅샷 파싱 실패 ({date}): {e}")
+        
+        _price_snapshots[date] = index
+        return index
+
+
+# 연도별 재무제표 내용 해시 인덱스 캐시 ({year: {path: hash}})
+_financial_versions: Dict[str, Dict[str, str]] = {}
+_financial_versions_lock = threading.Lock()
+
+
+def load_financial_hashes(year: str) -> Dict[str, str]:
+    """
+    financials/{year}/_hashes.json 로드 (연도별 1회)
+    
+    수집 스크립트가 기록한 재무제표 내용 해시 ({path: hash}), 없으면 빈 dict
+    """
+    with _financial_versions_lock:
+        if year not in _financial_versions:
+            try:
+                payload = download_bytes(BUCKET_NAME, f"financials/{year}/{HASH_INDEX_FILE}")
+                _financial_versions[year] = json.loads(payload.decode('utf-8'))
+            except Exception:
+                _financial_versions[year] = {}
+        return _financial_versions[year]
+
+
+def get_financial_versions(year: str) -> Dict[str, str]:
+    """
+    디스크 캐시 항목의 버전 비교용 내용 해시 (디스크 캐시 사용 시에만 로드)
+    """
+    if _disk_cache is None:
+        return {}
+    return load_financial_hashes(year)
+
+
 def get_financial_data(ticker: str, year: str) -> Optional[Dict]:
     """재무제표 데이터 읽기"""
-    return read_from_storage(f"financials/{year}/{ticker}/data.json")
+    file_path = f"financials/{year}/{ticker}/data.json"
+    return read_from_storage(file_path, get_financial_versions(year).get(file_path))
+
+
+def get_quarterly_data(ticker: str, year: str) -> Optional[Dict]:
+    """분기 재무제표 데이터 읽기 (yf_data_collect.py --mode quarterly 결과)"""
+    file_path = f"financials/{year}/{ticker}/{QUARTERLY_FILE}"
+    return read_from_storage(file_path, get_financial_versions(year).get(file_path))
 
 
 def get_price_data(ticker: str, date: str) -> Optional[Dict]:
-    """현재가 데이터 읽기"""
+    """현재가 데이터 읽기 (스냅샷 우선, 없으면 종목별 파일)"""
+    snapshot = load_price_snapshot(date)
+    if snapshot is not None:
+        return snapshot.get(ticker)
     return read_from_storage(f"prices/{date}/{ticker}.json")
 
 
-def list_tickers_from_prices(date: str) -> List[str]:
-    """prices 폴더에서 티커 목록 추출 (페이지네이션 지원)"""
+def prefetch_price_files(date: str, tickers: List[str],
+                         workers: int = PRICE_PREFETCH_WORKERS) -> Dict[str, Dict]:
+    """
+    종목별 prices/{date}/{ticker}.json을 동시에 내려받아 날짜별 현재가 인덱스로 등록
+
+    각 파일은 받은 스레드에서 바로 파싱하며, 이후 get_price_data는 이 인덱스에서
+    바로 반환하므로 평가 루프가 단건 다운로드를 기다리지 않습니다.
+    (읽기 실패한 종목은 인덱스에 없음 = 현재가 없음)
+
+    Returns:
+        {ticker: row} 인덱스
+    """
+    def fetch(ticker: str):
+        return ticker, read_from_storage(f"prices/{date}/{ticker}.json")
+
+    index = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for ticker, row in tqdm(executor.map(fetch, tickers), total=len(tickers), desc="현재가 프리페치",
+                                ncols=80, ascii=True, leave=True):
+            if row is not None:
+                index[ticker] = row
+
+    with _price_snapshots_lock:
+        _price_snapshots[date] = index
+    return index
+
+
+def list_tickers_from_prices(date: str, prefetch: bool = True) -> List[str]:
+    """
+    prices 폴더에서 티커 목록 추출 (스냅샷 우선, 없으면 전체 목록 조회)
+
+    스냅샷이 없는 날짜는 prefetch=True면 종목별 현재가 파일을 미리 모두 내려받습니다.
+    """
+    snapshot = load_price_snapshot(date)
+    if snapshot is not None:
+        return sorted(snapshot.keys())
+    
     try:
-        supabase = get_supabase_client()
-        all_files = []
-        offset = 0
-        limit = 1000  # 한 번에 최대 1000개
-        
-        # 페이지네이션으로 전체 파일 목록 가져오기
-        while True:
-            result = supabase.storage.from_(BUCKET_NAME).list(
-                f"prices/{date}",
-                {"limit": limit, "offset": offset}
-            )
-            
-            if not result or len(result) == 0:
-                break
-            
-            all_files.extend(result)
-            
-            # 더 이상 데이터가 없으면 종료
-            if len(result) < limit:
-                break
-            
-            offset += limit
-        
-        # .json 파일에서 티커 추출
-        tickers = []
-        for item in all_files:
-            name = item.get("name", "")
-            if name.endswith(".json"):
-                ticker = name.replace(".json", "")
-                tickers.append(ticker)
-        
-        return sorted(tickers)
+        all_files = list_folder_all(BUCKET_NAME, f"prices/{date}")
     except Exception as e:
         print(f"⚠️ 티커 목록 조회 실패: {e}")
         return []
+    
+    # .json 파일에서 티커 추출
+    tickers = []
+    for item in all_files:
+        name = item.get("name", "")
+        if name.endswith(".json"):
+            ticker = name.replace(".json", "")
+            tickers.append(ticker)
+    tickers.sort()
+    
+    if prefetch and tickers:
+        prefetch_price_files(date, tickers)
+    
+    return tickers
 
 
 def find_latest_financial_year() -> Optional[str]:
     """financials 폴더에서 가장 최근 연도 탐색"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.storage.from_(BUCKET_NAME).list("financials")
+        result = list_folder(BUCKET_NAME, "financials")
         
         if not result:
             return None
@@ -175,55 +382,6 @@ def find_latest_financial_year() -> Optional[str]:
         return None
 
 
-# ============================================================================
-# 계산 함수
-# ============================================================================
-
-def calculate_roe(net_income: float, total_equity: float) -> float:
-    """ROE 계산"""
-    if total_equity == 0 or pd.isna(total_equity):
-        return 0.0
-    return (net_income / total_equity) * 100
-
-
-def calculate_roic(ebit: float, tax_rate: float, total_equity: float, total_liabilities: float) -> float:
-    """ROIC 계산"""
-    if pd.isna(ebit) or pd.isna(tax_rate):
-        return 0.0
-    
-    nopat = ebit * (1 - tax_rate / 100)
-    invested_capital = total_equity + total_liabilities
-    
-    if invested_capital == 0:
-        return 0.0
-    
-    return (nopat / invested_capital) * 100
-
-
-def calculate_net_margin(net_income: float, revenue: float) -> float:
-    """Net Margin 계산"""
-    if revenue == 0 or pd.isna(revenue):
-        return 0.0
-    return (net_income / revenue) * 100
-
-
-def calculate_fcf_margin(free_cash_flow: float, revenue: float) -> float:
-    """FCF Margin 계산"""
-    if revenue == 0 or pd.isna(revenue):
-        return 0.0
-    return (free_cash_flow / revenue) * 100
-
-
-def calculate_cagr(start_value: float, end_value: float, years: int) -> float:
-    """CAGR 계산"""
-    if start_value <= 0 or pd.isna(start_value) or pd.isna(end_value) or years <= 0:
-        return 0.0
-    
-    ratio = end_value / start_value
-    cagr = (math.pow(ratio, 1.0 / years) - 1) * 100
-    return max(cagr, 0.0)
-
-
 # ============================================================================
 # 신뢰등급 (수정된 기준)
 # ============================================================================
@@ -267,7 +425,7 @@ def generate_pass_reason(result_data: Dict) -> Optional[str]:
     # 점수와 상관없이 모든 종목에 대해 상세 정보 생성
     data = {
         "summary": f"총점 {result_data['total_score']:.0f}점 ({result_data['years_data']}년 데이터 기준)",
-        "passed": result_data["total_score"] >= 85,
+        "passed": result_data["total_score"] >= DEFAULT_SCORING.pass_score,
         "scores": {
             "roe": result_data.get("roe_score", 0),
             "roic": result_data.get("roic_score", 0),
@@ -301,32 +459,28 @@ def generate_pass_reason(result_data: Dict) -> Optional[str]:
     return json.dumps(data, ensure_ascii=False)
 
 
+# fair_per_tier 구간별 라벨 (고성장/중성장/0 이상/음수)
+PER_TIER_LABELS = ("고성장", "중성장", "안정", "보수적")
+
+
 def generate_valuation_reason(result_data: Dict) -> Optional[str]:
     """
     적정가 분석 상세 정보 생성 (JSON 형태)
     
     프론트엔드에서 파싱하여 저평가 분석 표시
+    적용 PER은 점수 계산과 같은 기준값(DEFAULT_SCORING)에서 가져옵니다.
     """
     eps_cagr = result_data.get("eps_cagr", 0)
     
-    # 적용 PER 결정
-    if eps_cagr >= 15.0:
-        applied_per = 18
-        per_label = "고성장"
-    elif eps_cagr >= 8.0:
-        applied_per = 12
-        per_label = "중성장"
-    elif eps_cagr >= 0.0:
-        applied_per = 10
-        per_label = "안정"
-    else:
-        applied_per = 8
-        per_label = "보수적"
+    # 적용 PER 결정 (정수 PER은 기존 JSON 형식대로 정수로 표시)
+    tier, applied_per = fair_per_tier(eps_cagr)
+    if float(applied_per).is_integer():
+        applied_per = int(applied_per)
     
     data = {
         "eps_cagr": round(eps_cagr, 2),
         "applied_per": applied_per,
-        "per_label": per_label,
+        "per_label": PER_TIER_LABELS[tier],
         "current_price": round(result_data.get("current_price", 0), 2),
         "intrinsic_value": round(result_data.get("intrinsic_value", 0), 2),
         "gap_pct": round(result_data.get("gap_pct", 0), 2),
@@ -339,312 +493,401 @@ def generate_valuation_reason(result_data: Dict) -> Optional[str]:
 # 평가 함수
 # ============================================================================
 
-def evaluate_ticker(ticker: str, date: str, year: str) -> Optional[Dict]:
+def extract_yearly_metrics(financial_data: Dict) -> Optional[MetricSeries]:
     """
-    단일 종목 버핏 기준 평가
+    yfinance Storage 재무제표 → 연도별 평가 지표 (공용 점수 모듈 입력, 오래된 연도부터)
     
-    yfinance에서 수집한 데이터 구조로 평가
+    매출/순이익/자본이 0인 연도는 제외하며, 재무제표가 없으면 None
+    """
+    financials = financial_data.get("financials", {})
+    balance_sheet = financial_data.get("balance_sheet", {})
+    cashflow = financial_data.get("cashflow", {})
+    
+    if not financials or not balance_sheet or not cashflow:
+        return None
+    
+    rows = []
+    
+    for year_str in financials.keys():
+        fin = financials.get(year_str, {})
+        bal = balance_sheet.get(year_str, {})
+        cf = cashflow.get(year_str, {})
+        
+        # 필수 데이터 추출
+        revenue = fin.get("Total Revenue", 0) or 0
+        net_income = fin.get("Net Income", 0) or 0
+        total_equity = bal.get("Stockholders Equity", 0) or 0
+        
+        # 유효성 검사
+        if net_income == 0 or total_equity == 0 or revenue == 0:
+            continue
+        
+        rows.append(compute_year_metrics(
+            year_str,
+            revenue=revenue,
+            net_income=net_income,
+            ebit=fin.get("EBIT", 0) or 0,
+            pretax_income=fin.get("Pretax Income", 0) or 0,
+            tax_provision=fin.get("Tax Provision", 0) or 0,
+            total_equity=total_equity,
+            total_liabilities=bal.get("Total Liabilities Net Minority Interest", 0) or 0,
+            free_cash_flow=cf.get("Free Cash Flow", 0) or 0,
+            eps=fin.get("Diluted EPS", 0) or 0,
+            interest_expense=fin.get("Interest Expense", 0) or 0,
+        ))
+    
+    # 오래된 순서로 정렬
+    rows.sort(key=lambda r: r[0])
+    return MetricSeries.from_rows(rows)
+
+
+def build_ttm_statements(quarterly_data: Dict) -> Optional[Tuple[str, Dict[str, Dict]]]:
+    """
+    최근 4개 분기 → TTM 합성 연도
+    
+    손익계산서/현금흐름표 항목은 4개 분기 합(한 분기라도 없으면 None),
+    재무상태표 항목은 최근 분기 값을 사용합니다.
+    
+    Returns:
+        (연도 라벨 = 최근 분기말 연도, 연간 data.json과 같은 형식의 {재무제표: {항목: 값}})
+        4개 분기가 없거나 연속되지 않으면 None
+    """
+    periods = quarterly_data.get("periods", [])
+    if len(periods) < 4:
+        return None
+    
+    latest = datetime.strptime(periods[0], "%Y-%m-%d")
+    oldest = datetime.strptime(periods[3], "%Y-%m-%d")
+    if (latest - oldest).days > TTM_MAX_SPAN_DAYS:
+        return None
+    
+    def sum_last_four(statement: str) -> Dict[str, Optional[float]]:
+        totals = {}
+        for field, values in quarterly_data.get(statement, {}).items():
+            window = values[:4]
+            totals[field] = sum(window) if len(window) == 4 and None not in window else None
+        return totals
+    
+    statements = {
+        "financials": sum_last_four("financials"),
+        "balance_sheet": {
+            field: values[0] if values else None
+            for field, values in quarterly_data.get("balance_sheet", {}).items()
+        },
+        "cashflow": sum_last_four("cashflow"),
+    }
+    return str(latest.year), statements
+
+
+def apply_ttm(financial_data: Dict, quarterly_data: Optional[Dict]) -> Dict:
+    """
+    연간 재무제표에 TTM 합성 연도를 반영한 사본 반환 (TTM 평가 기준)
+    
+    TTM 연도 라벨 이상인 연간 데이터는 TTM으로 대체되고, 그 이전 연도는 그대로 사용합니다.
+    TTM을 만들 수 없거나 매출/순이익/자본이 비어 있으면 연간 데이터를 그대로 반환합니다.
+    """
+    ttm = build_ttm_statements(quarterly_data) if quarterly_data else None
+    if ttm is None:
+        return financial_data
+    
+    label, statements = ttm
+    if not (statements["financials"].get("Total Revenue")
+            and statements["financials"].get("Net Income")
+            and statements["balance_sheet"].get("Stockholders Equity")):
+        return financial_data
+    
+    merged = dict(financial_data)
+    for name, ttm_values in statements.items():
+        yearly = {year: values for year, values in financial_data.get(name, {}).items() if year < label}
+        yearly[label] = ttm_values
+        merged[name] = yearly
+    merged["ttm_period"] = quarterly_data["periods"][0]
+    return merged
+
+
+def load_ticker_data(ticker: str, date: str, year: str,
+                     basis: str = BASIS_ANNUAL) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    단일 종목 평가 입력 로드 (재무제표, 현재가) - Storage I/O 단계
+    
+    basis가 ttm이면 분기 재무제표도 읽어 TTM 합성 연도를 반영합니다.
     """
-    # 데이터 로드
     financial_data = get_financial_data(ticker, year)
+    if financial_data and basis == BASIS_TTM:
+        financial_data = apply_ttm(financial_data, get_quarterly_data(ticker, year))
     price_data = get_price_data(ticker, date)
+    return financial_data, price_data
+
+
+def evaluate_ticker(ticker: str, date: str, year: str, basis: str = BASIS_ANNUAL) -> Optional[Dict]:
+    """
+    단일 종목 버핏 기준 평가
     
+    yfinance에서 수집한 데이터 구조로 평가
+    """
+    financial_data, price_data = load_ticker_data(ticker, date, year, basis)
+    return evaluate_loaded_ticker(ticker, financial_data, price_data)
+
+
+def evaluate_loaded_ticker(ticker: str, financial_data: Optional[Dict],
+                           price_data: Optional[Dict]) -> Optional[Dict]:
+    """
+    로드된 데이터로 단일 종목 점수 계산 (네트워크 없음) - 계산 단계
+    """
     if not financial_data or not price_data:
         return None
     
     try:
-        financials = financial_data.get("financials", {})
-        balance_sheet = financial_data.get("balance_sheet", {})
-        cashflow = financial_data.get("cashflow", {})
-        
-        if not financials or not balance_sheet or not cashflow:
-            return None
-        
-        # 연도별 데이터 추출
-        years_list = sorted(financials.keys(), reverse=True)
-        
-        if len(years_list) < 2:
+        fundamentals = evaluate_fundamentals(ticker, financial_data)
+        return apply_price(ticker, fundamentals, price_data)
+    except Exception as e:
+        print(f"⚠️ {ticker} 평가 오류: {e}")
+        return None
+
+
+def evaluate_fundamentals(ticker: str, financial_data: Dict) -> Optional[Dict]:
+    """
+    재무제표만으로 정해지는 평가 결과 (현재가와 무관, 파생 캐시에 저장되는 부분)
+    
+    점수 항목, EPS CAGR, 미래 EPS, 적정 PER, 적정가(반올림 전), 평균 지표, 신뢰등급,
+    우량주 상세 정보를 담으며, 평가할 수 없는 종목이면 None
+    """
+    # 연도별 지표 추출 + 점수 계산 (공용 점수 모듈)
+    series = extract_yearly_metrics(financial_data)
+    score_data = score_series(series, YF_POLICY) if series else None
+    
+    if not score_data:
+        return None
+    
+    total_score = score_data["total_score"]
+    years_available = score_data["years_data"]
+    
+    # 신뢰등급
+    grade_num, grade_text, grade_stars = get_trust_grade(years_available)
+    
+    fundamentals = {
+        "company_name": financial_data.get("company_name", ticker),
+        "industry": financial_data.get("industry", "Unknown"),
+        "total_score": total_score,
+        "roe_score": score_data["roe_score"],
+        "roic_score": score_data["roic_score"],
+        "margin_score": score_data["margin_score"],
+        "trend_score": score_data["trend_score"],
+        "health_score": score_data["health_score"],
+        "cash_score": score_data["cash_score"],
+        "pass_status": "PASS" if total_score >= DEFAULT_SCORING.pass_score else "FAIL",
+        "intrinsic_value": score_data["intrinsic_value"],
+        "future_eps": score_data["future_eps"],
+        "fair_per": score_data["fair_per"],
+        "avg_roe": round(score_data["avg_roe"], 2),
+        "avg_roic": round(score_data["avg_roic"], 2),
+        "avg_net_margin": round(score_data["avg_net_margin"], 2),
+        "avg_fcf_margin": round(score_data["avg_fcf_margin"], 2),
+        "debt_ratio": round(score_data["debt_ratio"], 2),
+        "eps_cagr": round(score_data["eps_cagr"], 2),
+        "years_data": years_available,
+        "trust_grade": grade_num,
+        "trust_grade_text": grade_text,
+        "trust_grade_stars": grade_stars,
+    }
+    fundamentals["pass_reason"] = generate_pass_reason(fundamentals) or ""
+    
+    return fundamentals
+
+
+def apply_price(ticker: str, fundamentals: Optional[Dict],
+                price_data: Optional[Dict]) -> Optional[Dict]:
+    """
+    펀더멘털 평가 결과 + 현재가 → 최종 평가 결과
+    
+    현재가에 의존하는 필드(gap_pct, recommendation, is_undervalued, 적정가 분석)만 계산합니다.
+    """
+    if not fundamentals or not price_data:
+        return None
+    
+    total_score = fundamentals["total_score"]
+    intrinsic_value = fundamentals["intrinsic_value"]
+    
+    current_price = price_data.get("current_price", 0)
+    company_name = price_data.get("company_name", fundamentals["company_name"])
+    
+    # GAP 계산
+    if current_price > 0 and intrinsic_value > 0:
+        gap_pct = (intrinsic_value - current_price) / current_price * 100
+    else:
+        gap_pct = 0
+    
+    # 결과 딕셔너리
+    result_dict = {
+        "ticker": ticker,
+        "company_name": company_name,
+        "exchange": price_data.get("exchange", "Unknown"),
+        "industry": fundamentals["industry"],
+        "total_score": total_score,
+        "roe_score": fundamentals["roe_score"],
+        "roic_score": fundamentals["roic_score"],
+        "margin_score": fundamentals["margin_score"],
+        "trend_score": fundamentals["trend_score"],
+        "health_score": fundamentals["health_score"],
+        "cash_score": fundamentals["cash_score"],
+        "pass_status": fundamentals["pass_status"],
+        "current_price": current_price,
+        "intrinsic_value": round(intrinsic_value, 2),
+        "gap_pct": round(gap_pct, 2),
+        "recommendation": "BUY" if gap_pct > 0 else "WAIT",
+        "is_undervalued": gap_pct > 0 and total_score >= DEFAULT_SCORING.pass_score,
+        "avg_roe": fundamentals["avg_roe"],
+        "avg_roic": fundamentals["avg_roic"],
+        "avg_net_margin": fundamentals["avg_net_margin"],
+        "avg_fcf_margin": fundamentals["avg_fcf_margin"],
+        "debt_ratio": fundamentals["debt_ratio"],
+        "eps_cagr": fundamentals["eps_cagr"],
+        "years_data": fundamentals["years_data"],
+        "trust_grade": fundamentals["trust_grade"],
+        "trust_grade_text": fundamentals["trust_grade_text"],
+        "trust_grade_stars": fundamentals["trust_grade_stars"],
+    }
+    
+    # 요약문 생성 (우량주 상세는 캐시된 값, 적정가 분석은 현재가 기준으로 새로 생성)
+    result_dict["pass_reason"] = fundamentals["pass_reason"]
+    result_dict["valuation_reason"] = generate_valuation_reason(result_dict) or ""
+    
+    return result_dict
+
+
+# ============================================================================
+# 펀더멘털 파생 캐시 (재무제표가 바뀐 종목만 재계산)
+# ============================================================================
+
+def scoring_fingerprint(config: ScoringConfig = DEFAULT_SCORING,
+                        policy: ScoringPolicy = YF_POLICY) -> str:
+    """파생 캐시를 만든 점수 기준(ScoringConfig + ScoringPolicy) 해시"""
+    return content_hash({"config": asdict(config), "policy": asdict(policy)})
+
+
+class FundamentalsCache:
+    """
+    연도별 펀더멘털 파생 캐시 (financials/{year}/_derived.json, TTM 기준은 _derived_ttm.json)
+    
+    evaluate_fundamentals 결과를 재무제표 내용 해시(_hashes.json)와 함께 보관합니다.
+    TTM 기준은 연간 + 분기 재무제표 해시를 함께 비교하므로, 새 분기가 없으면 다시 받지 않습니다.
+    해시가 같은 종목은 재무제표를 다시 받지 않고 현재가 의존 필드만 계산하고(fast path),
+    해시가 다르거나 캐시가 없는 종목만 전체 재계산합니다.
+    평가할 수 없는 종목(None)도 캐시하여 다음 실행에서 다운로드를 생략합니다.
+    점수 기준값/정책이 바뀌면(scoring_fingerprint) 캐시 전체를 다시 계산합니다.
+    """
+    
+    def __init__(self, year: str, basis: str = BASIS_ANNUAL):
+        self.year = year
+        self.basis = basis
+        self.path = f"financials/{year}/{DERIVED_CACHE_FILES[basis]}"
+        self.entries: Dict[str, Dict] = {}
+        self.fast_path = 0
+        self.rescored = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def load(self) -> "FundamentalsCache":
+        """Storage에서 캐시 로드 (없거나 형식 버전/점수 기준이 다르면 빈 캐시)"""
+        try:
+            payload = json.loads(download_bytes(BUCKET_NAME, self.path).decode('utf-8'))
+            if (payload.get("version") == DERIVED_CACHE_VERSION
+                    and payload.get("scoring") == scoring_fingerprint()):
+                self.entries = payload.get("tickers", {})
+        except Exception:
+            self.entries = {}
+        return self
+    
+    def _content_hash(self, ticker: str) -> Optional[str]:
+        hashes = load_financial_hashes(self.year)
+        content_hash = hashes.get(f"financials/{self.year}/{ticker}/data.json")
+        if content_hash and self.basis == BASIS_TTM:
+            content_hash += ":" + hashes.get(f"financials/{self.year}/{ticker}/{QUARTERLY_FILE}", "")
+        return content_hash
+    
+    def lookup(self, ticker: str) -> Optional[Dict]:
+        """재무제표가 캐시 이후 바뀌지 않았으면 캐시 항목 반환, 아니면 None"""
+        content_hash = self._content_hash(ticker)
+        if not content_hash:
             return None
+        with self._lock:
+            entry = self.entries.get(ticker)
+        if entry and entry.get("hash") == content_hash:
+            return entry
+        return None
+    
+    def load_ticker_data(self, ticker: str, date: str) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]:
+        """
+        단일 종목 평가 입력 로드 - Storage I/O 단계
         
-        results = []
+        Returns:
+            (캐시 항목, 재무제표, 현재가) - 캐시 적중 시 재무제표는 받지 않음(None)
+        """
+        entry = self.lookup(ticker)
+        if entry is not None:
+            return entry, None, get_price_data(ticker, date)
+        financial_data, price_data = load_ticker_data(ticker, date, self.year, self.basis)
+        return None, financial_data, price_data
+    
+    def evaluate(self, ticker: str, entry: Optional[Dict], financial_data: Optional[Dict],
+                 price_data: Optional[Dict]) -> Optional[Dict]:
+        """
+        단일 종목 평가 - 계산 단계 (evaluate_loaded_ticker와 같은 결과)
         
-        for year_str in years_list:
-            fin = financials.get(year_str, {})
-            bal = balance_sheet.get(year_str, {})
-            cf = cashflow.get(year_str, {})
-            
-            # 필수 데이터 추출
-            revenue = fin.get("Total Revenue", 0) or 0
-            net_income = fin.get("Net Income", 0) or 0
-            ebit = fin.get("EBIT", 0) or 0
-            pretax_income = fin.get("Pretax Income", 0) or 0
-            tax_provision = fin.get("Tax Provision", 0) or 0
-            
-            total_equity = bal.get("Stockholders Equity", 0) or 0
-            total_liabilities = bal.get("Total Liabilities Net Minority Interest", 0) or 0
-            
-            free_cash_flow = cf.get("Free Cash Flow", 0) or 0
-            diluted_eps = fin.get("Diluted EPS", 0) or 0
-            
-            interest_expense = fin.get("Interest Expense", 0) or 0
-            
-            # 유효성 검사
-            if net_income == 0 or total_equity == 0 or revenue == 0:
-                continue
-            
-            # 세율 계산
-            tax_rate = (tax_provision / pretax_income * 100) if pretax_income != 0 else 0
-            
-            # 지표 계산
-            roe = calculate_roe(net_income, total_equity)
-            roic = calculate_roic(ebit, tax_rate, total_equity, total_liabilities)
-            net_margin = calculate_net_margin(net_income, revenue)
-            fcf_margin = calculate_fcf_margin(free_cash_flow, revenue)
-            debt_ratio = (total_liabilities / total_equity * 100) if total_equity != 0 else 0
+        캐시 적중이면 현재가 의존 필드만 계산하고, 아니면 전체 계산 후 캐시를 갱신합니다.
+        """
+        try:
+            if entry is not None:
+                with self._lock:
+                    self.fast_path += 1
+                return apply_price(ticker, entry["fundamentals"], price_data)
             
-            # 이자보상배율
-            if interest_expense == 0:
-                interest_coverage = float("inf")
-            else:
-                interest_coverage = ebit / abs(interest_expense) if interest_expense else float("inf")
+            if not financial_data:
+                return None
             
-            results.append({
-                "year": year_str,
-                "revenue": revenue,
-                "net_income": net_income,
-                "eps": diluted_eps,
-                "roe": roe,
-                "roic": roic,
-                "net_margin": net_margin,
-                "fcf_margin": fcf_margin,
-                "debt_ratio": debt_ratio,
-                "interest_coverage": interest_coverage,
-                "interest_expense": interest_expense
-            })
-        
-        if len(results) < 2:
+            fundamentals = evaluate_fundamentals(ticker, financial_data)
+            content_hash = self._content_hash(ticker)
+            with self._lock:
+                self.rescored += 1
+                if content_hash:
+                    self.entries[ticker] = {"hash": content_hash, "fundamentals": fundamentals}
+                    self._dirty = True
+            return apply_price(ticker, fundamentals, price_data)
+        except Exception as e:
+            print(f"⚠️ {ticker} 평가 오류: {e}")
             return None
-        
-        # 오래된 순서로 정렬
-        results.sort(key=lambda x: x["year"])
-        years_available = len(results)
-        
-        # ================================================================
-        # 점수 계산
-        # ================================================================
-        
-        # [1] ROE 점수 (25점)
-        count_15_plus = sum(1 for r in results if r["roe"] >= 15.0)
-        count_12_plus = sum(1 for r in results if r["roe"] >= 12.0)
-        has_loss = any(r["roe"] < 0 for r in results)
-        
-        roe_score = 0
-        if has_loss:
-            roe_score = 0
-        elif count_15_plus == years_available:
-            roe_score = 25
-        elif count_15_plus >= years_available * 0.8:
-            roe_score = 20
-        elif count_12_plus == years_available:
-            roe_score = 15
-        elif count_12_plus >= years_available * 0.8:
-            roe_score = 10
-        
-        # [2] ROIC 점수 (20점)
-        count_12_plus_roic = sum(1 for r in results if r["roic"] >= 12.0)
-        count_9_plus_roic = sum(1 for r in results if r["roic"] >= 9.0)
-        
-        roic_score = 0
-        if count_12_plus_roic == years_available:
-            roic_score = 20
-        elif count_12_plus_roic >= years_available * 0.8:
-            roic_score = 15
-        elif count_9_plus_roic == years_available:
-            roic_score = 10
-        elif count_9_plus_roic >= years_available * 0.8:
-            roic_score = 5
-        
-        # [3] Net Margin 점수 (15점)
-        margins = [r["net_margin"] for r in results]
-        avg_margin = sum(margins) / len(margins)
-        variance = sum((m - avg_margin) ** 2 for m in margins) / len(margins)
-        std_dev = math.sqrt(variance)
-        
-        avg_score = 0
-        if avg_margin >= 20.0:
-            avg_score = 10
-        elif avg_margin >= 15.0:
-            avg_score = 7
-        elif avg_margin >= 10.0:
-            avg_score = 5
-        
-        stability_score = 0
-        if std_dev <= 3.0:
-            stability_score = 5
-        elif std_dev <= 5.0:
-            stability_score = 3
-        elif std_dev <= 8.0:
-            stability_score = 1
-        
-        margin_score = avg_score + stability_score
-        
-        # [4] 추세 점수 (15점)
-        trend_score = 0
-        if years_available >= 4:
-            recent_years = min(3, years_available - 1)
-            past_years = years_available - recent_years
-            
-            recent_roe = sum(r["roe"] for r in results[-recent_years:]) / recent_years
-            past_roe = sum(r["roe"] for r in results[:past_years]) / past_years
-            
-            improvement = ((recent_roe - past_roe) / past_roe * 100) if past_roe != 0 else 0
-            
-            if improvement >= 20.0:
-                trend_score = 15
-            elif improvement >= 10.0:
-                trend_score = 12
-            elif improvement >= 5.0:
-                trend_score = 9
-            elif improvement >= 0.0:
-                trend_score = 6
-            elif improvement >= -5.0:
-                trend_score = 3
-        
-        # [5] 재무 건전성 점수 (15점)
-        latest = results[-1]
-        
-        debt_score = 0
-        if latest["debt_ratio"] <= 50.0:
-            debt_score = 10
-        elif latest["debt_ratio"] <= 80.0:
-            debt_score = 7
-        elif latest["debt_ratio"] <= 120.0:
-            debt_score = 4
-        elif latest["debt_ratio"] <= 150.0:
-            debt_score = 2
-        
-        coverage_score = 0
-        if latest["interest_expense"] == 0:
-            coverage_score = 5
-        elif latest["interest_coverage"] >= 10.0:
-            coverage_score = 5
-        elif latest["interest_coverage"] >= 5.0:
-            coverage_score = 3
-        elif latest["interest_coverage"] >= 3.0:
-            coverage_score = 1
-        
-        health_score = debt_score + coverage_score
-        
-        # [6] 현금창출력 점수 (10점)
-        fcf_margins = [r["fcf_margin"] for r in results]
-        avg_fcf_margin = sum(fcf_margins) / len(fcf_margins)
-        
-        cash_score = 0
-        if avg_fcf_margin >= 15.0:
-            cash_score = 10
-        elif avg_fcf_margin >= 10.0:
-            cash_score = 7
-        elif avg_fcf_margin >= 5.0:
-            cash_score = 4
-        elif avg_fcf_margin >= 0.0:
-            cash_score = 2
-        
-        # 총점
-        total_score = roe_score + roic_score + margin_score + trend_score + health_score + cash_score
-        
-        # ================================================================
-        # 적정가 계산
-        # ================================================================
-        eps_list = [r["eps"] for r in results if r["eps"] and r["eps"] > 0]
-        
-        if len(eps_list) >= 2:
-            oldest_eps = eps_list[0]
-            latest_eps = eps_list[-1]
-            eps_cagr = calculate_cagr(oldest_eps, latest_eps, len(eps_list) - 1)
-        else:
-            eps_cagr = 0
-            latest_eps = eps_list[-1] if eps_list else 0
-        
-        conservative_growth = eps_cagr * 0.7
-        future_eps = latest_eps * math.pow(1 + conservative_growth / 100, 5) if latest_eps > 0 else 0
-        
-        if eps_cagr >= 15.0:
-            fair_per = 18.0
-        elif eps_cagr >= 8.0:
-            fair_per = 12.0
-        elif eps_cagr >= 0.0:
-            fair_per = 10.0
-        else:
-            fair_per = 8.0
-        
-        theoretical_value = future_eps * fair_per
-        intrinsic_value = theoretical_value * 0.8
-        
-        current_price = price_data.get("current_price", 0)
-        company_name = price_data.get("company_name", financial_data.get("company_name", ticker))
-        
-        # GAP 계산
-        if current_price > 0 and intrinsic_value > 0:
-            gap_pct = (intrinsic_value - current_price) / current_price * 100
-        else:
-            gap_pct = 0
-        
-        # 평균 지표
-        avg_roe = sum(r["roe"] for r in results) / len(results)
-        avg_roic = sum(r["roic"] for r in results) / len(results)
-        
-        # 신뢰등급
-        grade_num, grade_text, grade_stars = get_trust_grade(years_available)
-        
-        # 결과 딕셔너리
-        result_dict = {
-            "ticker": ticker,
-            "company_name": company_name,
-            "exchange": price_data.get("exchange", "Unknown"),
-            "industry": financial_data.get("industry", "Unknown"),
-            "total_score": total_score,
-            "roe_score": roe_score,
-            "roic_score": roic_score,
-            "margin_score": margin_score,
-            "trend_score": trend_score,
-            "health_score": health_score,
-            "cash_score": cash_score,
-            "pass_status": "PASS" if total_score >= 85 else "FAIL",
-            "current_price": current_price,
-            "intrinsic_value": round(intrinsic_value, 2),
-            "gap_pct": round(gap_pct, 2),
-            "recommendation": "BUY" if gap_pct > 0 else "WAIT",
-            "is_undervalued": gap_pct > 0 and total_score >= 85,
-            "avg_roe": round(avg_roe, 2),
-            "avg_roic": round(avg_roic, 2),
-            "avg_net_margin": round(avg_margin, 2),
-            "avg_fcf_margin": round(avg_fcf_margin, 2),
-            "debt_ratio": round(latest["debt_ratio"], 2),
-            "eps_cagr": round(eps_cagr, 2),
-            "years_data": years_available,
-            "trust_grade": grade_num,
-            "trust_grade_text": grade_text,
-            "trust_grade_stars": grade_stars,
-        }
-        
-        # 요약문 생성
-        result_dict["pass_reason"] = generate_pass_reason(result_dict) or ""
-        result_dict["valuation_reason"] = generate_valuation_reason(result_dict) or ""
-        
-        return result_dict
-        
-    except Exception as e:
-        print(f"⚠️ {ticker} 평가 오류: {e}")
-        return None
+    
+    def save(self) -> bool:
+        """변경이 있을 때만 캐시 저장"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = json.dumps(
+                {"version": DERIVED_CACHE_VERSION, "scoring": scoring_fingerprint(),
+                 "tickers": self.entries},
+                separators=(",", ":"),
+            ).encode('utf-8')
+        try:
+            upload_bytes(BUCKET_NAME, self.path, payload, upsert=True)
+            return True
+        except Exception as e:
+            print(f"⚠️ 파생 캐시 저장 실패 ({self.path}): {e}")
+            return False
+    
+    def print_stats(self):
+        """fast path / 전체 재계산 종목 수 출력"""
+        print(f"⚡ 파생 캐시: 현재가만 재계산 {self.fast_path}개 / 전체 재계산 {self.rescored}개")
 
 
-def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
+def run_evaluation(tickers: List[str], date: str, year: str,
+                   basis: str = BASIS_ANNUAL) -> List[Dict]:
     """
     여러 종목 평가 실행 (DB 저장 없음)
     """
     print(f"\n🎯 버핏 평가 시작")
     print(f"   현재가 날짜: {date}")
     print(f"   재무제표 연도: {year}")
+    print(f"   평가 기준: {basis}")
     print(f"   평가 종목 수: {len(tickers)}개\n")
     
     results = []
@@ -652,7 +895,7 @@ def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
     undervalued = []
     
     for ticker in tqdm(tickers, desc="평가 진행", ncols=80, ascii=True, leave=True):
-        result = evaluate_ticker(ticker, date, year)
+        result = evaluate_ticker(ticker, date, year, basis)
         if result:
             results.append(result)
             if result["pass_status"] == "PASS":
@@ -678,6 +921,8 @@ def run_evaluation(tickers: List[str], date: str, year: str) -> List[Dict]:
             print(f"   {i}. {r['ticker']}: 총점 {r['total_score']}점, "
                   f"상승여력 {r['gap_pct']:+.1f}%, 신뢰 {r['trust_grade_stars']}")
     
+    print_cache_stats()
+    
     return results
 
 
@@ -693,6 +938,7 @@ def main():
 실행 예시:
   python yf_evaluate.py --mode test --date 2026-01-30
   python yf_evaluate.py --mode full --date 2026-01-30
+  python yf_evaluate.py --mode full --date 2026-01-30 --basis ttm
         """
     )
     
@@ -718,6 +964,35 @@ def main():
         help="재무제표 데이터 연도 (YYYY 또는 'auto')"
     )
     
+    parser.add_argument(
+        "--basis",
+        type=str,
+        default=BASIS_ANNUAL,
+        choices=[BASIS_ANNUAL, BASIS_TTM],
+        help="평가 기준 (annual: 연간 재무제표, ttm: 최근 4개 분기 합산)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+    
+    parser.add_argument(
+        "--storage-dir",
+        type=str,
+        default=None,
+        help="Supabase 대신 읽을 로컬 Storage 미러 루트 (storage_sync.py로 생성, 기본값: STORAGE_LOCAL_DIR)"
+    )
+    
     args = parser.parse_args()
     
     print("\n" + "=" * 70)
@@ -728,8 +1003,11 @@ def main():
     print("=" * 70)
     
     # 환경 변수 검증
+    configure_storage(args.storage_dir)
     validate_env()
     
+    configure_cache(args.cache_dir, args.cache_max_mb)
+    
     # 재무제표 연도 결정
     if args.year == "auto":
         year = find_latest_financial_year()
@@ -754,7 +1032,7 @@ def main():
         print(f"   {', '.join(tickers)}")
     
     # 평가 실행
-    run_evaluation(tickers, args.date, year)
+    run_evaluation(tickers, args.date, year, args.basis)
 
 
 if __name__ == "__main__":
@@ -10,11 +10,14 @@ yfinance 버핏 평가 + DB 저장 스크립트
 실행 예시:
   python yf_result.py --mode test --date 2026-01-30
   python yf_result.py --mode full --date 2026-01-30
+  python yf_result.py --mode full --date 2026-01-30 --basis ttm
 """
 
 import os
 import sys
+import queue
 import argparse
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -22,14 +25,21 @@ from tqdm import tqdm
 from dotenv import load_dotenv
 from supabase import Client
 
+from db_batch import fetch_all_rows, upsert_rows_batched, DEFAULT_BATCH_SIZE
+
+from storage_gateway import get_supabase_client
+
 # yf_evaluate.py에서 평가 함수 import
 from yf_evaluate import (
     validate_env,
-    get_supabase_client,
-    evaluate_ticker,
+    FundamentalsCache,
+    BASIS_ANNUAL,
     list_tickers_from_prices,
     find_latest_financial_year,
     get_trust_grade,
+    configure_cache,
+    print_cache_stats,
+    DEFAULT_CACHE_MAX_MB,
 )
 
 # 환경 변수 로드 (.env.local 지원, 프로젝트 루트에서 찾기)
@@ -48,38 +58,68 @@ elif env_file.exists():
 else:
     load_dotenv()
 
+# 파이프라인 단계별 기본 병렬도 (다운로드 / 점수 계산 / DB 저장)
+DEFAULT_LOAD_WORKERS = 8
+DEFAULT_SCORE_WORKERS = 1
+DEFAULT_SAVE_WORKERS = 4
+
+# 단계 사이 큐 크기 상한 (메모리 사용량 제한, 병렬도 대비 배수)
+QUEUE_SIZE_FACTOR = 4
+
 
 # ============================================================================
 # DB 저장 함수
 # ============================================================================
 
-def ensure_stock_exists(supabase: Client, ticker: str, company_name: str, 
-                        exchange: str = None, industry: str = None) -> int:
+def load_stock_ids(supabase: Client) -> Dict[str, int]:
     """
-    stocks 테이블에 종목이 없으면 추가, 있으면 stock_id 반환
+    stocks 테이블 전체를 1회 조회하여 ticker → stock_id 맵 생성
+    """
+    rows = fetch_all_rows(supabase, "stocks", "ticker, stock_id")
+    return {row["ticker"]: row["stock_id"] for row in rows}
+
+
+def insert_missing_stocks(supabase: Client, stock_ids: Dict[str, int], 
+                          eval_results: List[Dict]) -> int:
     """
+    stock_ids 맵에 없는 종목만 stocks 테이블에 한 번에 추가하고 맵을 갱신
+    
+    동시에 다른 실행이 같은 종목을 추가해 insert가 실패하면 다시 조회하여 맵을 채웁니다.
+    
+    Returns:
+        새로 추가된 종목 수
+    """
+    new_stocks = {}
+    for r in eval_results:
+        if r["ticker"] not in stock_ids and r["ticker"] not in new_stocks:
+            new_stocks[r["ticker"]] = {
+                "ticker": r["ticker"],
+                "company_name": r.get("company_name") or r["ticker"],
+                "exchange": r.get("exchange"),
+                "industry": r.get("industry"),
+            }
+    
+    if not new_stocks:
+        return 0
+    
+    tickers = list(new_stocks)
+    inserted = 0
     try:
-        # 기존 종목 조회
-        result = supabase.table("stocks").select("stock_id").eq("ticker", ticker).execute()
-        
-        if result.data and len(result.data) > 0:
-            return result.data[0]["stock_id"]
-        
-        # 새 종목 추가
-        insert_result = supabase.table("stocks").insert({
-            "ticker": ticker,
-            "company_name": company_name,
-            "exchange": exchange,
-            "industry": industry
-        }).execute()
-        
-        if insert_result.data and len(insert_result.data) > 0:
-            return insert_result.data[0]["stock_id"]
-        
-        return None
+        result = supabase.table("stocks").insert(list(new_stocks.values())).execute()
+        inserted = len(result.data or [])
+        for row in result.data or []:
+            stock_ids[row["ticker"]] = row["stock_id"]
     except Exception as e:
-        print(f"⚠️ 종목 저장 실패 ({ticker}): {e}")
-        return None
+        print(f"⚠️ 종목 일괄 추가 실패, 재조회: {e}")
+        result = supabase.table("stocks").select("ticker, stock_id").in_("ticker", tickers).execute()
+        for row in result.data or []:
+            stock_ids[row["ticker"]] = row["stock_id"]
+    
+    missing = [t for t in tickers if t not in stock_ids]
+    if missing:
+        print(f"⚠️ 종목 저장 실패: {', '.join(missing[:20])}")
+    
+    return inserted
 
 
 def create_buffett_run(supabase: Client, universe: str, data_source: str, 
@@ -103,82 +143,128 @@ def create_buffett_run(supabase: Client, universe: str, data_source: str,
         return None
 
 
-def save_buffett_result(supabase: Client, run_id: int, stock_id: int, 
-                        eval_result: Dict) -> bool:
+def build_buffett_result_row(run_id: int, stock_id: int, eval_result: Dict) -> Dict:
     """
-    buffett_result 테이블에 평가 결과 저장
+    buffett_result 테이블 1행 생성
     
     상세 지표는 pass_reason, valuation_reason에 JSON으로 포함됨
     """
-    try:
-        result = supabase.table("buffett_result").insert({
-            "run_id": run_id,
-            "stock_id": stock_id,
-            "total_score": eval_result.get("total_score"),
-            "pass_status": eval_result.get("pass_status"),
-            "current_price": eval_result.get("current_price"),
-            "intrinsic_value": eval_result.get("intrinsic_value"),
-            "gap_pct": eval_result.get("gap_pct"),
-            "recommendation": eval_result.get("recommendation"),
-            "is_undervalued": eval_result.get("is_undervalued"),
-            "years_data": eval_result.get("years_data"),
-            "trust_grade": eval_result.get("trust_grade"),
-            "trust_grade_text": eval_result.get("trust_grade_text"),
-            "trust_grade_stars": eval_result.get("trust_grade_stars"),
-            "pass_reason": eval_result.get("pass_reason"),
-            "valuation_reason": eval_result.get("valuation_reason")
-        }).execute()
-        
-        return True
-    except Exception as e:
-        print(f"⚠️ 평가 결과 저장 실패: {e}")
-        return False
+    return {
+        "run_id": run_id,
+        "stock_id": stock_id,
+        "total_score": eval_result.get("total_score"),
+        "pass_status": eval_result.get("pass_status"),
+        "current_price": eval_result.get("current_price"),
+        "intrinsic_value": eval_result.get("intrinsic_value"),
+        "gap_pct": eval_result.get("gap_pct"),
+        "recommendation": eval_result.get("recommendation"),
+        "is_undervalued": eval_result.get("is_undervalued"),
+        "years_data": eval_result.get("years_data"),
+        "trust_grade": eval_result.get("trust_grade"),
+        "trust_grade_text": eval_result.get("trust_grade_text"),
+        "trust_grade_stars": eval_result.get("trust_grade_stars"),
+        "pass_reason": eval_result.get("pass_reason"),
+        "valuation_reason": eval_result.get("valuation_reason")
+    }
 
 
-def save_latest_price(supabase: Client, stock_id: int, current_price: float, 
-                      price_date: str) -> bool:
+def save_buffett_results(supabase: Client, rows: List[Dict], 
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> int:
     """
-    latest_price 테이블에 최신 가격 저장 (upsert)
+    buffett_result 테이블에 평가 결과 일괄 저장 (run_id+stock_id 기준 배치 upsert)
+    
+    - 일시적 오류(연결/5xx): 같은 배치를 그대로 재시도 (upsert라 중복 행 없음)
+    - 제약 조건 위반 등: 배치를 나눠 문제 행만 제외
+    
+    Returns:
+        저장 성공 행 수
     """
-    try:
-        # 기존 가격 확인
-        existing = supabase.table("latest_price").select("stock_id").eq("stock_id", stock_id).execute()
-        
-        if existing.data and len(existing.data) > 0:
-            # 업데이트
-            supabase.table("latest_price").update({
-                "current_price": current_price,
-                "price_date": price_date,
-                "updated_at": datetime.now().isoformat()
-            }).eq("stock_id", stock_id).execute()
-        else:
-            # 삽입
-            supabase.table("latest_price").insert({
-                "stock_id": stock_id,
-                "current_price": current_price,
-                "price_date": price_date
-            }).execute()
-        
-        return True
-    except Exception as e:
-        print(f"⚠️ 가격 저장 실패: {e}")
-        return False
+    if not rows:
+        return 0
+    
+    saved, failed = upsert_rows_batched(supabase, "buffett_result", rows, "run_id,stock_id", batch_size)
+    
+    if failed:
+        print(f"⚠️ 평가 결과 저장 실패: {len(failed)}건 (stock_id: "
+              f"{', '.join(str(r['stock_id']) for r in failed[:20])})")
+    
+    return saved
+
+
+def build_latest_price_row(stock_id: int, current_price: float, price_date: str) -> Dict:
+    """
+    latest_price 테이블 1행 생성
+    """
+    return {
+        "stock_id": stock_id,
+        "current_price": current_price,
+        "price_date": price_date,
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def save_latest_prices(supabase: Client, rows: List[Dict], 
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    latest_price 테이블에 현재가 일괄 저장 (stock_id 기준 upsert, 배치별 원자적 반영)
+    
+    Returns:
+        저장 성공 행 수
+    """
+    if not rows:
+        return 0
+    
+    saved, failed = upsert_rows_batched(supabase, "latest_price", rows, "stock_id", batch_size)
+    
+    if failed:
+        print(f"⚠️ 가격 저장 실패: {len(failed)}건 (stock_id: "
+              f"{', '.join(str(r['stock_id']) for r in failed[:20])})")
+    
+    return saved
 
 
 # ============================================================================
 # 평가 + DB 저장 실행
 # ============================================================================
 
+def _run_stage(workers: int, target, *args) -> List[threading.Thread]:
+    """단계 워커 스레드 시작"""
+    threads = [threading.Thread(target=target, args=args, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    return threads
+
+
 def run_evaluation_and_save(tickers: List[str], date: str, year: str, 
-                            universe: str = "ALL"):
+                            universe: str = "ALL",
+                            load_workers: int = DEFAULT_LOAD_WORKERS,
+                            score_workers: int = DEFAULT_SCORE_WORKERS,
+                            save_workers: int = DEFAULT_SAVE_WORKERS,
+                            batch_size: int = DEFAULT_BATCH_SIZE,
+                            full_rescore: bool = False,
+                            basis: str = BASIS_ANNUAL):
     """
     평가 실행 후 DB에 저장
+    
+    3단계 파이프라인으로 실행하여 I/O 대기를 겹침:
+    - 다운로드: Storage에서 재무제표/현재가 로드 (load_workers)
+    - 점수 계산: 네트워크 없는 평가 계산 (score_workers)
+    - DB 저장: buffett_result/latest_price를 batch_size행씩 모아서 일괄 insert/upsert
+      (save_workers). stock_id는 시작 시 1회 조회한 맵에서 찾고,
+      새 종목은 마지막에 한 번에 stocks에 추가
+    단계 사이는 크기 제한 큐로 연결되어 느린 단계가 앞 단계를 멈춥니다.
+    
+    재무제표가 바뀌지 않은 종목은 펀더멘털 파생 캐시(financials/{year}/_derived.json)를
+    사용해 현재가 의존 필드만 다시 계산합니다 (full_rescore=True면 전부 재계산 후 캐시 갱신).
+    basis가 ttm이면 최근 4개 분기 합산(TTM)을 가장 최근 연도로 사용합니다.
     """
     print(f"\n🎯 버핏 평가 + DB 저장 시작")
     print(f"   현재가 날짜: {date}")
     print(f"   재무제표 연도: {year}")
     print(f"   평가 종목 수: {len(tickers)}개")
-    print(f"   Universe: {universe}\n")
+    print(f"   Universe: {universe}")
+    print(f"   평가 기준: {basis}")
+    print(f"   병렬도: 다운로드 {load_workers} / 계산 {score_workers} / 저장 {save_workers}\n")
     
     supabase = get_supabase_client()
     
@@ -190,46 +276,141 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str,
     
     print(f"✅ 실행 기록 생성: run_id = {run_id}")
     
-    results = []
-    passed = []
-    undervalued = []
+    # ticker → stock_id 맵 (1회 조회)
+    try:
+        stock_ids = load_stock_ids(supabase)
+    except Exception as e:
+        print(f"❌ 종목 목록 조회 실패: {e}")
+        return None, run_id
+    print(f"✅ 등록 종목 조회: {len(stock_ids)}개")
+    
+    # 펀더멘털 파생 캐시 (전체 재계산 시 빈 캐시로 시작)
+    derived_cache = FundamentalsCache(year, basis)
+    if not full_rescore:
+        derived_cache.load()
+    print(f"✅ 파생 캐시 로드: {len(derived_cache.entries)}개")
+    
+    # 단계 사이 큐 (None = 종료 신호)
+    ticker_queue: queue.Queue = queue.Queue()
+    loaded_queue: queue.Queue = queue.Queue(maxsize=max(1, score_workers) * QUEUE_SIZE_FACTOR)
+    scored_queue: queue.Queue = queue.Queue(maxsize=max(1, save_workers) * QUEUE_SIZE_FACTOR)
+    
+    for index, ticker in enumerate(tickers):
+        ticker_queue.put((index, ticker))
+    for _ in range(load_workers):
+        ticker_queue.put(None)
+    
+    indexed_results = []
+    pending_rows = []
+    pending_prices = []
+    new_stock_results = []
     saved_count = 0
+    lock = threading.Lock()
+    progress = tqdm(total=len(tickers), desc="평가 + 저장", ncols=80, ascii=True, leave=True)
     
-    for ticker in tqdm(tickers, desc="평가 + 저장", ncols=80, ascii=True, leave=True):
-        # 평가
-        eval_result = evaluate_ticker(ticker, date, year)
-        
-        if not eval_result:
-            continue
-        
-        results.append(eval_result)
-        
-        if eval_result["pass_status"] == "PASS":
-            passed.append(eval_result)
-            if eval_result["is_undervalued"]:
-                undervalued.append(eval_result)
-        
-        # DB 저장
-        stock_id = ensure_stock_exists(
-            supabase,
-            ticker,
-            eval_result.get("company_name", ticker),
-            eval_result.get("exchange"),
-            eval_result.get("industry")
-        )
-        
-        if stock_id:
-            # 평가 결과 저장
-            if save_buffett_result(supabase, run_id, stock_id, eval_result):
-                saved_count += 1
-            
-            # 최신 가격 저장
-            save_latest_price(
-                supabase,
-                stock_id,
-                eval_result.get("current_price", 0),
-                date
-            )
+    def advance():
+        with lock:
+            progress.update(1)
+    
+    def load_worker():
+        while True:
+            item = ticker_queue.get()
+            if item is None:
+                return
+            index, ticker = item
+            try:
+                entry, financial_data, price_data = derived_cache.load_ticker_data(ticker, date)
+            except Exception as e:
+                print(f"⚠️ {ticker} 데이터 로드 오류: {e}")
+                entry, financial_data, price_data = None, None, None
+            loaded_queue.put((index, ticker, entry, financial_data, price_data))
+    
+    def score_worker():
+        while True:
+            item = loaded_queue.get()
+            if item is None:
+                return
+            index, ticker, entry, financial_data, price_data = item
+            eval_result = derived_cache.evaluate(ticker, entry, financial_data, price_data)
+            if not eval_result:
+                advance()
+                continue
+            with lock:
+                indexed_results.append((index, eval_result))
+            scored_queue.put((ticker, eval_result))
+    
+    def flush_rows(force: bool = False):
+        nonlocal saved_count
+        with lock:
+            if not pending_rows or (not force and len(pending_rows) < batch_size):
+                return
+            batch = pending_rows[:]
+            price_batch = pending_prices[:]
+            pending_rows.clear()
+            pending_prices.clear()
+        saved = save_buffett_results(supabase, batch, batch_size)
+        save_latest_prices(supabase, price_batch, batch_size)
+        with lock:
+            saved_count += saved
+    
+    def queue_rows(stock_id: int, eval_result: Dict):
+        with lock:
+            pending_rows.append(build_buffett_result_row(run_id, stock_id, eval_result))
+            pending_prices.append(build_latest_price_row(
+                stock_id, eval_result.get("current_price", 0), date
+            ))
+    
+    def save_worker():
+        while True:
+            item = scored_queue.get()
+            if item is None:
+                return
+            ticker, eval_result = item
+            stock_id = stock_ids.get(ticker)
+            if stock_id:
+                queue_rows(stock_id, eval_result)
+                flush_rows()
+            else:
+                with lock:
+                    new_stock_results.append(eval_result)
+            advance()
+    
+    load_threads = _run_stage(load_workers, load_worker)
+    score_threads = _run_stage(score_workers, score_worker)
+    save_threads = _run_stage(save_workers, save_worker)
+    
+    # 앞 단계가 끝나면 다음 단계에 종료 신호 전달
+    for t in load_threads:
+        t.join()
+    for _ in score_threads:
+        loaded_queue.put(None)
+    for t in score_threads:
+        t.join()
+    for _ in save_threads:
+        scored_queue.put(None)
+    for t in save_threads:
+        t.join()
+    
+    # 새 종목 일괄 추가 후 남은 행 저장
+    if new_stock_results:
+        try:
+            added = insert_missing_stocks(supabase, stock_ids, new_stock_results)
+            print(f"🆕 새 종목 추가: {added}개")
+        except Exception as e:
+            print(f"⚠️ 새 종목 추가 실패: {e}")
+        for eval_result in new_stock_results:
+            stock_id = stock_ids.get(eval_result["ticker"])
+            if stock_id:
+                queue_rows(stock_id, eval_result)
+    flush_rows(force=True)
+    progress.close()
+    derived_cache.save()
+    
+    # 입력 순서 복원 (동점 종목 정렬 순서를 순차 실행과 동일하게 유지)
+    indexed_results.sort(key=lambda x: x[0])
+    results = [r for _, r in indexed_results]
+    passed = [r for r in results if r["pass_status"] == "PASS"]
+    undervalued = [r for r in passed if r["is_undervalued"]]
     
     # 결과 정렬
     results.sort(key=lambda x: x["total_score"], reverse=True)
@@ -251,6 +432,9 @@ def run_evaluation_and_save(tickers: List[str], date: str, year: str,
             print(f"   {i}. {r['ticker']}: 총점 {r['total_score']}점, "
                   f"상승여력 {r['gap_pct']:+.1f}%, 신뢰 {r['trust_grade_stars']}")
     
+    derived_cache.print_stats()
+    print_cache_stats()
+    
     print(f"\n✅ 결과가 DB에 저장되었습니다. (run_id: {run_id})")
     print(f"🔗 API 조회: /api/buffett?runId={run_id}")
     print("=" * 70 + "\n")
@@ -270,6 +454,7 @@ def main():
 실행 예시:
   python yf_result.py --mode test --date 2026-01-30
   python yf_result.py --mode full --date 2026-01-30
+  python yf_result.py --mode full --date 2026-01-30 --basis ttm
         """
     )
     
@@ -303,6 +488,62 @@ def main():
         help="지수 유형"
     )
     
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+    
+    parser.add_argument(
+        "--load-workers",
+        type=int,
+        default=DEFAULT_LOAD_WORKERS,
+        help=f"Storage 다운로드 병렬 스레드 수 (기본값: {DEFAULT_LOAD_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--score-workers",
+        type=int,
+        default=DEFAULT_SCORE_WORKERS,
+        help=f"점수 계산 스레드 수 (기본값: {DEFAULT_SCORE_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--save-workers",
+        type=int,
+        default=DEFAULT_SAVE_WORKERS,
+        help=f"DB 저장 병렬 스레드 수 (기본값: {DEFAULT_SAVE_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"buffett_result/latest_price 일괄 저장 배치 크기 (기본값: {DEFAULT_BATCH_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--basis",
+        type=str,
+        default=BASIS_ANNUAL,
+        choices=[BASIS_ANNUAL, BASIS_TTM],
+        help="평가 기준 (annual: 연간 재무제표, ttm: 최근 4개 분기 합산)"
+    )
+    
+    parser.add_argument(
+        "--full-rescore",
+        action="store_true",
+        help="펀더멘털 파생 캐시를 무시하고 전 종목 재계산 (캐시는 새로 기록)"
+    )
+    
     args = parser.parse_args()
     
     print("\n" + "=" * 70)
@@ -314,7 +555,9 @@ def main():
     print("=" * 70)
     
     # 환경 변수 검증
-    validate_env()
+    validate_env(require_database=True)
+    
+    configure_cache(args.cache_dir, args.cache_max_mb)
     
     # 재무제표 연도 결정
     if args.year == "auto":
@@ -345,7 +588,15 @@ def main():
         print(f"   {', '.join(tickers)}")
     
     # 평가 + DB 저장 실행
-    run_evaluation_and_save(tickers, args.date, year, universe)
+    run_evaluation_and_save(
+        tickers, args.date, year, universe,
+        load_workers=max(1, args.load_workers),
+        score_workers=max(1, args.score_workers),
+        save_workers=max(1, args.save_workers),
+        batch_size=max(1, args.batch_size),
+        full_rescore=args.full_rescore,
+        basis=args.basis,
+    )
 
 
 if __name__ == "__main__":
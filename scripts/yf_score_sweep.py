@@ -0,0 +1,369 @@
+"""
+yfinance 버핏 평가 - 기준값 스윕 (what-if)
+
+목적: 점수/적정가 기준값(ScoringConfig) 조합별로 전체 종목을 다시 채점하여
+      우량주/저평가 종목 수와 순위 안정성을 비교
+- Storage 로드와 지표 행렬 구성(build_metric_matrices)은 한 번만 수행
+- 조합마다 buffett_scoring.score_metric_matrices(벡터 연산)만 다시 실행
+- 순위 안정성은 기본 기준(DEFAULT_SCORING) 결과와 비교
+  - spearman: 총점 순위 상관계수
+  - pass_jaccard / buy_jaccard: 우량주 / 저평가 우량주 집합 유사도
+  - top_overlap: 저평가 우량주 상승여력 상위 N개 중 겹치는 비율
+  - pass_flips: 기본 기준 대비 PASS/FAIL이 바뀐 종목 수
+
+기준값 형식:
+  --roe 15/12          ROE 상/하 기준 (%)
+  --roic 12/9          ROIC 상/하 기준 (%)
+  --per 18/12/10/8     EPS CAGR 고성장/중성장/0 이상/음수 구간 적정 PER
+  --per-growth 15/8    적정 PER 구간을 나누는 EPS CAGR 기준 (%)
+  쉼표로 여러 값을 주면 모든 조합을 평가
+
+실행 예시:
+  python yf_score_sweep.py --mode test --date 2026-01-30 --pass-score 80,85,90
+  python yf_score_sweep.py --mode full --date 2026-01-30 --roe 15/12,18/15 --safety 0.8,0.7 --output sweep.csv
+"""
+
+import argparse
+import itertools
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from buffett_scoring import (
+    ScoringConfig,
+    MetricMatrices,
+    build_metric_matrices,
+    score_metric_matrices,
+    DEFAULT_SCORING,
+    YF_POLICY,
+)
+from yf_batch_evaluate import load_universe, DEFAULT_LOAD_WORKERS
+from storage_gateway import configure_storage
+from yf_evaluate import (
+    validate_env,
+    configure_cache,
+    print_cache_stats,
+    list_tickers_from_prices,
+    find_latest_financial_year,
+    DEFAULT_CACHE_MAX_MB,
+)
+
+# ============================================================================
+# 설정
+# ============================================================================
+
+# 순위 비교에 쓰는 저평가 우량주 상위 종목 수 기본값
+DEFAULT_TOP_N = 50
+
+# CLI 인자 → ScoringConfig 필드 (슬래시로 구분된 값 순서)
+GRID_FIELDS = {
+    "pass_score": ("pass_score",),
+    "roe": ("roe_high", "roe_low"),
+    "roic": ("roic_high", "roic_low"),
+    "per": ("per_high", "per_mid", "per_low", "per_negative"),
+    "per_growth": ("per_growth_high", "per_growth_mid"),
+    "haircut": ("growth_haircut",),
+    "safety": ("safety_factor",),
+}
+
+# 결과 지표 컬럼 순서
+SUMMARY_COLUMNS = [
+    "pass_count", "buy_count", "pass_flips",
+    "spearman", "pass_jaccard", "buy_jaccard", "top_overlap",
+]
+
+
+# ============================================================================
+# 조합 생성
+# ============================================================================
+
+def parse_grid_values(name: str, text: Optional[str]) -> List[Dict[str, float]]:
+    """
+    "15/12,18/15" 형식 → [{"roe_high": 15, "roe_low": 12}, ...]
+
+    값이 없으면 기본 기준 한 가지만 반환
+    """
+    keys = GRID_FIELDS[name]
+    if not text:
+        return [{key: getattr(DEFAULT_SCORING, key) for key in keys}]
+
+    options = []
+    for chunk in text.split(","):
+        parts = [p.strip() for p in chunk.strip().split("/")]
+        if len(parts) != len(keys):
+            raise ValueError(f"--{name.replace('_', '-')} 값은 {'/'.join(keys)} 형식이어야 합니다: {chunk}")
+        options.append({key: float(part) for key, part in zip(keys, parts)})
+    return options
+
+
+def build_grid(grid_args: Dict[str, Optional[str]]) -> List[ScoringConfig]:
+    """
+    CLI 인자별 값 목록의 모든 조합 → ScoringConfig 목록
+
+    기본 기준(DEFAULT_SCORING)은 비교 기준이므로 항상 첫 번째에 포함 (중복 제거)
+    """
+    options = [parse_grid_values(name, grid_args.get(name)) for name in GRID_FIELDS]
+
+    configs = [DEFAULT_SCORING]
+    for combo in itertools.product(*options):
+        overrides = {}
+        for part in combo:
+            overrides.update(part)
+        config = replace(DEFAULT_SCORING, **overrides)
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+# ============================================================================
+# 스윕 실행
+# ============================================================================
+
+def _jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """두 bool 마스크의 Jaccard 유사도 (둘 다 비어 있으면 1)"""
+    union = int((a | b).sum())
+    return int((a & b).sum()) / union if union else 1.0
+
+
+def _top_tickers(gap_pct: np.ndarray, buy: np.ndarray, top_n: int) -> np.ndarray:
+    """저평가 우량주 중 상승여력 상위 top_n개 위치 (동률은 종목 순서 유지)"""
+    idx = np.flatnonzero(buy)
+    order = np.argsort(-gap_pct[idx], kind="stable")
+    return idx[order[:top_n]]
+
+
+def score_config(matrices: MetricMatrices, current_price: np.ndarray,
+                 config: ScoringConfig) -> Dict[str, np.ndarray]:
+    """
+    한 기준 조합으로 전체 종목 채점 (yf_batch_evaluate.score_frame과 같은 PASS/BUY 판정)
+
+    Returns:
+        {"total_score", "gap_pct", "passed", "buy"} 배열 (matrices.tickers 순서)
+    """
+    scores = score_metric_matrices(matrices, YF_POLICY, config)
+    total_score = scores["total_score"]
+    intrinsic_value = scores["intrinsic_value"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_gap = (current_price > 0) & (intrinsic_value > 0)
+        gap_pct = np.where(has_gap, (intrinsic_value - current_price) / current_price * 100, 0.0)
+
+    passed = scores["scored"] & (total_score >= config.pass_score)
+    return {
+        "total_score": total_score,
+        "gap_pct": gap_pct,
+        "passed": passed,
+        "buy": passed & (gap_pct > 0),
+    }
+
+
+def run_sweep(matrices: MetricMatrices, current_price: np.ndarray,
+              configs: Sequence[ScoringConfig], top_n: int = DEFAULT_TOP_N) -> pd.DataFrame:
+    """
+    기준 조합별 채점 + 기본 기준 대비 순위 안정성 계산
+
+    Args:
+        matrices: build_metric_matrices 결과 (한 번만 구성)
+        current_price: 현재가 배열 (matrices.tickers 순서)
+        configs: 평가할 기준 조합 (첫 번째가 비교 기준)
+        top_n: top_overlap 계산에 쓰는 상위 종목 수
+
+    Returns:
+        조합별 한 행 DataFrame (ScoringConfig 필드 + SUMMARY_COLUMNS)
+    """
+    baseline = score_config(matrices, current_price, configs[0])
+    base_rank = pd.Series(baseline["total_score"]).rank()
+    base_top = set(_top_tickers(baseline["gap_pct"], baseline["buy"], top_n))
+
+    rows = []
+    for config in tqdm(configs, desc="기준 조합", ncols=80, ascii=True, leave=True):
+        result = score_config(matrices, current_price, config)
+
+        spearman = base_rank.corr(pd.Series(result["total_score"]).rank())
+        top = set(_top_tickers(result["gap_pct"], result["buy"], top_n))
+        top_size = max(len(base_top), len(top))
+
+        rows.append({
+            **asdict(config),
+            "pass_count": int(result["passed"].sum()),
+            "buy_count": int(result["buy"].sum()),
+            "pass_flips": int((result["passed"] != baseline["passed"]).sum()),
+            "spearman": round(float(spearman), 4) if not np.isnan(spearman) else 1.0,
+            "pass_jaccard": round(_jaccard(baseline["passed"], result["passed"]), 4),
+            "buy_jaccard": round(_jaccard(baseline["buy"], result["buy"]), 4),
+            "top_overlap": round(len(base_top & top) / top_size, 4) if top_size else 1.0,
+        })
+
+    return pd.DataFrame(rows, columns=[f.name for f in fields(ScoringConfig)] + SUMMARY_COLUMNS)
+
+
+def print_summary(frame: pd.DataFrame) -> None:
+    """조합별 결과 표 출력 (기본 기준과 다른 값만 표시)"""
+    config_names = [f.name for f in fields(ScoringConfig)]
+
+    print("\n" + "=" * 70)
+    print(f"📊 기준값 스윕 결과: {len(frame)}개 조합 (첫 행 = 기본 기준)")
+    print("=" * 70)
+
+    for i, r in enumerate(frame.to_dict("records")):
+        changed = [f"{name}={r[name]:g}" for name in config_names
+                   if r[name] != getattr(DEFAULT_SCORING, name)]
+        label = ", ".join(changed) if changed else "기본 기준"
+        print(f"   {i}. {label}")
+        print(f"      PASS {r['pass_count']}개 (변경 {r['pass_flips']}개), BUY {r['buy_count']}개 | "
+              f"spearman {r['spearman']:.3f}, PASS J {r['pass_jaccard']:.3f}, "
+              f"BUY J {r['buy_jaccard']:.3f}, TOP {r['top_overlap']:.3f}")
+
+
+# ============================================================================
+# 메인 실행
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="yfinance 버핏 평가 - 기준값 스윕 (what-if)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+실행 예시:
+  python yf_score_sweep.py --mode test --date 2026-01-30 --pass-score 80,85,90
+  python yf_score_sweep.py --mode full --date 2026-01-30 --roe 15/12,18/15 --safety 0.8,0.7 --output sweep.csv
+        """
+    )
+
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="test",
+        choices=["test", "full"],
+        help="실행 모드 (test: 5종목, full: 전체)"
+    )
+
+    parser.add_argument(
+        "--date",
+        type=str,
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="현재가 데이터 날짜 (YYYY-MM-DD)"
+    )
+
+    parser.add_argument(
+        "--year",
+        type=str,
+        default="auto",
+        help="재무제표 데이터 연도 (YYYY 또는 'auto')"
+    )
+
+    parser.add_argument("--pass-score", type=str, default=None, help="우량주 기준 총점 (예: 80,85,90)")
+    parser.add_argument("--roe", type=str, default=None, help="ROE 상/하 기준 (예: 15/12,18/15)")
+    parser.add_argument("--roic", type=str, default=None, help="ROIC 상/하 기준 (예: 12/9,15/12)")
+    parser.add_argument("--per", type=str, default=None, help="구간별 적정 PER (예: 18/12/10/8)")
+    parser.add_argument("--per-growth", type=str, default=None, help="적정 PER 구간 EPS CAGR 기준 (예: 15/8)")
+    parser.add_argument("--haircut", type=str, default=None, help="성장률 반영 비율 (예: 0.5,0.7)")
+    parser.add_argument("--safety", type=str, default=None, help="안전마진 적용 후 비율 (예: 0.7,0.8)")
+
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"순위 비교에 쓰는 저평가 우량주 상위 종목 수 (기본값: {DEFAULT_TOP_N})"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_LOAD_WORKERS,
+        help=f"Storage 로드 병렬 스레드 수 (기본값: {DEFAULT_LOAD_WORKERS})"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="결과 CSV 저장 경로 (선택)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Storage 읽기 로컬 캐시 디렉터리 (지정 시 활성화)"
+    )
+
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"로컬 캐시 크기 상한 MB (기본값: {DEFAULT_CACHE_MAX_MB})"
+    )
+
+    parser.add_argument(
+        "--storage-dir",
+        type=str,
+        default=None,
+        help="Supabase 대신 읽을 로컬 Storage 미러 루트 (storage_sync.py로 생성, 기본값: STORAGE_LOCAL_DIR)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        configs = build_grid({name: getattr(args, name) for name in GRID_FIELDS})
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    print("\n" + "=" * 70)
+    print("🧪 yfinance 버핏 평가 (기준값 스윕)")
+    print("=" * 70)
+    print(f"📅 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🔧 모드: {args.mode}, 기준 조합: {len(configs)}개")
+    print("=" * 70)
+
+    configure_storage(args.storage_dir)
+    validate_env()
+
+    configure_cache(args.cache_dir, args.cache_max_mb)
+
+    if args.year == "auto":
+        year = find_latest_financial_year()
+        if not year:
+            print("\n❌ financials/ 폴더에서 연도를 찾을 수 없습니다.")
+            return
+        print(f"📊 재무제표 연도 자동 탐색: {year}")
+    else:
+        year = args.year
+
+    if args.mode == "test":
+        tickers = ["AAPL", "MSFT", "GOOGL", "NVDA", "META"]
+    else:
+        tickers = list_tickers_from_prices(args.date)
+        if not tickers:
+            print(f"\n❌ prices/{args.date}/ 폴더에 데이터가 없습니다.")
+            return
+
+    metrics, info = load_universe(tickers, args.date, year, max(1, args.workers))
+    if info.empty:
+        print("\n❌ 평가할 종목이 없습니다.")
+        return
+
+    matrices = build_metric_matrices(metrics, info["ticker"])
+    current_price = info["current_price"].to_numpy(dtype=float)
+
+    started = datetime.now()
+    frame = run_sweep(matrices, current_price, configs, max(1, args.top_n))
+    elapsed = (datetime.now() - started).total_seconds()
+
+    print_summary(frame)
+    print(f"\n⏱️ 채점 시간: {elapsed * 1000:.0f}ms ({len(info)}개 종목 × {len(configs)}개 조합)")
+
+    if args.output:
+        frame.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n💾 결과 저장: {args.output}")
+
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
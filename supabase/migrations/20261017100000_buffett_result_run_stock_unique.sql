@@ -0,0 +1,21 @@
+-- buffett_result: 실행(run_id)별 종목(stock_id) 1행 보장
+-- yf_result.py / fmp_result.py가 on_conflict=run_id,stock_id upsert로 저장 → 일시적 오류 시 배치 재시도해도 중복 행 없음
+
+-- 기존 중복 행 정리 (같은 실행/종목은 마지막으로 들어간 행만 유지)
+DELETE FROM public.buffett_result a
+USING public.buffett_result b
+WHERE a.run_id = b.run_id
+  AND a.stock_id = b.stock_id
+  AND a.ctid < b.ctid;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'buffett_result_run_stock_unique'
+      AND conrelid = 'public.buffett_result'::regclass
+  ) THEN
+    ALTER TABLE public.buffett_result
+      ADD CONSTRAINT buffett_result_run_stock_unique UNIQUE (run_id, stock_id);
+  END IF;
+END $$;